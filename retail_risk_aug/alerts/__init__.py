@@ -0,0 +1,3 @@
+from .store import ALERT_TRANSITIONS, AlertPage, AlertStore, AlertTransitionError
+
+__all__ = ["ALERT_TRANSITIONS", "AlertPage", "AlertStore", "AlertTransitionError"]
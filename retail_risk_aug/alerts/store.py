@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import base64
+import json
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from retail_risk_aug.models import Alert
+
+
+ALERT_TRANSITIONS = {
+    "open": frozenset({"investigating", "closed"}),
+    "investigating": frozenset({"closed"}),
+    "closed": frozenset(),
+}
+SORT_FIELDS = ("created_ts", "score")
+
+SortKey = tuple[float, str]
+
+
+class AlertTransitionError(ValueError):
+    pass
+
+
+@dataclass(slots=True)
+class AlertPage:
+    items: list[Alert]
+    next_cursor: str | None
+
+
+class AlertStore:
+    def __init__(self, alerts: Iterable[Alert] = ()) -> None:
+        self._alerts: dict[str, Alert] = {}
+        self._indexes: dict[tuple[str, str], list[SortKey]] = {}
+        self._revisions: dict[str, int] = {}
+        self._lock = threading.RLock()
+        self.revision = 0
+        for alert in alerts:
+            self.add(alert)
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def __contains__(self, case_id: object) -> bool:
+        return case_id in self._alerts
+
+    def __iter__(self) -> Iterator[Alert]:
+        return iter(list(self._alerts.values()))
+
+    def get(self, case_id: str) -> Alert | None:
+        return self._alerts.get(case_id)
+
+    def revision_of(self, case_id: str) -> int:
+        return self._revisions.get(case_id, 0)
+
+    def count(self, status: str) -> int:
+        return len(self._indexes.get((status, SORT_FIELDS[0]), ()))
+
+    def status_counts(self) -> dict[str, int]:
+        return {status: self.count(status) for status in ALERT_TRANSITIONS}
+
+    def add(self, alert: Alert) -> None:
+        with self._lock:
+            previous = self._alerts.get(alert.case_id)
+            if previous is not None:
+                self._unindex(previous)
+            self._alerts[alert.case_id] = alert
+            self._index(alert)
+            self._bump(alert.case_id)
+
+    def by_status(self, status: str, sort: str = "created_ts") -> list[Alert]:
+        return self.page(status, sort=sort, limit=None).items
+
+    def page(self, status: str, sort: str = "created_ts", limit: int | None = 100, cursor: str | None = None) -> AlertPage:
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"sort must be one of: {', '.join(SORT_FIELDS)}")
+        with self._lock:
+            keys = self._indexes.get((status, sort), [])
+            start = 0 if cursor is None else bisect_right(keys, _decode_cursor(cursor))
+            stop = len(keys) if limit is None else min(len(keys), start + limit)
+            selected = keys[start:stop]
+            items = [self._alerts[case_id] for _, case_id in selected]
+            next_cursor = _encode_cursor(selected[-1]) if selected and stop < len(keys) else None
+        return AlertPage(items=items, next_cursor=next_cursor)
+
+    def transition(
+        self,
+        case_id: str,
+        status: str,
+        resolution: str | None = None,
+        expected_status: str | None = None,
+    ) -> Alert:
+        with self._lock:
+            alert = self._alerts.get(case_id)
+            if alert is None:
+                raise KeyError(case_id)
+            if expected_status is not None and alert.status != expected_status:
+                raise AlertTransitionError(f"alert {case_id} is {alert.status}, expected {expected_status}")
+            if status not in ALERT_TRANSITIONS.get(alert.status, frozenset()):
+                raise AlertTransitionError(f"cannot move alert {case_id} from {alert.status} to {status}")
+            if status == "closed" and not resolution:
+                raise AlertTransitionError("closing an alert requires a resolution")
+
+            updated = alert.model_copy(
+                update={
+                    "status": status,
+                    "resolution": resolution if status == "closed" else alert.resolution,
+                    "resolution_ts": datetime.now(tz=UTC) if status == "closed" else alert.resolution_ts,
+                }
+            )
+            self._unindex(alert)
+            self._alerts[case_id] = updated
+            self._index(updated)
+            self._bump(case_id)
+            return updated
+
+    def _bump(self, case_id: str) -> None:
+        self.revision += 1
+        self._revisions[case_id] = self.revision
+
+    def _index(self, alert: Alert) -> None:
+        for sort in SORT_FIELDS:
+            insort(self._indexes.setdefault((alert.status, sort), []), _sort_key(alert, sort))
+
+    def _unindex(self, alert: Alert) -> None:
+        for sort in SORT_FIELDS:
+            keys = self._indexes.get((alert.status, sort), [])
+            key = _sort_key(alert, sort)
+            slot = bisect_left(keys, key)
+            if slot < len(keys) and keys[slot] == key:
+                del keys[slot]
+
+
+def _sort_key(alert: Alert, sort: str) -> SortKey:
+    if sort == "score":
+        return (-alert.score, alert.case_id)
+    return (-alert.created_ts.timestamp(), alert.case_id)
+
+
+def _encode_cursor(key: SortKey) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> SortKey:
+    try:
+        primary, case_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (float(primary), str(case_id))
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
@@ -1,70 +1,633 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException, Query
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Annotated, TypeVar
 
-from retail_risk_aug.app_state import AppState, build_default_app_state
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
+from retail_risk_aug.alerts import AlertTransitionError
+from retail_risk_aug.api.caching import NO_STORE, conditional, max_age, state_etag
+from retail_risk_aug.api.concurrency import OffloadPool, OverloadedError
+from retail_risk_aug.api.events import parse_last_event_id, sse_stream
+from retail_risk_aug.api.export import (
+    MEDIA_TYPES,
+    export_encoder,
+    iter_alerts,
+    iter_scores,
+    iter_transactions,
+)
+from retail_risk_aug.app_state import AppState, AppStateBuilder
+from retail_risk_aug.config import Settings, get_settings
+from retail_risk_aug.deadline import Deadline
+from retail_risk_aug.generator import load_snapshot
+from retail_risk_aug.graph.subgraph import DEFAULT_MAX_EDGES, DEFAULT_MAX_NODES
+from retail_risk_aug.indexes import DASHBOARD_VIEWS
+from retail_risk_aug.graph.summary import DEFAULT_SUMMARY_EDGES, DEFAULT_SUMMARY_NODES, summarize_transactions
+from retail_risk_aug.models import AlertTransitionRequest, StateReloadRequest, Transaction, TransactionLookupRequest
+from retail_risk_aug.serialization import dumps, join_array, join_object
+from retail_risk_aug.shared_state import attach_state
+from retail_risk_aug.state_manager import ReloadInProgressError, StateManager
 
-def create_app(state: AppState | None = None) -> FastAPI:
-    app = FastAPI(title="Retail Risk Augmentation API", version="0.1.0")
-    app_state = state or build_default_app_state()
-    app.state.risk_state = app_state
+
+def _ready_manager(request: Request) -> StateManager:
+    manager: StateManager = request.app.state.state_manager
+    if not manager.wait(request.app.state.settings.state_wait_seconds):
+        raise HTTPException(status_code=503, detail="state is still building", headers={"Retry-After": "2"})
+    return manager
+
+
+def _leased_state(manager: Annotated[StateManager, Depends(_ready_manager)]) -> Iterator[AppState]:
+    with manager.acquire() as runtime_state:
+        yield runtime_state
+
+
+RuntimeState = Annotated[AppState, Depends(_leased_state)]
+ReadyManager = Annotated[StateManager, Depends(_ready_manager)]
+T = TypeVar("T")
+_TRANSACTION_BATCH: TypeAdapter[list[Transaction] | Transaction] = TypeAdapter(list[Transaction] | Transaction)
+
+
+def create_app(
+    state: AppState | None = None,
+    builder: AppStateBuilder | None = None,
+    manager: StateManager | None = None,
+) -> FastAPI:
+    settings = get_settings()
+    pool = OffloadPool(
+        max_workers=settings.api_offload_workers,
+        limits={
+            "graph": (settings.graph_max_concurrency, settings.api_max_queue),
+            "similarity": (settings.similarity_max_concurrency, settings.api_max_queue),
+            "bulk": (settings.bulk_max_concurrency, settings.api_max_queue),
+            "ingest": (settings.ingest_max_concurrency, settings.api_max_queue),
+        },
+    )
+
+    @asynccontextmanager
+    async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+        yield
+        pool.shutdown()
+
+    app = FastAPI(title="Retail Risk Augmentation API", version="0.1.0", lifespan=lifespan)
+    if manager is None:
+        if state is None and builder is None and settings.shared_state_dir:
+            state = attach_state(settings.shared_state_dir)
+        if state is None and builder is None:
+            builder = AppStateBuilder(seed=settings.rng_seed, settings=settings, max_workers=settings.state_build_workers).start()
+        manager = StateManager(state=state, builder=builder, settings=settings, max_workers=settings.state_build_workers)
+    app.state.settings = settings
+    app.state.state_manager = manager
+    app.state.offload_pool = pool
+    derived_cache = max_age(settings.api_cache_max_age)
+
+    @app.exception_handler(OverloadedError)
+    async def overloaded(_: Request, exc: OverloadedError) -> JSONResponse:
+        return JSONResponse(status_code=429, content={"detail": str(exc)}, headers={"Retry-After": "1"})
+
+    async def _offload(endpoint: str, response: Response, work: Callable[[], T], deadline: Deadline | None = None) -> T:
+        result = await pool.run(endpoint, work)
+        if deadline is not None and deadline.truncated:
+            response.headers["X-Partial-Result"] = "true"
+        return result
+
+    def _export(
+        ready: StateManager,
+        kind: str,
+        records: Callable[[AppState], Iterable[BaseModel]],
+        fields: str | None,
+        export_format: str,
+    ) -> StreamingResponse:
+        try:
+            encode = export_encoder(kind, fields, export_format, settings.export_batch_rows)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        except RuntimeError as exc:
+            raise HTTPException(status_code=501, detail=str(exc)) from exc
+
+        def chunks() -> Iterator[bytes]:
+            with ready.acquire() as runtime_state:
+                yield from encode(records(runtime_state))
+
+        return StreamingResponse(chunks(), media_type=MEDIA_TYPES[export_format])
 
     @app.get("/admin/health")
-    def admin_health() -> dict[str, object]:
-        runtime_state: AppState = app.state.risk_state
-        return {
+    def admin_health(response: Response) -> dict[str, object]:
+        response.headers["Cache-Control"] = NO_STORE
+        state_builder = manager.builder
+        body: dict[str, object] = {
             "status": "ok",
-            "transactions": len(runtime_state.dataset.transactions),
-            "alerts": len(runtime_state.alerts),
-            "vector_backend": runtime_state.vector_index.backend,
-            "graph_nodes": runtime_state.graph.graph.number_of_nodes(),
+            "ready": manager.ready,
+            "components": (
+                {name: asdict(status) for name, status in state_builder.readiness().items()} if state_builder else {}
+            ),
+            "build_seconds": state_builder.total_seconds if state_builder else None,
+            "state": asdict(manager.metrics()),
+            "offload": {endpoint: asdict(stats) for endpoint, stats in pool.stats().items()},
+        }
+        if manager.ready:
+            with manager.acquire() as runtime_state:
+                body.update(
+                    {
+                        "transactions": len(runtime_state.dataset.transactions),
+                        "alerts": len(runtime_state.alerts),
+                        "vector_backend": runtime_state.vector_index.backend,
+                        "fragment_cache": runtime_state.fragments.stats(),
+                        "data_version": runtime_state.data_version,
+                        "ingest": asdict(runtime_state.ingest_metrics),
+                    }
+                )
+        return body
+
+    @app.get("/admin/ready")
+    def admin_ready(response: Response) -> dict[str, object]:
+        response.headers["Cache-Control"] = NO_STORE
+        ready = manager.ready
+        if not ready:
+            response.status_code = 503
+        return {"ready": ready}
+
+    @app.post("/admin/reload", status_code=202)
+    def admin_reload(request: StateReloadRequest) -> dict[str, object]:
+        if request.seed is not None and request.snapshot is not None:
+            raise HTTPException(status_code=400, detail="provide either seed or snapshot, not both")
+        if manager.read_only:
+            raise HTTPException(status_code=409, detail="this state is read-only and does not accept reloads")
+        loader = None
+        if request.snapshot is not None:
+            loader = partial(load_snapshot, _snapshot_path(settings, request.snapshot))
+        try:
+            state_builder = manager.reload(seed=request.seed, loader=loader)
+        except ReloadInProgressError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        return {
+            "accepted": True,
+            "serving_version": manager.version,
+            "seed": None if loader else state_builder.seed,
+            "snapshot": request.snapshot,
         }
 
+    @app.get("/live/events")
+    def live_events(
+        ready: ReadyManager,
+        request: Request,
+        last_event_id: str | None = Header(default=None),
+        max_events: int | None = Query(default=None, ge=1),
+    ) -> StreamingResponse:
+        stream = sse_stream(
+            request,
+            ready,
+            after=parse_last_event_id(last_event_id),
+            max_queue=settings.live_queue_size,
+            heartbeat_seconds=settings.live_heartbeat_seconds,
+            max_events=max_events,
+        )
+        return StreamingResponse(
+            stream,
+            media_type="text/event-stream",
+            headers={"Cache-Control": NO_STORE, "X-Accel-Buffering": "no"},
+        )
+
     @app.get("/alerts")
-    def list_alerts(status: str = Query(default="open")) -> list[dict[str, object]]:
-        runtime_state: AppState = app.state.risk_state
-        return [alert.model_dump(mode="json") for alert in runtime_state.list_alerts(status=status)]
+    def list_alerts(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        status: str = Query(default="open"),
+        limit: int = Query(default=100, ge=1, le=1000),
+        cursor: str | None = Query(default=None),
+        sort: str = Query(default="created_ts", pattern="^(created_ts|score)$"),
+    ) -> Response:
+        conditional(request, response, state_etag(runtime_state, "a", runtime_state.alerts.revision))
+        try:
+            page = runtime_state.page_alerts(status=status, sort=sort, limit=limit, cursor=cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        if page.next_cursor is not None:
+            response.headers["X-Next-Cursor"] = page.next_cursor
+        return _json(runtime_state.fragments.alerts(page.items), response)
+
+    @app.post("/alert/{case_id}/transition")
+    def transition_alert(
+        runtime_state: RuntimeState,
+        case_id: str,
+        request: AlertTransitionRequest,
+    ) -> Response:
+        if runtime_state.scorer is None:
+            raise HTTPException(status_code=409, detail="this state is read-only and does not accept alert transitions")
+        try:
+            alert = runtime_state.transition_alert(
+                case_id,
+                request.status,
+                resolution=request.resolution,
+                expected_status=request.expected_status,
+            )
+        except KeyError as exc:
+            raise HTTPException(status_code=404, detail="alert not found") from exc
+        except AlertTransitionError as exc:
+            raise HTTPException(status_code=409, detail=str(exc)) from exc
+        return _json(runtime_state.fragments.alert(alert))
 
     @app.get("/alert/{case_id}")
-    def get_alert(case_id: str) -> dict[str, object]:
-        runtime_state: AppState = app.state.risk_state
+    async def get_alert(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        case_id: str,
+        include_similar: bool = Query(default=True, alias="similar"),
+    ) -> Response:
         alert = runtime_state.get_alert(case_id)
         if alert is None:
             raise HTTPException(status_code=404, detail="alert not found")
+        conditional(request, response, state_etag(runtime_state, "a", runtime_state.alerts.revision_of(case_id)))
+        if not include_similar:
+            txn = runtime_state.get_transaction(alert.txn_id)
+            return _json(
+                join_object(
+                    {
+                        "alert": runtime_state.fragments.alert(alert),
+                        "transaction": runtime_state.fragments.transaction(txn) if txn else b"null",
+                    }
+                ),
+                response,
+            )
+        deadline = Deadline.after(settings.similarity_deadline_seconds)
 
-        txn = runtime_state.get_transaction(alert.txn_id)
-        similar = runtime_state.get_similar_transactions(alert.txn_id, k=10)
-        return {
-            "alert": alert.model_dump(mode="json"),
-            "transaction": txn.model_dump(mode="json") if txn else None,
-            "similar": [item.model_dump(mode="json") for item in similar],
-        }
+        def work() -> bytes:
+            txn = runtime_state.get_transaction(alert.txn_id)
+            similar = runtime_state.get_similar_transactions(alert.txn_id, k=10, deadline=deadline)
+            return join_object(
+                {
+                    "alert": runtime_state.fragments.alert(alert),
+                    "transaction": runtime_state.fragments.transaction(txn) if txn else b"null",
+                    "similar": dumps([item.model_dump(mode="json") for item in similar]),
+                }
+            )
+
+        return _json(await _offload("similarity", response, work, deadline), response)
 
     @app.get("/similar/transaction/{txn_id}")
-    def similar_transaction(txn_id: str, k: int = Query(default=10, ge=1, le=100)) -> list[dict[str, object]]:
-        runtime_state: AppState = app.state.risk_state
-        txn = runtime_state.get_transaction(txn_id)
-        if txn is None:
+    async def similar_transaction(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        txn_id: str,
+        k: int = Query(default=10, ge=1, le=100),
+    ) -> list[dict[str, object]]:
+        if runtime_state.get_transaction(txn_id) is None:
             raise HTTPException(status_code=404, detail="transaction not found")
-        similar = runtime_state.get_similar_transactions(txn_id, k)
-        return [item.model_dump(mode="json") for item in similar]
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        deadline = Deadline.after(settings.similarity_deadline_seconds)
+
+        def work() -> list[dict[str, object]]:
+            return [item.model_dump(mode="json") for item in runtime_state.get_similar_transactions(txn_id, k, deadline=deadline)]
+
+        return await _offload("similarity", response, work, deadline)
+
+    @app.get("/transactions")
+    async def transactions_between(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        start: datetime | None = Query(default=None, alias="from"),
+        end: datetime | None = Query(default=None, alias="to"),
+        limit: int = Query(default=100, ge=1, le=5000),
+    ) -> Response:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+
+        def work() -> bytes:
+            return runtime_state.fragments.transactions(runtime_state.get_transactions_between(start, end, limit=limit))
+
+        return _json(await _offload("bulk", response, work), response)
+
+    @app.post("/transactions", status_code=201)
+    async def ingest_transactions(runtime_state: RuntimeState, request: Request, response: Response) -> dict[str, object]:
+        if runtime_state.scorer is None:
+            raise HTTPException(status_code=409, detail="this state is read-only and does not accept ingestion")
+        try:
+            parsed = _TRANSACTION_BATCH.validate_json(await request.body())
+        except ValidationError as exc:
+            raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_context=False)) from exc
+        batch = parsed if isinstance(parsed, list) else [parsed]
+        if len(batch) > settings.ingest_max_batch:
+            raise HTTPException(status_code=413, detail=f"batches are limited to {settings.ingest_max_batch} transactions")
+        result = await _offload("ingest", response, partial(runtime_state.ingest, batch))
+        return asdict(result)
+
+    @app.post("/transactions/lookup")
+    def lookup_transactions(runtime_state: RuntimeState, lookup: TransactionLookupRequest) -> Response:
+        transactions = [txn for txn_id in dict.fromkeys(lookup.txn_ids) if (txn := runtime_state.get_transaction(txn_id)) is not None]
+        cases = {txn.txn_id: case_id for txn in transactions if (case_id := runtime_state.get_case_id_by_txn(txn.txn_id))}
+        customers = {
+            txn.account_id: runtime_state.fragments.customer(customer)
+            for txn in transactions
+            if (customer := runtime_state.get_customer_by_account(txn.account_id)) is not None
+        }
+        return _json(
+            join_object(
+                {
+                    "transactions": runtime_state.fragments.transactions(transactions),
+                    "cases": dumps(cases),
+                    "customers": join_object(customers),
+                }
+            )
+        )
+
+    @app.get("/dashboard/snapshot")
+    def dashboard_snapshot(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        upto: int | None = Query(default=None, ge=0),
+    ) -> dict[str, object]:
+        conditional(request, response, state_etag(runtime_state, "a", runtime_state.alerts.revision, upto))
+        return asdict(runtime_state.dashboard_snapshot(upto))
+
+    @app.get("/dashboard/transactions")
+    def dashboard_transactions(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        view: str = Query(default="ALL"),
+        upto: int | None = Query(default=None, ge=0),
+        limit: int = Query(default=50, ge=1, le=5000),
+    ) -> Response:
+        if view not in DASHBOARD_VIEWS and not view.startswith(("pattern:", "channel:")):
+            raise HTTPException(status_code=400, detail=f"unknown dashboard view: {view}")
+        conditional(request, response, state_etag(runtime_state, view, upto, limit))
+        transactions = runtime_state.dataset.transactions
+        positions = runtime_state.dashboard_positions(view, upto=upto, limit=limit)
+        return _json(runtime_state.fragments.transactions(transactions[position] for position in positions), response)
+
+    @app.get("/stats/timeseries")
+    async def stats_timeseries(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        start: datetime | None = Query(default=None, alias="from"),
+        end: datetime | None = Query(default=None, alias="to"),
+        bucket: str = Query(default="minute", pattern="^(minute|hour)$"),
+    ) -> list[dict[str, object]]:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+
+        def work() -> list[dict[str, object]]:
+            return [
+                {**asdict(item), "start": item.start.isoformat()}
+                for item in runtime_state.get_timeseries(bucket, start, end)
+            ]
+
+        return await _offload("bulk", response, work)
+
+    @app.get("/export/transactions")
+    def export_transactions(
+        ready: ReadyManager,
+        export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|arrow)$"),
+        fields: str | None = Query(default=None),
+        start: datetime | None = Query(default=None, alias="from"),
+        end: datetime | None = Query(default=None, alias="to"),
+        account_id: str | None = Query(default=None),
+        merchant_id: str | None = Query(default=None),
+        min_amount: float | None = Query(default=None, ge=0),
+        injected: bool | None = Query(default=None),
+    ) -> StreamingResponse:
+        records = partial(
+            iter_transactions,
+            start=start,
+            end=end,
+            account_id=account_id,
+            merchant_id=merchant_id,
+            min_amount=min_amount,
+            injected=injected,
+        )
+        return _export(ready, "transactions", records, fields, export_format)
+
+    @app.get("/export/alerts")
+    def export_alerts(
+        ready: ReadyManager,
+        export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|arrow)$"),
+        fields: str | None = Query(default=None),
+        status: str | None = Query(default=None),
+        min_score: float | None = Query(default=None, ge=0, le=1),
+        start: datetime | None = Query(default=None, alias="from"),
+        end: datetime | None = Query(default=None, alias="to"),
+    ) -> StreamingResponse:
+        records = partial(
+            iter_alerts,
+            status=status,
+            min_score=min_score,
+            start=start,
+            end=end,
+            page_rows=settings.export_batch_rows,
+        )
+        return _export(ready, "alerts", records, fields, export_format)
+
+    @app.get("/export/scores")
+    def export_scores(
+        ready: ReadyManager,
+        export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|arrow)$"),
+        fields: str | None = Query(default=None),
+        start: datetime | None = Query(default=None, alias="from"),
+        end: datetime | None = Query(default=None, alias="to"),
+        min_score: float | None = Query(default=None, ge=0, le=1),
+        reason_code: str | None = Query(default=None),
+    ) -> StreamingResponse:
+        records = partial(iter_scores, start=start, end=end, min_score=min_score, reason_code=reason_code)
+        return _export(ready, "scores", records, fields, export_format)
+
+    @app.get("/account/{account_id}/transactions")
+    def transactions_by_account(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        account_id: str,
+        limit: int = Query(default=50, ge=1, le=1000),
+    ) -> Response:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        return _json(runtime_state.fragments.transactions(runtime_state.get_transactions_by_account(account_id, limit=limit)), response)
+
+    @app.get("/merchant/{merchant_id}/transactions")
+    def transactions_by_merchant(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        merchant_id: str,
+        limit: int = Query(default=50, ge=1, le=1000),
+    ) -> Response:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        return _json(runtime_state.fragments.transactions(runtime_state.get_transactions_by_merchant(merchant_id, limit=limit)), response)
+
+    @app.get("/device/{device_id}/transactions")
+    def transactions_by_device(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        device_id: str,
+        limit: int = Query(default=50, ge=1, le=1000),
+    ) -> Response:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        return _json(runtime_state.fragments.transactions(runtime_state.get_transactions_by_device(device_id, limit=limit)), response)
+
+    @app.get("/ip/{ip}/transactions")
+    def transactions_by_ip(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        ip: str,
+        limit: int = Query(default=50, ge=1, le=1000),
+    ) -> Response:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        return _json(runtime_state.fragments.transactions(runtime_state.get_transactions_by_ip(ip, limit=limit)), response)
 
     @app.get("/graph/txn/{txn_id}")
-    def graph_for_transaction(txn_id: str) -> dict[str, object]:
-        runtime_state: AppState = app.state.risk_state
+    async def graph_for_transaction(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        txn_id: str,
+    ) -> dict[str, object]:
         txn = runtime_state.get_transaction(txn_id)
         if txn is None:
             raise HTTPException(status_code=404, detail="transaction not found")
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        deadline = Deadline.after(settings.graph_deadline_seconds)
+
+        def work() -> dict[str, object]:
+            return {
+                "txn_id": txn_id,
+                "account_id": txn.account_id,
+                "neighborhood": runtime_state.graph.neighborhood(account_id=txn.account_id, hops=2, deadline=deadline),
+            }
+
+        return await _offload("graph", response, work, deadline)
+
+    @app.get("/graph/account/{account_id}/neighborhood")
+    async def graph_neighborhood(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        account_id: str,
+        hops: int = Query(default=2, ge=1, le=4),
+    ) -> dict[str, object]:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        deadline = Deadline.after(settings.graph_deadline_seconds)
+
+        def work() -> dict[str, object]:
+            return {
+                "account_id": account_id,
+                "hops": hops,
+                "neighborhood": runtime_state.graph.neighborhood(account_id=account_id, hops=hops, deadline=deadline),
+            }
+
+        return await _offload("graph", response, work, deadline)
+
+    @app.get("/graph/summary")
+    async def graph_summary(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        window: int = Query(default=180, ge=1, le=20000),
+        upto: int | None = Query(default=None, ge=0),
+        max_nodes: int = Query(default=DEFAULT_SUMMARY_NODES, ge=1, le=1000),
+        max_edges: int = Query(default=DEFAULT_SUMMARY_EDGES, ge=1, le=5000),
+    ) -> dict[str, object]:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        deadline = Deadline.after(settings.graph_deadline_seconds)
+
+        def work() -> dict[str, object]:
+            transactions = runtime_state.dataset.transactions
+            end = len(transactions) if upto is None else min(upto, len(transactions))
+            recent = transactions[max(0, end - window) : end]
+            summary = summarize_transactions(recent, runtime_state.txn_to_case, max_nodes=max_nodes, max_edges=max_edges)
+            return {"window": window, "upto": end, **asdict(summary)}
+
+        return await _offload("graph", response, work, deadline)
+
+    @app.get("/graph/account/{account_id}/subgraph")
+    async def graph_subgraph(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        account_id: str,
+        hops: int = Query(default=2, ge=1, le=4),
+        max_nodes: int = Query(default=DEFAULT_MAX_NODES, ge=1, le=5000),
+        max_edges: int = Query(default=DEFAULT_MAX_EDGES, ge=1, le=20000),
+    ) -> dict[str, object]:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        deadline = Deadline.after(settings.graph_deadline_seconds)
+
+        def work() -> dict[str, object]:
+            subgraph = runtime_state.graph.subgraph(
+                account_id,
+                hops=hops,
+                max_nodes=max_nodes,
+                max_edges=max_edges,
+                deadline=deadline,
+            )
+            return {"account_id": account_id, "hops": hops, **asdict(subgraph)}
+
+        return await _offload("graph", response, work, deadline)
+
+    @app.get("/graph/account/{account_id}/paths")
+    async def graph_paths(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        account_id: str,
+        to: str = Query(...),
+        max_hops: int = Query(default=4, ge=1, le=6),
+    ) -> dict[str, object]:
+        conditional(request, response, state_etag(runtime_state), derived_cache)
+        deadline = Deadline.after(settings.graph_deadline_seconds)
+
+        def work() -> dict[str, object]:
+            return {
+                "from": account_id,
+                "to": to,
+                "paths": runtime_state.graph.paths(account_id, to, max_hops=max_hops, deadline=deadline),
+            }
+
+        return await _offload("graph", response, work, deadline)
+
+    @app.get("/graph/account/{account_id}/cluster")
+    def graph_cluster_for_account(
+        runtime_state: RuntimeState,
+        request: Request,
+        response: Response,
+        account_id: str,
+        members_limit: int = Query(default=50, ge=0, le=1000),
+    ) -> dict[str, object]:
+        features = runtime_state.clusters.features(account_id)
+        if features is None:
+            raise HTTPException(status_code=404, detail="account not found")
+        conditional(request, response, state_etag(runtime_state), derived_cache)
 
-        neighborhood = runtime_state.graph.neighborhood(account_id=txn.account_id, hops=2)
         return {
-            "txn_id": txn_id,
-            "account_id": txn.account_id,
-            "neighborhood": neighborhood,
+            "account_id": account_id,
+            "cluster_id": features.cluster_id,
+            "cluster_size": features.size,
+            "cluster_accounts": features.accounts,
+            "members": runtime_state.clusters.members(features.cluster_id, limit=members_limit),
         }
 
     return app
 
 
-app = create_app()
+def _json(body: bytes, response: Response | None = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=dict(response.headers) if response else None)
+
+
+def _snapshot_path(settings: Settings, name: str) -> Path:
+    root = Path(settings.state_snapshot_dir).resolve()
+    path = (root / name).resolve()
+    if not path.is_relative_to(root):
+        raise HTTPException(status_code=400, detail="snapshot must be inside the snapshot directory")
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="snapshot not found")
+    return path
+
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from fastapi import HTTPException, Request, Response
+
+from retail_risk_aug.app_state import AppState
+
+
+NO_CACHE = "private, no-cache"
+NO_STORE = "no-store"
+
+
+def state_etag(state: AppState, *parts: object) -> str:
+    return 'W/"' + ".".join(str(part) for part in (state.fingerprint, state.version, state.data_version, *parts)) + '"'
+
+
+def etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def conditional(request: Request, response: Response, etag: str, cache_control: str = NO_CACHE) -> None:
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def max_age(seconds: int) -> str:
+    return f"private, max-age={seconds}, must-revalidate" if seconds > 0 else NO_CACHE
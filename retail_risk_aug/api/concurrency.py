@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+class OverloadedError(RuntimeError):
+    def __init__(self, endpoint: str) -> None:
+        super().__init__(f"too many concurrent {endpoint} requests")
+        self.endpoint = endpoint
+
+
+@dataclass(slots=True)
+class LimiterStats:
+    limit: int
+    max_queue: int
+    active: int
+    waiting: int
+    rejected: int
+
+
+class ConcurrencyLimiter:
+    def __init__(self, endpoint: str, limit: int, max_queue: int) -> None:
+        self.endpoint = endpoint
+        self.limit = limit
+        self.max_queue = max_queue
+        self.rejected = 0
+        self._active = 0
+        self._waiting = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore.locked() and self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise OverloadedError(self.endpoint)
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._active += 1
+        try:
+            yield
+        finally:
+            self._active -= 1
+            self._semaphore.release()
+
+    def stats(self) -> LimiterStats:
+        return LimiterStats(
+            limit=self.limit,
+            max_queue=self.max_queue,
+            active=self._active,
+            waiting=self._waiting,
+            rejected=self.rejected,
+        )
+
+
+class OffloadPool:
+    def __init__(self, max_workers: int, limits: dict[str, tuple[int, int]]) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="api-offload")
+        self.limiters = {endpoint: ConcurrencyLimiter(endpoint, limit, max_queue) for endpoint, (limit, max_queue) in limits.items()}
+
+    async def run(self, endpoint: str, work: Callable[[], T]) -> T:
+        async with self.limiters[endpoint].slot():
+            return await asyncio.get_running_loop().run_in_executor(self.executor, work)
+
+    def stats(self) -> dict[str, LimiterStats]:
+        return {endpoint: limiter.stats() for endpoint, limiter in self.limiters.items()}
+
+    def shutdown(self) -> None:
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from fastapi import Request
+
+from retail_risk_aug.serialization import dumps
+from retail_risk_aug.state_manager import StateManager
+
+
+def parse_last_event_id(value: str | None) -> int | None:
+    if value is None or not value.strip().isdigit():
+        return None
+    return int(value)
+
+
+async def sse_stream(
+    request: Request,
+    manager: StateManager,
+    after: int | None,
+    max_queue: int,
+    heartbeat_seconds: float,
+    max_events: int | None = None,
+) -> AsyncIterator[bytes]:
+    state = manager.current()
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    subscription = state.live.subscribe(
+        max_queue=max_queue,
+        notify=lambda: loop.call_soon_threadsafe(wakeup.set),
+        after=after,
+    )
+    sent = 0
+    try:
+        yield b"retry: 2000\n\n"
+        while max_events is None or sent < max_events:
+            if await request.is_disconnected():
+                return
+            if manager.version != state.version:
+                yield _control("reset", {"reason": "state reloaded", "version": manager.version})
+                return
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=heartbeat_seconds)
+            except TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+            wakeup.clear()
+            events, dropped = subscription.drain()
+            if dropped:
+                yield _control("lagged", {"dropped": dropped, "seq": state.live.seq})
+            for event in events[: None if max_events is None else max_events - sent]:
+                yield event.encode_sse()
+                sent += 1
+    finally:
+        subscription.close()
+
+
+def _control(kind: str, data: dict[str, object]) -> bytes:
+    return f"event: {kind}\ndata: ".encode() + dumps(data) + b"\n\n"
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from datetime import UTC, datetime
+from functools import partial
+from itertools import islice
+from typing import Any
+
+from pydantic import BaseModel
+
+from retail_risk_aug.alerts import ALERT_TRANSITIONS
+from retail_risk_aug.app_state import AppState
+from retail_risk_aug.models import Alert, ScoredTransaction, Transaction
+from retail_risk_aug.serialization import encode_model
+
+
+EXPORT_MODELS: dict[str, type[BaseModel]] = {
+    "transactions": Transaction,
+    "alerts": Alert,
+    "scores": ScoredTransaction,
+}
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+_TIMESTAMP_FIELDS = frozenset({"ts", "created_ts", "resolution_ts"})
+_FLOAT_FIELDS = frozenset({"amount", "score"})
+_BOOL_FIELDS = frozenset({"is_injected"})
+_LIST_FIELDS = frozenset({"reason_codes"})
+
+
+def export_fields(kind: str, fields: str | None) -> tuple[str, ...]:
+    available = tuple(EXPORT_MODELS[kind].model_fields)
+    if not fields:
+        return available
+    requested = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    unknown = [name for name in requested if name not in available]
+    if unknown or not requested:
+        raise ValueError(f"unknown {kind} fields: {', '.join(unknown) or fields}; available: {', '.join(available)}")
+    return requested
+
+
+def iter_transactions(
+    state: AppState,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    account_id: str | None = None,
+    merchant_id: str | None = None,
+    min_amount: float | None = None,
+    injected: bool | None = None,
+) -> Iterator[Transaction]:
+    for txn in _candidate_transactions(state, start, end, account_id, merchant_id):
+        if account_id is not None and txn.account_id != account_id:
+            continue
+        if merchant_id is not None and txn.merchant_id != merchant_id:
+            continue
+        if min_amount is not None and txn.amount < min_amount:
+            continue
+        if injected is not None and txn.is_injected != injected:
+            continue
+        yield txn
+
+
+def _candidate_transactions(
+    state: AppState,
+    start: datetime | None,
+    end: datetime | None,
+    account_id: str | None,
+    merchant_id: str | None,
+) -> Iterator[Transaction]:
+    keys = [(field, key) for field, key in (("account_id", account_id), ("merchant_id", merchant_id)) if key is not None]
+    if not keys:
+        return state.iter_transactions_between(start, end)
+    field, key = min(keys, key=lambda item: state.transaction_indexes.count(*item))
+    return state.iter_entity_transactions_between(field, key, start, end)
+
+
+def iter_alerts(
+    state: AppState,
+    status: str | None = None,
+    min_score: float | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    page_rows: int = 5000,
+) -> Iterator[Alert]:
+    for current in [status] if status is not None else list(ALERT_TRANSITIONS):
+        cursor: str | None = None
+        while True:
+            page = state.page_alerts(status=current, limit=page_rows, cursor=cursor)
+            for alert in page.items:
+                if min_score is not None and alert.score < min_score:
+                    continue
+                if not _within(alert.created_ts, start, end):
+                    continue
+                yield alert
+            if page.next_cursor is None:
+                break
+            cursor = page.next_cursor
+
+
+def iter_scores(
+    state: AppState,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    min_score: float | None = None,
+    reason_code: str | None = None,
+) -> Iterator[ScoredTransaction]:
+    scored_transactions = state.scored_transactions
+    for txn in state.iter_transactions_between(start, end):
+        scored = scored_transactions.get(txn.txn_id)
+        if scored is None:
+            continue
+        if min_score is not None and scored.score < min_score:
+            continue
+        if reason_code is not None and reason_code not in scored.reason_codes:
+            continue
+        yield scored
+
+
+def export_encoder(
+    kind: str,
+    fields: str | None,
+    export_format: str,
+    batch_rows: int,
+) -> Callable[[Iterable[BaseModel]], Iterator[bytes]]:
+    selected = export_fields(kind, fields)
+    if export_format == "arrow":
+        return partial(_arrow_stream, _pyarrow(), fields=selected, batch_rows=batch_rows)
+    include = None if selected == tuple(EXPORT_MODELS[kind].model_fields) else set(selected)
+    return partial(_ndjson_stream, include=include, batch_rows=batch_rows)
+
+
+def _ndjson_stream(records: Iterable[BaseModel], include: set[str] | None, batch_rows: int) -> Iterator[bytes]:
+    iterator = iter(records)
+    while batch := list(islice(iterator, batch_rows)):
+        yield b"".join(encode_model(record, include=include) + b"\n" for record in batch)
+
+
+def _arrow_stream(pa: Any, records: Iterable[BaseModel], fields: tuple[str, ...], batch_rows: int) -> Iterator[bytes]:
+    schema = pa.schema([(name, _arrow_type(pa, name)) for name in fields])
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, schema)
+    iterator = iter(records)
+    while batch := list(islice(iterator, batch_rows)):
+        columns = {name: [_arrow_value(getattr(record, name)) for record in batch] for name in fields}
+        writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def _arrow_type(pa: Any, name: str) -> Any:
+    if name in _TIMESTAMP_FIELDS:
+        return pa.timestamp("us", tz="UTC")
+    if name in _FLOAT_FIELDS:
+        return pa.float64()
+    if name in _BOOL_FIELDS:
+        return pa.bool_()
+    if name in _LIST_FIELDS:
+        return pa.list_(pa.string())
+    return pa.string()
+
+
+def _arrow_value(value: object) -> object:
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value
+
+
+def _within(ts: datetime, start: datetime | None, end: datetime | None) -> bool:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    if start is not None and ts < (start if start.tzinfo else start.replace(tzinfo=UTC)):
+        return False
+    if end is not None and ts >= (end if end.tzinfo else end.replace(tzinfo=UTC)):
+        return False
+    return True
+
+
+def _pyarrow() -> Any:
+    try:
+        import pyarrow as pa
+        import pyarrow.ipc  # noqa: F401
+    except Exception as exc:  # pragma: no cover
+        raise RuntimeError("pyarrow is required for Arrow export") from exc
+    return pa
+
+
+class _ChunkSink:
+    def __init__(self) -> None:
+        self.closed = False
+        self._chunks: list[bytes] = []
+
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        return len(chunk)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
@@ -1,28 +1,90 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import UTC, datetime
+from typing import Any
 
+from retail_risk_aug.alerts import AlertPage, AlertStore
+from retail_risk_aug.config import Settings
+from retail_risk_aug.deadline import Deadline
 from retail_risk_aug.generator import generate_dataset
-from retail_risk_aug.graph import DevTransactionGraph, build_graph
+from retail_risk_aug.graph import (
+    EntityClusterIndex,
+    GraphBackend,
+    GraphFeatureTable,
+    build_clusters,
+    build_graph,
+    build_graph_backend,
+    build_graph_features,
+)
+from retail_risk_aug.indexes import AggregateSnapshot, DashboardAggregates, TimeBucket, TimelineIndex, TransactionIndexes
+from retail_risk_aug.ingest import IngestMetrics, IngestResult, ingest_transactions
+from retail_risk_aug.live import LiveFeed
 from retail_risk_aug.models import Alert, Customer, GeneratedDataset, ScoredTransaction, SimilarResult, Transaction
-from retail_risk_aug.scoring import score_transactions
+from retail_risk_aug.scoring import IncrementalScorer
+from retail_risk_aug.serialization import FragmentCache
 from retail_risk_aug.vector import TransactionVectorIndex, build_index, search_similar
 
 
+ALERT_THRESHOLD = 0.75
+
+
+@dataclass(slots=True)
+class ComponentStatus:
+    ready: bool = False
+    seconds: float | None = None
+    error: str | None = None
+
+
 @dataclass(slots=True)
 class AppState:
     dataset: GeneratedDataset
     scored_transactions: dict[str, ScoredTransaction]
-    alerts: dict[str, Alert]
+    alerts: AlertStore
     txn_to_case: dict[str, str]
     txn_by_id: dict[str, Transaction]
     account_to_customer: dict[str, Customer]
     vector_index: TransactionVectorIndex
-    graph: DevTransactionGraph
+    graph: GraphBackend
+    clusters: EntityClusterIndex
+    transaction_indexes: TransactionIndexes
+    timeline: TimelineIndex
+    aggregates: DashboardAggregates = field(default_factory=DashboardAggregates)
+    fragments: FragmentCache = field(default_factory=FragmentCache)
+    version: int = 0
+    fingerprint: str = ""
+    scorer: IncrementalScorer | None = None
+    data_version: int = 0
+    ingest_metrics: IngestMetrics = field(default_factory=IngestMetrics)
+    ingest_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    live: LiveFeed = field(default_factory=LiveFeed, repr=False)
 
     def list_alerts(self, status: str = "open") -> list[Alert]:
-        return [alert for alert in self.alerts.values() if alert.status == status]
+        return self.alerts.by_status(status)
+
+    def page_alerts(self, status: str = "open", sort: str = "created_ts", limit: int = 100, cursor: str | None = None) -> AlertPage:
+        return self.alerts.page(status, sort=sort, limit=limit, cursor=cursor)
+
+    def transition_alert(
+        self,
+        case_id: str,
+        status: str,
+        resolution: str | None = None,
+        expected_status: str | None = None,
+    ) -> Alert:
+        if self.scorer is None:
+            raise RuntimeError("this state is read-only and does not accept alert transitions")
+        alert = self.alerts.transition(case_id, status, resolution=resolution, expected_status=expected_status)
+        self.fragments.invalidate("alert", case_id)
+        self.live.publish("alert_status", {"case_id": case_id, "status": alert.status, "open_alerts": self.alerts.count("open")})
+        return alert
+
+    def ingest(self, batch: Iterable[Transaction]) -> IngestResult:
+        return ingest_transactions(self, batch, ALERT_THRESHOLD)
 
     def get_alert(self, case_id: str) -> Alert | None:
         return self.alerts.get(case_id)
@@ -37,28 +99,207 @@ class AppState:
         return self.txn_to_case.get(txn_id)
 
     def get_transactions_by_account(self, account_id: str, limit: int = 50) -> list[Transaction]:
-        items = [txn for txn in self.dataset.transactions if txn.account_id == account_id]
-        return sorted(items, key=lambda txn: txn.ts, reverse=True)[:limit]
+        return self._latest_transactions("account_id", account_id, limit)
 
-    def get_similar_transactions(self, txn_id: str, k: int) -> list[SimilarResult]:
-        return search_similar(self.vector_index, txn_id=txn_id, k=k)
+    def get_transactions_by_merchant(self, merchant_id: str, limit: int = 50) -> list[Transaction]:
+        return self._latest_transactions("merchant_id", merchant_id, limit)
 
+    def get_transactions_by_device(self, device_id: str, limit: int = 50) -> list[Transaction]:
+        return self._latest_transactions("device_id", device_id, limit)
 
-def build_default_app_state(seed: int = 42) -> AppState:
-    dataset = generate_dataset(customers=100, transactions=1000, inject=120, seed=seed)
-    scored_list = score_transactions(dataset.transactions)
-    scored_map = {item.txn_id: item for item in scored_list}
-    txn_by_id = {txn.txn_id: txn for txn in dataset.transactions}
+    def get_transactions_by_ip(self, ip: str, limit: int = 50) -> list[Transaction]:
+        return self._latest_transactions("ip", ip, limit)
 
-    account_to_customer: dict[str, Customer] = {}
-    for customer in dataset.customers:
-        account_id = customer.customer_id.replace("C", "A", 1)
-        account_to_customer[account_id] = customer
+    def get_transactions_by_counterparty(self, account_id: str, limit: int = 50) -> list[Transaction]:
+        return self._latest_transactions("counterparty_account_id", account_id, limit)
+
+    def get_transactions_between(
+        self,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        limit: int | None = None,
+    ) -> list[Transaction]:
+        transactions = self.dataset.transactions
+        return [transactions[position] for position in self.timeline.range(start, end, limit=limit)]
+
+    def iter_transactions_between(self, start: datetime | None = None, end: datetime | None = None) -> Iterator[Transaction]:
+        transactions = self.dataset.transactions
+        return (transactions[position] for position in self.timeline.iter_range(start, end))
+
+    def iter_entity_transactions_between(
+        self,
+        field: str,
+        key: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> Iterator[Transaction]:
+        transactions = self.dataset.transactions
+        return (transactions[position] for position in self.transaction_indexes.between(field, key, start, end))
+
+    def get_timeseries(self, granularity: str, start: datetime | None = None, end: datetime | None = None) -> list[TimeBucket]:
+        return self.timeline.buckets(granularity, start, end)
+
+    def dashboard_snapshot(self, upto: int | None = None) -> AggregateSnapshot:
+        return self.aggregates.snapshot(upto, statuses=self.alerts.status_counts())
+
+    def dashboard_positions(self, view: str, upto: int | None = None, limit: int = 50) -> list[int]:
+        return self.aggregates.latest(view, upto=upto, limit=limit)
+
+    def get_similar_transactions(self, txn_id: str, k: int, deadline: Deadline | None = None) -> list[SimilarResult]:
+        return search_similar(self.vector_index, txn_id=txn_id, k=k, deadline=deadline)
+
+    def _latest_transactions(self, field: str, key: str, limit: int) -> list[Transaction]:
+        transactions = self.dataset.transactions
+        return [transactions[position] for position in self.transaction_indexes.latest(field, key, limit)]
+
+
+class AppStateBuilder:
+    def __init__(
+        self,
+        seed: int = 42,
+        settings: Settings | None = None,
+        max_workers: int = 4,
+        loader: Callable[[], GeneratedDataset] | None = None,
+    ) -> None:
+        self.seed = seed
+        self.settings = settings
+        self.max_workers = max_workers
+        self.loader = loader
+        self.total_seconds: float | None = None
+        self._stages = self._stage_graph()
+        self._futures: dict[str, Future[Any]] = {name: Future() for name in self._stages}
+        self._status = {name: ComponentStatus() for name in self._stages if name != "state"}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="app-state")
+        self._started = False
+        self._started_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        state = self._futures["state"]
+        return state.done() and state.exception() is None
+
+    def start(self) -> AppStateBuilder:
+        with self._lock:
+            if self._started:
+                return self
+            self._started = True
+            self._started_at = time.perf_counter()
+        for name, (dependencies, stage) in self._stages.items():
+            self._schedule(name, dependencies, stage)
+        return self
+
+    def component(self, name: str, timeout: float | None = None) -> Any:
+        return self._futures[name].result(timeout=timeout)
+
+    def result(self, timeout: float | None = None) -> AppState:
+        return self._futures["state"].result(timeout=timeout)
+
+    def on_complete(self, callback: Callable[[Future[AppState]], None]) -> None:
+        self._futures["state"].add_done_callback(callback)
 
-    alerts: dict[str, Alert] = {}
+    def readiness(self) -> dict[str, ComponentStatus]:
+        with self._lock:
+            return {name: replace(status) for name, status in self._status.items()}
+
+    def _stage_graph(self) -> dict[str, tuple[tuple[str, ...], Callable[..., Any]]]:
+        return {
+            "dataset": ((), self._load_dataset),
+            "scoring": (("dataset", "clusters", "graph_features"), _score_dataset),
+            "lookups": (("dataset",), _build_lookups),
+            "timeline": (
+                ("dataset", "scoring"),
+                lambda dataset, scoring: TimelineIndex.from_transactions(dataset.transactions, alert_txn_ids=set(scoring[2])),
+            ),
+            "aggregates": (
+                ("dataset", "scoring"),
+                lambda dataset, scoring: DashboardAggregates.from_transactions(dataset.transactions, alert_txn_ids=set(scoring[2])),
+            ),
+            "vector_index": (("dataset",), lambda dataset: build_index(dataset.transactions)),
+            "graph": (("dataset",), self._build_graph),
+            "graph_features": (("dataset",), lambda dataset: build_graph_features(dataset.transactions)),
+            "clusters": (("dataset",), lambda dataset: build_clusters(dataset.transactions)),
+            "state": (
+                ("dataset", "scoring", "lookups", "timeline", "aggregates", "vector_index", "graph", "clusters"),
+                _assemble_state,
+            ),
+        }
+
+    def _load_dataset(self) -> GeneratedDataset:
+        if self.loader is not None:
+            return self.loader()
+        return generate_dataset(customers=100, transactions=1000, inject=120, seed=self.seed)
+
+    def _build_graph(self, dataset: GeneratedDataset) -> GraphBackend:
+        if self.settings is None:
+            return build_graph(dataset.transactions)
+        return build_graph_backend(self.settings, dataset.transactions)
+
+    def _schedule(self, name: str, dependencies: tuple[str, ...], stage: Callable[..., Any]) -> None:
+        if not dependencies:
+            self._submit(name, dependencies, stage)
+            return
+
+        remaining = [len(dependencies)]
+
+        def on_dependency_done(_: Future[Any]) -> None:
+            with self._lock:
+                remaining[0] -= 1
+                launch = remaining[0] == 0
+            if launch:
+                self._submit(name, dependencies, stage)
+
+        for dependency in dependencies:
+            self._futures[dependency].add_done_callback(on_dependency_done)
+
+    def _submit(self, name: str, dependencies: tuple[str, ...], stage: Callable[..., Any]) -> None:
+        self._executor.submit(self._run, name, dependencies, stage)
+
+    def _run(self, name: str, dependencies: tuple[str, ...], stage: Callable[..., Any]) -> None:
+        target = self._futures[name]
+        started = time.perf_counter()
+        try:
+            value = stage(*(self._futures[dependency].result() for dependency in dependencies))
+        except BaseException as exc:
+            self._finish(name, started, error=exc)
+            target.set_exception(exc)
+            return
+        self._finish(name, started)
+        target.set_result(value)
+
+    def _finish(self, name: str, started: float, error: BaseException | None = None) -> None:
+        finished = time.perf_counter()
+        with self._lock:
+            status = self._status.get(name)
+            if status is not None:
+                status.ready = error is None
+                status.seconds = finished - started
+                status.error = repr(error) if error is not None else None
+            if name == "state" or error is not None:
+                self.total_seconds = finished - self._started_at
+        if name == "state":
+            self._executor.shutdown(wait=False)
+
+
+def build_default_app_state(seed: int = 42, settings: Settings | None = None) -> AppState:
+    return AppStateBuilder(seed=seed, settings=settings).start().result()
+
+
+def _score_dataset(
+    dataset: GeneratedDataset,
+    clusters: EntityClusterIndex,
+    graph_features: GraphFeatureTable,
+) -> tuple[dict[str, ScoredTransaction], AlertStore, dict[str, str], IncrementalScorer]:
+    scorer = IncrementalScorer(clusters=clusters, graph_features=graph_features)
+    return (*_build_alerts(scorer.score(dataset.transactions)), scorer)
+
+
+def _build_alerts(scored_list: list[ScoredTransaction]) -> tuple[dict[str, ScoredTransaction], AlertStore, dict[str, str]]:
+    scored_map = {item.txn_id: item for item in scored_list}
+    alerts = AlertStore()
     txn_to_case: dict[str, str] = {}
 
-    for sequence, scored in enumerate(item for item in scored_list if item.score >= 0.75):
+    for sequence, scored in enumerate(item for item in scored_list if item.score >= ALERT_THRESHOLD):
         case_id = f"CASE-{sequence + 1:07d}"
         alert = Alert(
             case_id=case_id,
@@ -68,9 +309,37 @@ def build_default_app_state(seed: int = 42) -> AppState:
             status="open",
             created_ts=datetime.now(tz=UTC),
         )
-        alerts[case_id] = alert
+        alerts.add(alert)
         txn_to_case[scored.txn_id] = case_id
 
+    return scored_map, alerts, txn_to_case
+
+
+def _build_lookups(dataset: GeneratedDataset) -> tuple[dict[str, Transaction], dict[str, Customer], TransactionIndexes]:
+    txn_by_id = {txn.txn_id: txn for txn in dataset.transactions}
+    return txn_by_id, _account_to_customer(dataset.customers), TransactionIndexes.from_transactions(dataset.transactions)
+
+
+def _account_to_customer(customers: Iterable[Customer]) -> dict[str, Customer]:
+    account_to_customer: dict[str, Customer] = {}
+    for customer in customers:
+        account_id = customer.customer_id.replace("C", "A", 1)
+        account_to_customer[account_id] = customer
+    return account_to_customer
+
+
+def _assemble_state(
+    dataset: GeneratedDataset,
+    scoring: tuple[dict[str, ScoredTransaction], AlertStore, dict[str, str], IncrementalScorer],
+    lookups: tuple[dict[str, Transaction], dict[str, Customer], TransactionIndexes],
+    timeline: TimelineIndex,
+    aggregates: DashboardAggregates,
+    vector_index: TransactionVectorIndex,
+    graph: GraphBackend,
+    clusters: EntityClusterIndex,
+) -> AppState:
+    scored_map, alerts, txn_to_case, scorer = scoring
+    txn_by_id, account_to_customer, transaction_indexes = lookups
     return AppState(
         dataset=dataset,
         scored_transactions=scored_map,
@@ -78,6 +347,11 @@ def build_default_app_state(seed: int = 42) -> AppState:
         txn_to_case=txn_to_case,
         txn_by_id=txn_by_id,
         account_to_customer=account_to_customer,
-        vector_index=build_index(dataset.transactions),
-        graph=build_graph(dataset.transactions),
+        vector_index=vector_index,
+        graph=graph,
+        clusters=clusters,
+        transaction_indexes=transaction_indexes,
+        timeline=timeline,
+        aggregates=aggregates,
+        scorer=scorer,
     )
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
 import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
 
-import uvicorn
+from retail_risk_aug.config import get_settings
 
-from retail_risk_aug.api.app import app as api_app
-from retail_risk_aug.generator import generate_dataset
-from retail_risk_aug.graph import build_graph
-from retail_risk_aug.scoring import score_transactions
-from retail_risk_aug.vector import build_index
+
+APP_FACTORY = "retail_risk_aug.api.app:create_app"
 
 
 def main() -> None:
@@ -16,38 +18,16 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "generate":
-        dataset = generate_dataset(
-            customers=args.customers,
-            transactions=args.transactions,
-            inject=args.inject,
-            seed=args.seed,
-        )
-        injected_count = sum(1 for txn in dataset.transactions if txn.is_injected)
-        print(f"Generated customers={len(dataset.customers)} transactions={len(dataset.transactions)} injected={injected_count}")
+        _generate(args)
         return
 
     if args.command == "pipeline" and args.pipeline_command == "run-all":
-        dataset = generate_dataset(
-            customers=args.customers,
-            transactions=args.transactions,
-            inject=args.inject,
-            seed=args.seed,
-        )
-        scored = score_transactions(dataset.transactions)
-        index = build_index(dataset.transactions)
-        graph = build_graph(dataset.transactions)
-        print(
-            "Pipeline completed "
-            f"transactions={len(dataset.transactions)} "
-            f"alerts={len([item for item in scored if item.score >= 0.5])} "
-            f"vector_backend={index.backend} "
-            f"graph_nodes={graph.graph.number_of_nodes()}"
-        )
+        _run_pipeline(args)
         return
 
     if args.command == "serve":
         if args.target == "api":
-            uvicorn.run(api_app, host=args.host, port=args.port)
+            _serve_api(args)
             return
         print("Run UI with: streamlit run retail_risk_aug/ui/app.py")
         return
@@ -55,12 +35,99 @@ def main() -> None:
     parser.print_help()
 
 
+def _generate(args: argparse.Namespace) -> None:
+    from retail_risk_aug.generator import generate_dataset, save_snapshot
+
+    dataset = generate_dataset(
+        customers=args.customers,
+        transactions=args.transactions,
+        inject=args.inject,
+        seed=args.seed,
+    )
+    injected_count = sum(1 for txn in dataset.transactions if txn.is_injected)
+    print(f"Generated customers={len(dataset.customers)} transactions={len(dataset.transactions)} injected={injected_count}")
+    if args.output:
+        print(f"Snapshot written to {save_snapshot(dataset, args.output)}")
+
+
+def _run_pipeline(args: argparse.Namespace) -> None:
+    from retail_risk_aug.generator import generate_dataset
+    from retail_risk_aug.graph import build_graph, build_graph_backend, build_graph_features
+    from retail_risk_aug.scoring import score_transactions
+    from retail_risk_aug.vector import build_index
+
+    dataset = generate_dataset(
+        customers=args.customers,
+        transactions=args.transactions,
+        inject=args.inject,
+        seed=args.seed,
+    )
+    index = build_index(dataset.transactions)
+    graph = build_graph(dataset.transactions)
+    graph_features = build_graph_features(graph)
+    scored = score_transactions(dataset.transactions, graph_features=graph_features)
+    print(
+        "Pipeline completed "
+        f"transactions={len(dataset.transactions)} "
+        f"alerts={len([item for item in scored if item.score >= 0.5])} "
+        f"vector_backend={index.backend} "
+        f"graph_nodes={graph.node_count()}"
+    )
+    settings = get_settings()
+    if settings.graph_backend != "local":
+        graph_backend = build_graph_backend(settings, [])
+        loaded = graph_backend.add_transactions(dataset.transactions)
+        print(f"Graph loaded backend={settings.graph_backend} transactions={loaded}")
+    print("Graph analytics " + " ".join(f"{metric}={seconds * 1000:.1f}ms" for metric, seconds in graph_features.timings.items()))
+
+
+def _serve_api(args: argparse.Namespace) -> None:
+    import uvicorn
+
+    shared_dir: Path | None = None
+    if args.state_mode == "shared":
+        shared_dir = _publish_shared_state(args.shared_state_dir)
+        os.environ["SHARED_STATE_DIR"] = str(shared_dir)
+    try:
+        uvicorn.run(APP_FACTORY, factory=True, host=args.host, port=args.port, workers=args.workers)
+    finally:
+        if shared_dir is not None:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+def _publish_shared_state(base_dir: str | None) -> Path:
+    settings = get_settings()
+    base = Path(base_dir or settings.shared_state_dir or ("/dev/shm" if Path("/dev/shm").is_dir() else tempfile.gettempdir()))
+    base.mkdir(parents=True, exist_ok=True)
+    target = Path(tempfile.mkdtemp(prefix="retail-risk-state-", dir=base))
+    builder = multiprocessing.get_context("spawn").Process(
+        target=_build_and_publish,
+        args=(str(target), settings.rng_seed),
+        name="state-builder",
+    )
+    builder.start()
+    builder.join()
+    if builder.exitcode != 0:
+        shutil.rmtree(target, ignore_errors=True)
+        raise SystemExit(f"state builder failed with exit code {builder.exitcode}")
+    print(f"Shared state published to {target}")
+    return target
+
+
+def _build_and_publish(directory: str, seed: int) -> None:
+    from retail_risk_aug.app_state import build_default_app_state
+    from retail_risk_aug.shared_state import publish_state
+
+    publish_state(build_default_app_state(seed=seed, settings=get_settings()), directory)
+
+
 def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="retail-risk-aug")
     subparsers = parser.add_subparsers(dest="command")
 
     generate_parser = subparsers.add_parser("generate", help="Generate synthetic dataset")
     _add_generation_args(generate_parser)
+    generate_parser.add_argument("--output", default=None, help="Write the dataset as a JSON snapshot for /admin/reload")
 
     pipeline_parser = subparsers.add_parser("pipeline", help="Run local pipeline")
     pipeline_subparsers = pipeline_parser.add_subparsers(dest="pipeline_command")
@@ -71,6 +138,9 @@ def _build_parser() -> argparse.ArgumentParser:
     serve_parser.add_argument("--target", choices=["api", "ui"], default="api")
     serve_parser.add_argument("--host", default="0.0.0.0")
     serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--workers", type=int, default=1)
+    serve_parser.add_argument("--state-mode", choices=["private", "shared"], default="private")
+    serve_parser.add_argument("--shared-state-dir", default=None)
     return parser
 
 
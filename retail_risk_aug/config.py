@@ -9,7 +9,26 @@ class Settings(BaseSettings):
     cassandra_username: str = ""
     cassandra_password: str = ""
     cassandra_keyspace: str = "retail_risk"
+    cassandra_max_in_flight: int = 128
+    cassandra_write_retries: int = 3
+    cassandra_retry_backoff_seconds: float = 0.05
+    cassandra_unlogged_batches: bool = True
+    cassandra_batch_rows: int = 20
+    cassandra_local_dc: str = ""
+    cassandra_request_timeout_seconds: float = 10.0
+    cassandra_speculative_delay_seconds: float = 0.05
+    cassandra_speculative_attempts: int = 2
+    cassandra_page_size: int = 500
+    cassandra_read_concurrency: int = 32
+    cassandra_alert_bucket: str = "day"
+    cassandra_alert_shards: int = 4
+    cassandra_merchant_bucket: str = "hour"
+    cassandra_merchant_shards: int = 4
     janusgraph_gremlin_endpoint: str = "ws://localhost:8182/gremlin"
+    janusgraph_pool_size: int = 4
+    janusgraph_batch_size: int = 200
+    graph_backend: str = "local"
+    graph_retention_hours: float = 0.0
     minio_endpoint: str = "http://localhost:9000"
     minio_access_key: str = ""
     minio_secret_key: str = ""
@@ -26,6 +45,28 @@ class Settings(BaseSettings):
     vector_index_bucket_path: str = "s3://retail-risk/indices"
     model_version: str = "v1"
     rng_seed: int = 42
+    state_build_workers: int = 4
+    state_wait_seconds: float = 30.0
+    state_snapshot_dir: str = "data/snapshots"
+    shared_state_dir: str = ""
+    api_offload_workers: int = 8
+    api_max_queue: int = 32
+    graph_max_concurrency: int = 4
+    similarity_max_concurrency: int = 4
+    bulk_max_concurrency: int = 4
+    graph_deadline_seconds: float = 2.0
+    similarity_deadline_seconds: float = 1.0
+    export_batch_rows: int = 5000
+    api_cache_max_age: int = 15
+    ingest_max_batch: int = 10000
+    ingest_max_concurrency: int = 1
+    live_queue_size: int = 1000
+    live_heartbeat_seconds: float = 15.0
+    ui_api_base_url: str = ""
+    ui_api_timeout_seconds: float = 5.0
+    ui_api_max_connections: int = 20
+    ui_cache_ttl_seconds: float = 2.0
+    ui_cache_max_entries: int = 4096
 
 
 def get_settings() -> Settings:
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Deadline:
+    expires_at: float
+    truncated: bool = False
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        if time.monotonic() < self.expires_at:
+            return False
+        self.truncated = True
+        return True
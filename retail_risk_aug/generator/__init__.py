@@ -1,3 +1,4 @@
 from .service import generate_dataset
+from .snapshot import load_snapshot, save_snapshot
 
-__all__ = ["generate_dataset"]
+__all__ = ["generate_dataset", "load_snapshot", "save_snapshot"]
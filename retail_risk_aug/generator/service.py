@@ -52,7 +52,7 @@ def generate_dataset(
                 currency="USD",
                 channel=rng.choice(CHANNELS),
                 txn_type=rng.choice(TXN_TYPES),
-                device_id=f"D{rng.randint(1, customers * 2):05d}",
+                device_id=f"D{(index % len(account_ids)) * 2 + rng.randint(1, 2):05d}",
                 ip=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
                 geo=rng.choice(GEOS),
                 narrative="baseline synthetic transaction",
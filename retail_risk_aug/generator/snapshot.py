@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from retail_risk_aug.models import GeneratedDataset
+
+
+def load_snapshot(path: str | Path) -> GeneratedDataset:
+    return GeneratedDataset.model_validate_json(Path(path).read_bytes())
+
+
+def save_snapshot(dataset: GeneratedDataset, path: str | Path) -> Path:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(dataset.model_dump_json(), encoding="utf-8")
+    return target
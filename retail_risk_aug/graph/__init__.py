@@ -1,3 +1,30 @@
-from .dev_graph import DevTransactionGraph, build_graph
+from .analytics import AccountGraphFeatures, GraphCSR, GraphFeatureTable, build_graph_features, compute_graph_features
+from .backend import GraphBackend, build_graph_backend, graph_retention
+from .clusters import ClusterFeatures, EntityClusterIndex, build_clusters
+from .dev_graph import DevTransactionGraph, build_graph, edge_specs
+from .subgraph import Subgraph, SubgraphEdge, SubgraphNode
+from .summary import GraphSummary, SummaryEdge, SummaryNode, summarize_transactions
 
-__all__ = ["DevTransactionGraph", "build_graph"]
+__all__ = [
+    "AccountGraphFeatures",
+    "ClusterFeatures",
+    "DevTransactionGraph",
+    "EntityClusterIndex",
+    "GraphBackend",
+    "GraphCSR",
+    "GraphFeatureTable",
+    "GraphSummary",
+    "Subgraph",
+    "SubgraphEdge",
+    "SubgraphNode",
+    "SummaryEdge",
+    "SummaryNode",
+    "build_clusters",
+    "build_graph",
+    "build_graph_backend",
+    "build_graph_features",
+    "compute_graph_features",
+    "edge_specs",
+    "graph_retention",
+    "summarize_transactions",
+]
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from retail_risk_aug.graph.dev_graph import DevTransactionGraph, edge_specs
+from retail_risk_aug.models import Transaction
+
+
+MONEY_LABELS = frozenset({"PAID_AT", "SENT_TO"})
+
+
+@dataclass(slots=True)
+class GraphCSR:
+    node_ids: list[str]
+    node_index: dict[str, int]
+    indptr: np.ndarray
+    indices: np.ndarray
+    weights: np.ndarray
+    amounts: np.ndarray
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.indices.shape[0])
+
+    @property
+    def rows(self) -> np.ndarray:
+        return np.repeat(np.arange(self.node_count, dtype=np.int64), np.diff(self.indptr))
+
+    @classmethod
+    def from_edges(
+        cls,
+        node_ids: list[str],
+        sources: np.ndarray,
+        targets: np.ndarray,
+        weights: np.ndarray,
+        amounts: np.ndarray,
+    ) -> GraphCSR:
+        order = np.argsort(sources, kind="stable")
+        counts = np.bincount(sources, minlength=len(node_ids))
+        indptr = np.zeros(len(node_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(
+            node_ids=node_ids,
+            node_index={node: position for position, node in enumerate(node_ids)},
+            indptr=indptr,
+            indices=targets[order].astype(np.int64, copy=False),
+            weights=weights[order].astype(np.float64, copy=False),
+            amounts=amounts[order].astype(np.float64, copy=False),
+        )
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> GraphCSR:
+        sources: list[str] = []
+        targets: list[str] = []
+        amounts: list[float] = []
+        for txn in transactions:
+            for source, target, label in edge_specs(txn):
+                sources.append(source)
+                targets.append(target)
+                amounts.append(txn.amount if label in MONEY_LABELS else 0.0)
+        node_ids, inverse = np.unique(np.array(sources + targets, dtype=str), return_inverse=True)
+        node_count = max(len(node_ids), 1)
+        pairs = inverse[: len(sources)].astype(np.int64) * node_count + inverse[len(sources) :]
+        edges, edge_of = np.unique(pairs, return_inverse=True)
+        return cls.from_edges(
+            [str(node) for node in node_ids],
+            edges // node_count,
+            edges % node_count,
+            np.bincount(edge_of, minlength=len(edges)).astype(np.float64),
+            np.bincount(edge_of, weights=np.array(amounts, dtype=np.float64), minlength=len(edges)),
+        )
+
+    @classmethod
+    def from_graph(cls, dev_graph: DevTransactionGraph) -> GraphCSR:
+        with dev_graph.snapshot() as graph:
+            node_ids = sorted(graph.nodes)
+            node_index = {node: position for position, node in enumerate(node_ids)}
+            edge_count = graph.number_of_edges()
+            sources = np.empty(edge_count, dtype=np.int64)
+            targets = np.empty(edge_count, dtype=np.int64)
+            weights = np.empty(edge_count, dtype=np.float64)
+            amounts = np.empty(edge_count, dtype=np.float64)
+            for position, (source, target, data) in enumerate(graph.edges(data=True)):
+                sources[position] = node_index[source]
+                targets[position] = node_index[target]
+                weights[position] = data.get("txn_count", 1)
+                amounts[position] = data.get("amount", 0.0) if data.get("label") in MONEY_LABELS else 0.0
+        return cls.from_edges(node_ids, sources, targets, weights, amounts)
+
+
+@dataclass(slots=True)
+class AccountGraphFeatures:
+    degree_in: int
+    degree_out: int
+    flow_in: float
+    flow_out: float
+    component_size: int
+    pagerank: float
+    pagerank_percentile: float
+
+
+@dataclass(slots=True)
+class GraphFeatureTable:
+    account_ids: list[str]
+    row_by_account: dict[str, int]
+    columns: dict[str, np.ndarray]
+    timings: dict[str, float] = field(default_factory=dict)
+
+    def get(self, account_id: str) -> AccountGraphFeatures | None:
+        row = self.row_by_account.get(account_id)
+        if row is None:
+            return None
+        return AccountGraphFeatures(
+            degree_in=int(self.columns["degree_in"][row]),
+            degree_out=int(self.columns["degree_out"][row]),
+            flow_in=float(self.columns["flow_in"][row]),
+            flow_out=float(self.columns["flow_out"][row]),
+            component_size=int(self.columns["component_size"][row]),
+            pagerank=float(self.columns["pagerank"][row]),
+            pagerank_percentile=float(self.columns["pagerank_percentile"][row]),
+        )
+
+
+def compute_graph_features(csr: GraphCSR, damping: float = 0.85, tolerance: float = 1e-6) -> GraphFeatureTable:
+    timings: dict[str, float] = {}
+    rows = csr.rows
+
+    started = time.perf_counter()
+    degree_out = np.diff(csr.indptr)
+    degree_in = np.bincount(csr.indices, minlength=csr.node_count)
+    timings["degree"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    flow_out = np.bincount(rows, weights=csr.amounts, minlength=csr.node_count)
+    flow_in = np.bincount(csr.indices, weights=csr.amounts, minlength=csr.node_count)
+    timings["flow"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    labels = connected_components(csr)
+    component_size = np.bincount(labels, minlength=csr.node_count)[labels]
+    timings["component_size"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ranks = pagerank(csr, damping=damping, tolerance=tolerance)
+    timings["pagerank"] = time.perf_counter() - started
+
+    account_rows = np.fromiter(
+        (position for position, node in enumerate(csr.node_ids) if node.startswith("account:")),
+        dtype=np.int64,
+    )
+    account_ids = [csr.node_ids[position].split(":", maxsplit=1)[1] for position in account_rows]
+    account_ranks = ranks[account_rows]
+    percentiles = np.empty(len(account_rows), dtype=np.float64)
+    if len(account_rows):
+        percentiles[np.argsort(account_ranks, kind="stable")] = np.arange(1, len(account_rows) + 1) / len(account_rows)
+
+    return GraphFeatureTable(
+        account_ids=account_ids,
+        row_by_account={account_id: row for row, account_id in enumerate(account_ids)},
+        columns={
+            "degree_in": degree_in[account_rows],
+            "degree_out": degree_out[account_rows],
+            "flow_in": flow_in[account_rows],
+            "flow_out": flow_out[account_rows],
+            "component_size": component_size[account_rows],
+            "pagerank": account_ranks,
+            "pagerank_percentile": percentiles,
+        },
+        timings=timings,
+    )
+
+
+def connected_components(csr: GraphCSR) -> np.ndarray:
+    labels = np.arange(csr.node_count, dtype=np.int64)
+    sources = csr.rows
+    targets = csr.indices
+    while True:
+        source_labels = labels[sources]
+        target_labels = labels[targets]
+        pending = source_labels != target_labels
+        if not pending.any():
+            return labels
+        low = np.minimum(source_labels[pending], target_labels[pending])
+        high = np.maximum(source_labels[pending], target_labels[pending])
+        np.minimum.at(labels, high, low)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def pagerank(csr: GraphCSR, damping: float = 0.85, tolerance: float = 1e-6, max_iterations: int = 100) -> np.ndarray:
+    node_count = csr.node_count
+    if node_count == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    rows = csr.rows
+    out_weight = np.bincount(rows, weights=csr.weights, minlength=node_count)
+    dangling = out_weight == 0
+    edge_share = csr.weights / np.where(dangling, 1.0, out_weight)[rows]
+    ranks = np.full(node_count, 1.0 / node_count)
+    for _ in range(max_iterations):
+        spread = np.bincount(csr.indices, weights=ranks[rows] * edge_share, minlength=node_count)
+        updated = damping * (spread + ranks[dangling].sum() / node_count) + (1.0 - damping) / node_count
+        converged = np.abs(updated - ranks).sum() < tolerance * node_count
+        ranks = updated
+        if converged:
+            break
+    return ranks
+
+
+def build_graph_features(source: DevTransactionGraph | Iterable[Transaction]) -> GraphFeatureTable:
+    started = time.perf_counter()
+    csr = GraphCSR.from_graph(source) if isinstance(source, DevTransactionGraph) else GraphCSR.from_transactions(source)
+    to_csr_seconds = time.perf_counter() - started
+    table = compute_graph_features(csr)
+    table.timings = {"to_csr": to_csr_seconds, **table.timings}
+    return table
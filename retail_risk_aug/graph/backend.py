@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import Protocol, runtime_checkable
+
+from retail_risk_aug.config import Settings
+from retail_risk_aug.deadline import Deadline
+from retail_risk_aug.graph.dev_graph import build_graph
+from retail_risk_aug.graph.subgraph import DEFAULT_MAX_EDGES, DEFAULT_MAX_NODES, Subgraph
+from retail_risk_aug.models import Transaction
+
+
+@runtime_checkable
+class GraphBackend(Protocol):
+    def neighborhood(self, account_id: str, hops: int = 2, deadline: Deadline | None = None) -> list[str]: ...
+
+    def subgraph(
+        self,
+        account_id: str,
+        hops: int = 2,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_edges: int = DEFAULT_MAX_EDGES,
+        deadline: Deadline | None = None,
+    ) -> Subgraph: ...
+
+    def induced_subgraph(self, nodes: Iterable[str], max_edges: int = DEFAULT_MAX_EDGES) -> Subgraph: ...
+
+    def paths(self, account_a: str, account_b: str, max_hops: int, deadline: Deadline | None = None) -> list[list[str]]: ...
+
+    def add_transactions(self, batch: Iterable[Transaction]) -> int: ...
+
+    def node_count(self) -> int: ...
+
+
+def build_graph_backend(settings: Settings, transactions: Iterable[Transaction]) -> GraphBackend:
+    if settings.graph_backend == "local":
+        return build_graph(transactions, retention=graph_retention(settings))
+    if settings.graph_backend == "gremlin":
+        from retail_risk_aug.graph.gremlin import GremlinGraphBackend
+
+        return GremlinGraphBackend.from_settings(settings)
+    raise ValueError("graph_backend must be one of: local, gremlin")
+
+
+def graph_retention(settings: Settings) -> timedelta | None:
+    if settings.graph_retention_hours <= 0:
+        return None
+    return timedelta(hours=settings.graph_retention_hours)
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from retail_risk_aug.models import Transaction
+
+
+@dataclass(slots=True)
+class ClusterFeatures:
+    cluster_id: str
+    size: int
+    accounts: int
+
+
+class EntityClusterIndex:
+    def __init__(self, link_transfers: bool = False) -> None:
+        self.link_transfers = link_transfers
+        self._parent: dict[str, str] = {}
+        self._members: dict[str, list[str]] = {}
+        self._accounts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction], link_transfers: bool = False) -> EntityClusterIndex:
+        instance = cls(link_transfers=link_transfers)
+        instance.add_transactions(transactions)
+        return instance
+
+    @property
+    def cluster_count(self) -> int:
+        return len(self._members)
+
+    def add_transactions(self, batch: Iterable[Transaction]) -> None:
+        with self._lock:
+            for txn in batch:
+                account = _node("account", txn.account_id)
+                self._union(account, _node("device", txn.device_id))
+                self._union(account, _node("ip", txn.ip))
+                if self.link_transfers and txn.counterparty_account_id:
+                    self._union(account, _node("account", txn.counterparty_account_id))
+
+    def cluster_id(self, node: str) -> str | None:
+        with self._lock:
+            if node not in self._parent:
+                return None
+            return self._find(node)
+
+    def cluster_size(self, node: str) -> int:
+        with self._lock:
+            if node not in self._parent:
+                return 0
+            return len(self._members[self._find(node)])
+
+    def account_count(self, node: str) -> int:
+        with self._lock:
+            if node not in self._parent:
+                return 0
+            return self._accounts[self._find(node)]
+
+    def members(self, node: str, limit: int | None = None) -> list[str]:
+        with self._lock:
+            if node not in self._parent:
+                return []
+            members = self._members[self._find(node)]
+            return list(members if limit is None else members[:limit])
+
+    def features(self, account_id: str) -> ClusterFeatures | None:
+        node = _node("account", account_id)
+        with self._lock:
+            if node not in self._parent:
+                return None
+            root = self._find(node)
+            return ClusterFeatures(cluster_id=root, size=len(self._members[root]), accounts=self._accounts[root])
+
+    def components(self) -> list[tuple[str, list[str], int]]:
+        with self._lock:
+            return [(root, list(members), self._accounts[root]) for root, members in self._members.items()]
+
+    def _add(self, node: str) -> None:
+        if node in self._parent:
+            return
+        self._parent[node] = node
+        self._members[node] = [node]
+        self._accounts[node] = 1 if node.startswith("account:") else 0
+
+    def _find(self, node: str) -> str:
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def _union(self, left: str, right: str) -> None:
+        self._add(left)
+        self._add(right)
+        left_root = self._find(left)
+        right_root = self._find(right)
+        if left_root == right_root:
+            return
+        if len(self._members[left_root]) < len(self._members[right_root]):
+            left_root, right_root = right_root, left_root
+        self._parent[right_root] = left_root
+        self._members[left_root].extend(self._members.pop(right_root))
+        self._accounts[left_root] += self._accounts.pop(right_root)
+
+
+def build_clusters(transactions: Iterable[Transaction], link_transfers: bool = False) -> EntityClusterIndex:
+    return EntityClusterIndex.from_transactions(transactions, link_transfers=link_transfers)
+
+
+def _node(node_type: str, value: str) -> str:
+    return f"{node_type}:{value}"
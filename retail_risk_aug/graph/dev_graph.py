@@ -1,50 +1,206 @@
 from __future__ import annotations
 
-import networkx as nx
+import heapq
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 
+from retail_risk_aug.deadline import Deadline
+from retail_risk_aug.graph.subgraph import DEFAULT_MAX_EDGES, DEFAULT_MAX_NODES, Subgraph, SubgraphEdge
+from retail_risk_aug.graph.traversal import bounded_neighborhood, bounded_simple_paths, induced_edges
 from retail_risk_aug.models import Transaction
 
+if TYPE_CHECKING:
+    import networkx as nx
+
+
+Edge = tuple[str, str]
+
+
+@dataclass(slots=True, order=True)
+class _RetainedTransaction:
+    ts: datetime
+    txn_id: str
+    edges: tuple[Edge, ...] = field(compare=False)
+
 
 class DevTransactionGraph:
-    def __init__(self) -> None:
+    def __init__(self, retention: timedelta | None = None) -> None:
+        import networkx as nx
+
         self.graph = nx.DiGraph()
+        self.retention = retention
+        self.version = 0
+        self._lock = threading.RLock()
+        self._edge_txns: dict[Edge, dict[str, float]] = {}
+        self._retained: list[_RetainedTransaction] = []
+        self._retained_ids: set[str] = set()
+        self._high_watermark: datetime | None = None
 
     @classmethod
-    def from_transactions(cls, transactions: list[Transaction]) -> DevTransactionGraph:
-        instance = cls()
-        for txn in transactions:
-            account_node = _node("account", txn.account_id)
-            merchant_node = _node("merchant", txn.merchant_id)
-            device_node = _node("device", txn.device_id)
-            ip_node = _node("ip", txn.ip)
-
-            instance.graph.add_edge(account_node, merchant_node, label="PAID_AT", txn_id=txn.txn_id)
-            instance.graph.add_edge(account_node, device_node, label="USES_DEVICE", txn_id=txn.txn_id)
-            instance.graph.add_edge(device_node, ip_node, label="SEEN_ON_IP", txn_id=txn.txn_id)
-
-            if txn.counterparty_account_id:
-                counterparty_node = _node("account", txn.counterparty_account_id)
-                instance.graph.add_edge(account_node, counterparty_node, label="SENT_TO", txn_id=txn.txn_id)
-
+    def from_transactions(cls, transactions: Iterable[Transaction], retention: timedelta | None = None) -> DevTransactionGraph:
+        instance = cls(retention=retention)
+        instance.add_transactions(transactions)
         return instance
 
-    def neighborhood(self, account_id: str, hops: int = 2) -> list[str]:
+    @property
+    def retained_transactions(self) -> int:
+        return len(self._retained_ids)
+
+    def node_count(self) -> int:
+        with self._lock:
+            return self.graph.number_of_nodes()
+
+    @contextmanager
+    def snapshot(self) -> Iterator[nx.DiGraph]:
+        with self._lock:
+            yield self.graph
+
+    def add_transactions(self, batch: Iterable[Transaction]) -> int:
+        with self._lock:
+            added = 0
+            for txn in batch:
+                if txn.txn_id in self._retained_ids:
+                    continue
+                if self._is_expired(txn.ts):
+                    continue
+                edges = tuple(self._link(source, target, label, txn) for source, target, label in edge_specs(txn))
+                heapq.heappush(self._retained, _RetainedTransaction(ts=txn.ts, txn_id=txn.txn_id, edges=edges))
+                self._retained_ids.add(txn.txn_id)
+                if self._high_watermark is None or txn.ts > self._high_watermark:
+                    self._high_watermark = txn.ts
+                added += 1
+
+            if self.retention is not None and self._high_watermark is not None:
+                self._evict(self._high_watermark - self.retention)
+            if added:
+                self.version += 1
+            return added
+
+    def evict_before(self, ts: datetime) -> int:
+        with self._lock:
+            evicted = self._evict(ts)
+            if evicted:
+                self.version += 1
+            return evicted
+
+    def neighborhood(self, account_id: str, hops: int = 2, deadline: Deadline | None = None) -> list[str]:
+        source = _node("account", account_id)
+        with self._lock:
+            if source not in self.graph:
+                return []
+            return sorted(bounded_neighborhood(self.graph.successors, source, hops, deadline)[0])
+
+    def subgraph(
+        self,
+        account_id: str,
+        hops: int = 2,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_edges: int = DEFAULT_MAX_EDGES,
+        deadline: Deadline | None = None,
+    ) -> Subgraph:
         source = _node("account", account_id)
-        if source not in self.graph:
-            return []
-        nodes = nx.single_source_shortest_path_length(self.graph, source, cutoff=hops)
-        return sorted(nodes.keys())
+        with self._lock:
+            if source not in self.graph:
+                return Subgraph()
+            nodes, truncated = bounded_neighborhood(self.graph.successors, source, hops, deadline, max_nodes=max_nodes)
+            return self._induced(nodes, max_edges, truncated=truncated)
 
-    def paths(self, account_a: str, account_b: str, max_hops: int) -> list[list[str]]:
+    def induced_subgraph(self, nodes: Iterable[str], max_edges: int = DEFAULT_MAX_EDGES) -> Subgraph:
+        with self._lock:
+            return self._induced({node for node in nodes if node in self.graph}, max_edges)
+
+    def paths(self, account_a: str, account_b: str, max_hops: int, deadline: Deadline | None = None) -> list[list[str]]:
         source = _node("account", account_a)
         target = _node("account", account_b)
-        if source not in self.graph or target not in self.graph:
-            return []
-        return [list(path) for path in nx.all_simple_paths(self.graph, source=source, target=target, cutoff=max_hops)]
+        with self._lock:
+            if source not in self.graph or target not in self.graph:
+                return []
+            return bounded_simple_paths(self.graph.successors, source, target, max_hops, deadline)
+
+    def _induced(self, nodes: set[str], max_edges: int, truncated: bool = False) -> Subgraph:
+        adjacency = self.graph.adj
+        pairs, capped = induced_edges(adjacency.__getitem__, nodes, max_edges)
+        edges = [
+            SubgraphEdge(
+                source=source,
+                target=target,
+                label=(data := adjacency[source][target])["label"],
+                txn_id=data["txn_id"],
+                txn_count=data["txn_count"],
+                amount=data["amount"],
+            )
+            for source, target in pairs
+        ]
+        return Subgraph.from_parts(nodes, edges, truncated=truncated or capped)
+
+    def _is_expired(self, ts: datetime) -> bool:
+        if self.retention is None or self._high_watermark is None:
+            return False
+        return ts < self._high_watermark - self.retention
+
+    def _link(self, source: str, target: str, label: str, txn: Transaction) -> Edge:
+        edge = (source, target)
+        contributors = self._edge_txns.setdefault(edge, {})
+        contributors[txn.txn_id] = txn.amount
+        if self.graph.has_edge(source, target):
+            data = self.graph.edges[edge]
+            data["txn_id"] = txn.txn_id
+            data["txn_count"] += 1
+            data["amount"] += txn.amount
+        else:
+            self.graph.add_edge(source, target, label=label, txn_id=txn.txn_id, txn_count=1, amount=txn.amount)
+        return edge
+
+    def _evict(self, cutoff: datetime) -> int:
+        evicted = 0
+        while self._retained and self._retained[0].ts < cutoff:
+            record = heapq.heappop(self._retained)
+            self._retained_ids.discard(record.txn_id)
+            for edge in record.edges:
+                self._unlink(edge, record.txn_id)
+            evicted += 1
+        return evicted
+
+    def _unlink(self, edge: Edge, txn_id: str) -> None:
+        contributors = self._edge_txns.get(edge)
+        if contributors is None or txn_id not in contributors:
+            return
+        amount = contributors.pop(txn_id)
+        source, target = edge
+        if not contributors:
+            del self._edge_txns[edge]
+            self.graph.remove_edge(source, target)
+            for node in (source, target):
+                if node in self.graph and self.graph.degree(node) == 0:
+                    self.graph.remove_node(node)
+            return
+
+        data = self.graph.edges[edge]
+        data["txn_count"] -= 1
+        data["amount"] -= amount
+        if data["txn_id"] == txn_id:
+            data["txn_id"] = next(reversed(contributors))
+
+
+def build_graph(transactions: Iterable[Transaction], retention: timedelta | None = None) -> DevTransactionGraph:
+    return DevTransactionGraph.from_transactions(transactions, retention=retention)
 
 
-def build_graph(transactions: list[Transaction]) -> DevTransactionGraph:
-    return DevTransactionGraph.from_transactions(transactions)
+def edge_specs(txn: Transaction) -> list[tuple[str, str, str]]:
+    account_node = _node("account", txn.account_id)
+    device_node = _node("device", txn.device_id)
+    specs = [
+        (account_node, _node("merchant", txn.merchant_id), "PAID_AT"),
+        (account_node, device_node, "USES_DEVICE"),
+        (device_node, _node("ip", txn.ip), "SEEN_ON_IP"),
+    ]
+    if txn.counterparty_account_id:
+        specs.append((account_node, _node("account", txn.counterparty_account_id), "SENT_TO"))
+    return specs
 
 
 def _node(node_type: str, value: str) -> str:
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from retail_risk_aug.config import Settings
+from retail_risk_aug.deadline import Deadline
+from retail_risk_aug.graph.dev_graph import edge_specs
+from retail_risk_aug.graph.subgraph import DEFAULT_MAX_EDGES, DEFAULT_MAX_NODES, Subgraph, SubgraphEdge
+from retail_risk_aug.models import Transaction
+
+try:
+    from websockets.sync.client import ClientConnection, connect
+except Exception:  # pragma: no cover
+    ClientConnection = None
+    connect = None
+
+
+UPSERT_VERTICES_SCRIPT = """
+def ids = [:]
+for (v in vertices) {
+  ids[v.node] = g.V().has(v.label, 'key', v.key).fold()
+    .coalesce(unfold(), addV(v.label).property('key', v.key)).id().next()
+}
+ids
+""".strip()
+
+UPSERT_EDGES_SCRIPT = """
+for (e in edges) {
+  g.V(e.out).outE(e.label).where(inV().hasId(e.in)).fold()
+    .coalesce(unfold(), addE(e.label).from(V(e.out)).to(V(e.in)))
+    .property('txn_id', e.txn_id).iterate()
+}
+edges.size()
+""".strip()
+
+NEIGHBORHOOD_SCRIPT = """
+g.V().has('account', 'key', account_key).emit().repeat(out()).times(hops).dedup()
+  .local(union(label(), values('key')).fold())
+""".strip()
+
+PATHS_SCRIPT = """
+g.V().has('account', 'key', source_key)
+  .repeat(out().simplePath()).emit(has('account', 'key', target_key)).times(max_hops)
+  .has('account', 'key', target_key)
+  .path().by(union(label(), values('key')).fold())
+""".strip()
+
+SUBGRAPH_EDGES_SCRIPT = """
+g.V().has('key', within(keys)).outE().where(inV().has('key', within(keys))).limit(max_edges)
+  .project('out', 'in', 'label', 'txn_id')
+  .by(outV().union(label(), values('key')).fold())
+  .by(inV().union(label(), values('key')).fold())
+  .by(label())
+  .by(coalesce(values('txn_id'), constant('')))
+""".strip()
+
+COUNT_SCRIPT = "g.V().count()"
+
+TERMINAL_STATUS_CODES = {200, 204}
+PARTIAL_CONTENT = 206
+
+
+class GremlinError(RuntimeError):
+    pass
+
+
+class _DeadlineExceeded(Exception):
+    def __init__(self, results: list[list[Any]]) -> None:
+        super().__init__("gremlin deadline exceeded")
+        self.results = results
+
+
+@dataclass(slots=True)
+class GremlinRequest:
+    script: str
+    bindings: dict[str, Any]
+
+
+class GremlinGraphBackend:
+    def __init__(
+        self,
+        endpoint: str,
+        pool_size: int = 4,
+        batch_size: int = 200,
+        timeout: float = 10.0,
+        mimetype: str = "application/vnd.gremlin-v1.0+json",
+    ) -> None:
+        self.endpoint = endpoint
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.mimetype = mimetype
+        self._idle: queue.LifoQueue[ClientConnection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._vertex_ids: dict[str, Any] = {}
+        self._vertex_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> GremlinGraphBackend:
+        return cls(
+            endpoint=settings.janusgraph_gremlin_endpoint,
+            pool_size=settings.janusgraph_pool_size,
+            batch_size=settings.janusgraph_batch_size,
+        )
+
+    @property
+    def cached_vertices(self) -> int:
+        return len(self._vertex_ids)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def add_transactions(self, batch: Iterable[Transaction]) -> int:
+        transactions = list(batch)
+        specs = [(txn, source, target, label) for txn in transactions for source, target, label in edge_specs(txn)]
+
+        with self._vertex_lock:
+            missing = sorted({node for _, source, target, _ in specs for node in (source, target)} - self._vertex_ids.keys())
+        vertex_requests = [
+            GremlinRequest(script=UPSERT_VERTICES_SCRIPT, bindings={"vertices": [_vertex_binding(node) for node in chunk]})
+            for chunk in _chunks(missing, self.batch_size)
+        ]
+        for result in self.submit_many(vertex_requests):
+            with self._vertex_lock:
+                for mapping in result:
+                    self._vertex_ids.update(mapping)
+
+        edges = [
+            {
+                "out": self._vertex_ids[source],
+                "in": self._vertex_ids[target],
+                "label": label,
+                "txn_id": txn.txn_id,
+            }
+            for txn, source, target, label in specs
+        ]
+        self.submit_many(
+            [GremlinRequest(script=UPSERT_EDGES_SCRIPT, bindings={"edges": chunk}) for chunk in _chunks(edges, self.batch_size)]
+        )
+        return len(transactions)
+
+    def neighborhood(self, account_id: str, hops: int = 2, deadline: Deadline | None = None) -> list[str]:
+        rows = self.submit(NEIGHBORHOOD_SCRIPT, {"account_key": account_id, "hops": hops}, deadline=deadline)
+        return sorted(_node_from_pair(row) for row in rows)
+
+    def subgraph(
+        self,
+        account_id: str,
+        hops: int = 2,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_edges: int = DEFAULT_MAX_EDGES,
+        deadline: Deadline | None = None,
+    ) -> Subgraph:
+        source = f"account:{account_id}"
+        nodes = self.neighborhood(account_id, hops=hops, deadline=deadline)
+        if len(nodes) <= max_nodes:
+            return self._induced(nodes, max_edges, deadline=deadline)
+        kept = [source, *(node for node in nodes if node != source)][:max_nodes]
+        return self._induced(kept, max_edges, truncated=True, deadline=deadline)
+
+    def induced_subgraph(self, nodes: Iterable[str], max_edges: int = DEFAULT_MAX_EDGES) -> Subgraph:
+        return self._induced(list(nodes), max_edges)
+
+    def paths(self, account_a: str, account_b: str, max_hops: int, deadline: Deadline | None = None) -> list[list[str]]:
+        rows = self.submit(
+            PATHS_SCRIPT,
+            {"source_key": account_a, "target_key": account_b, "max_hops": max_hops},
+            deadline=deadline,
+        )
+        return [[_node_from_pair(step) for step in _path_objects(row)] for row in rows]
+
+    def node_count(self) -> int:
+        rows = self.submit(COUNT_SCRIPT, {})
+        return int(rows[0]) if rows else 0
+
+    def submit(self, script: str, bindings: dict[str, Any], deadline: Deadline | None = None) -> list[Any]:
+        return self.submit_many([GremlinRequest(script=script, bindings=bindings)], deadline=deadline)[0]
+
+    def submit_many(self, requests: list[GremlinRequest], deadline: Deadline | None = None) -> list[list[Any]]:
+        if not requests:
+            return []
+        try:
+            return self._submit_many(requests, deadline)
+        except _DeadlineExceeded as exc:
+            return exc.results
+
+    def _submit_many(self, requests: list[GremlinRequest], deadline: Deadline | None) -> list[list[Any]]:
+        with self._connection() as connection:
+            request_ids: list[str] = []
+            for request in requests:
+                request_id = str(uuid4())
+                connection.send(self._encode(request_id, request))
+                request_ids.append(request_id)
+
+            results: dict[str, list[Any]] = {request_id: [] for request_id in request_ids}
+            pending = set(request_ids)
+            while pending:
+                timeout = self.timeout if deadline is None else min(self.timeout, deadline.remaining())
+                try:
+                    message = json.loads(connection.recv(timeout=timeout))
+                except TimeoutError:
+                    if deadline is not None and deadline.expired():
+                        raise _DeadlineExceeded([results[request_id] for request_id in request_ids]) from None
+                    raise
+                request_id = message["requestId"]
+                status = message["status"]
+                code = int(status["code"])
+                if code not in TERMINAL_STATUS_CODES and code != PARTIAL_CONTENT:
+                    raise GremlinError(f"gremlin request failed with status {code}: {status.get('message', '')}")
+                data = _untype((message.get("result") or {}).get("data"))
+                if data is not None and request_id in results:
+                    results[request_id].extend(data if isinstance(data, list) else [data])
+                if code in TERMINAL_STATUS_CODES:
+                    pending.discard(request_id)
+            return [results[request_id] for request_id in request_ids]
+
+    def _induced(
+        self,
+        nodes: list[str],
+        max_edges: int,
+        truncated: bool = False,
+        deadline: Deadline | None = None,
+    ) -> Subgraph:
+        members = set(nodes)
+        if not members:
+            return Subgraph()
+        keys = sorted({node.partition(":")[2] for node in members})
+        rows = self.submit(SUBGRAPH_EDGES_SCRIPT, {"keys": keys, "max_edges": max_edges + 1}, deadline=deadline)
+        edges = [
+            SubgraphEdge(source=source, target=target, label=row["label"], txn_id=row["txn_id"] or None)
+            for row in rows
+            if (source := _node_from_pair(row["out"])) in members and (target := _node_from_pair(row["in"])) in members
+        ]
+        return Subgraph.from_parts(members, edges[:max_edges], truncated=truncated or len(edges) > max_edges)
+
+    @contextmanager
+    def _connection(self) -> Iterator[ClientConnection]:
+        if connect is None:
+            raise RuntimeError("websockets is required for GremlinGraphBackend")
+
+        if not self._slots.acquire(timeout=self.timeout):
+            raise GremlinError("gremlin connection pool exhausted")
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._open()
+            try:
+                yield connection
+            except BaseException:
+                connection.close()
+                raise
+            self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def _open(self) -> ClientConnection:
+        return connect(self.endpoint, open_timeout=self.timeout, max_size=None).__enter__()
+
+    def _encode(self, request_id: str, request: GremlinRequest) -> bytes:
+        payload = {
+            "requestId": request_id,
+            "op": "eval",
+            "processor": "",
+            "args": {"gremlin": request.script, "bindings": request.bindings, "language": "gremlin-groovy"},
+        }
+        header = self.mimetype.encode("utf-8")
+        return bytes([len(header)]) + header + json.dumps(payload).encode("utf-8")
+
+
+def _vertex_binding(node: str) -> dict[str, str]:
+    label, key = node.split(":", maxsplit=1)
+    return {"node": node, "label": label, "key": key}
+
+
+def _node_from_pair(pair: list[str]) -> str:
+    label, key = pair
+    return f"{label}:{key}"
+
+
+def _path_objects(path: Any) -> list[Any]:
+    if isinstance(path, dict):
+        return list(path.get("objects", []))
+    return list(path)
+
+
+def _untype(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "@type" in value and "@value" in value:
+            inner = _untype(value["@value"])
+            if value["@type"] == "g:Map" and isinstance(inner, list):
+                return {inner[index]: inner[index + 1] for index in range(0, len(inner), 2)}
+            return inner
+        return {key: _untype(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_untype(item) for item in value]
+    return value
+
+
+def _chunks(items: list[Any], size: int) -> Iterator[list[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
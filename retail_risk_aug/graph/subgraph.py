@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+
+EDGE_LABELS = {
+    ("account", "merchant"): "PAID_AT",
+    ("account", "device"): "USES_DEVICE",
+    ("device", "ip"): "SEEN_ON_IP",
+    ("account", "account"): "SENT_TO",
+}
+DEFAULT_MAX_NODES = 200
+DEFAULT_MAX_EDGES = 500
+
+
+@dataclass(slots=True)
+class SubgraphNode:
+    id: str
+    node_type: str
+    key: str
+
+    @classmethod
+    def parse(cls, node_id: str) -> SubgraphNode:
+        node_type, _, key = node_id.partition(":")
+        return cls(id=node_id, node_type=node_type, key=key)
+
+
+@dataclass(slots=True)
+class SubgraphEdge:
+    source: str
+    target: str
+    label: str
+    txn_id: str | None = None
+    txn_count: int = 1
+    amount: float = 0.0
+
+
+@dataclass(slots=True)
+class Subgraph:
+    nodes: list[SubgraphNode] = field(default_factory=list)
+    edges: list[SubgraphEdge] = field(default_factory=list)
+    truncated: bool = False
+
+    @classmethod
+    def from_parts(cls, nodes: Iterable[str], edges: list[SubgraphEdge], truncated: bool = False) -> Subgraph:
+        return cls(nodes=[SubgraphNode.parse(node) for node in sorted(nodes)], edges=edges, truncated=truncated)
+
+
+def edge_label(source: str, target: str) -> str:
+    return EDGE_LABELS.get((source.partition(":")[0], target.partition(":")[0]), "LINK")
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from collections.abc import Container, Iterable
+from dataclasses import dataclass, field
+
+from retail_risk_aug.graph.dev_graph import edge_specs
+from retail_risk_aug.models import Transaction
+
+
+DEFAULT_SUMMARY_NODES = 60
+DEFAULT_SUMMARY_EDGES = 120
+LEAF_GROUP_MIN = 3
+ALERT_WEIGHT = 5.0
+INJECTED_WEIGHT = 3.0
+
+
+@dataclass(slots=True)
+class SummaryNode:
+    id: str
+    node_type: str
+    label: str
+    weight: int = 0
+    members: int = 1
+    alerts: int = 0
+    injected: int = 0
+    degree: int = 0
+
+    @property
+    def importance(self) -> float:
+        return self.weight + self.degree + ALERT_WEIGHT * self.alerts + INJECTED_WEIGHT * self.injected
+
+
+@dataclass(slots=True)
+class SummaryEdge:
+    source: str
+    target: str
+    label: str
+    weight: int = 0
+    amount: float = 0.0
+    alerts: int = 0
+
+
+@dataclass(slots=True)
+class GraphSummary:
+    nodes: list[SummaryNode] = field(default_factory=list)
+    edges: list[SummaryEdge] = field(default_factory=list)
+    transactions: int = 0
+    hidden_nodes: int = 0
+    hidden_edges: int = 0
+
+
+def summarize_transactions(
+    transactions: Iterable[Transaction],
+    alert_txn_ids: Container[str] = frozenset(),
+    max_nodes: int = DEFAULT_SUMMARY_NODES,
+    max_edges: int = DEFAULT_SUMMARY_EDGES,
+    leaf_group_min: int = LEAF_GROUP_MIN,
+) -> GraphSummary:
+    nodes: dict[str, SummaryNode] = {}
+    edges: dict[tuple[str, str, str], SummaryEdge] = {}
+    neighbors: dict[str, set[str]] = {}
+    count = 0
+    for txn in transactions:
+        count += 1
+        flagged = int(txn.txn_id in alert_txn_ids)
+        for source, target, label in edge_specs(txn):
+            edge = edges.get((source, target, label))
+            if edge is None:
+                edge = edges[source, target, label] = SummaryEdge(source=source, target=target, label=label)
+            edge.weight += 1
+            edge.amount += txn.amount
+            edge.alerts += flagged
+            for node_id, other in ((source, target), (target, source)):
+                node = nodes.get(node_id)
+                if node is None:
+                    node_type, _, key = node_id.partition(":")
+                    node = nodes[node_id] = SummaryNode(id=node_id, node_type=node_type, label=key)
+                node.weight += 1
+                node.alerts += flagged
+                node.injected += int(txn.is_injected)
+                neighbors.setdefault(node_id, set()).add(other)
+
+    nodes, edges = _group_leaves(nodes, edges, neighbors, leaf_group_min)
+    ranked = sorted(nodes.values(), key=lambda node: (-node.importance, node.id))
+    kept = {node.id for node in ranked[:max_nodes]}
+    candidates = [edge for edge in edges.values() if edge.source in kept and edge.target in kept]
+    candidates.sort(key=lambda edge: (-edge.alerts, -edge.weight, edge.source, edge.target))
+    return GraphSummary(
+        nodes=[node for node in ranked if node.id in kept],
+        edges=candidates[:max_edges],
+        transactions=count,
+        hidden_nodes=len(nodes) - len(kept),
+        hidden_edges=len(edges) - min(len(candidates), max_edges),
+    )
+
+
+def _group_leaves(
+    nodes: dict[str, SummaryNode],
+    edges: dict[tuple[str, str, str], SummaryEdge],
+    neighbors: dict[str, set[str]],
+    leaf_group_min: int,
+) -> tuple[dict[str, SummaryNode], dict[tuple[str, str, str], SummaryEdge]]:
+    leaves: dict[tuple[str, str], list[str]] = {}
+    for node_id, linked in neighbors.items():
+        node = nodes[node_id]
+        if len(linked) == 1 and not node.alerts and not node.injected:
+            leaves.setdefault((next(iter(linked)), node.node_type), []).append(node_id)
+
+    renamed: dict[str, str] = {}
+    for (parent, node_type), members in leaves.items():
+        if len(members) < leaf_group_min:
+            continue
+        group_id = f"group:{node_type}@{parent}"
+        group = SummaryNode(id=group_id, node_type=node_type, label=f"{len(members)} {node_type}s", members=len(members), degree=1)
+        for member in members:
+            renamed[member] = group_id
+            group.weight += nodes.pop(member).weight
+        nodes[group_id] = group
+
+    for node_id, linked in neighbors.items():
+        if node_id not in renamed:
+            nodes[node_id].degree = len({renamed.get(other, other) for other in linked})
+    if not renamed:
+        return nodes, edges
+
+    merged: dict[tuple[str, str, str], SummaryEdge] = {}
+    for edge in edges.values():
+        source, target = renamed.get(edge.source, edge.source), renamed.get(edge.target, edge.target)
+        current = merged.get((source, target, edge.label))
+        if current is None:
+            current = merged[source, target, edge.label] = SummaryEdge(source=source, target=target, label=edge.label)
+        current.weight += edge.weight
+        current.amount += edge.amount
+        current.alerts += edge.alerts
+    return nodes, merged
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from typing import TypeVar
+
+from retail_risk_aug.deadline import Deadline
+
+
+N = TypeVar("N", bound=Hashable)
+
+
+def bounded_neighborhood(
+    successors: Callable[[N], Iterable[N]],
+    source: N,
+    hops: int,
+    deadline: Deadline | None = None,
+    max_nodes: int | None = None,
+) -> tuple[set[N], bool]:
+    seen = {source}
+    frontier = [source]
+    for _ in range(hops):
+        reached: list[N] = []
+        for node in frontier:
+            if deadline is not None and deadline.expired():
+                return seen, True
+            for target in successors(node):
+                if target not in seen:
+                    if max_nodes is not None and len(seen) >= max_nodes:
+                        return seen, True
+                    seen.add(target)
+                    reached.append(target)
+        if not reached:
+            break
+        frontier = reached
+    return seen, False
+
+
+def induced_edges(
+    successors: Callable[[N], Iterable[N]],
+    nodes: Iterable[N],
+    max_edges: int | None = None,
+) -> tuple[list[tuple[N, N]], bool]:
+    members = set(nodes)
+    edges: list[tuple[N, N]] = []
+    for node in members:
+        for target in successors(node):
+            if target not in members:
+                continue
+            if max_edges is not None and len(edges) >= max_edges:
+                return edges, True
+            edges.append((node, target))
+    return edges, False
+
+
+def bounded_simple_paths(
+    successors: Callable[[N], Iterable[N]],
+    source: N,
+    target: N,
+    max_hops: int,
+    deadline: Deadline | None = None,
+) -> list[list[N]]:
+    if max_hops < 1:
+        return []
+    if source == target:
+        return [[source]]
+    found: list[list[N]] = []
+    _walk(successors, source, target, max_hops, [source], found, deadline)
+    return found
+
+
+def _walk(
+    successors: Callable[[N], Iterable[N]],
+    node: N,
+    target: N,
+    budget: int,
+    path: list[N],
+    found: list[list[N]],
+    deadline: Deadline | None,
+) -> bool:
+    if deadline is not None and deadline.expired():
+        return False
+    for successor in successors(node):
+        if successor in path:
+            continue
+        if successor == target:
+            found.append([*path, successor])
+            continue
+        if budget > 1:
+            path.append(successor)
+            completed = _walk(successors, successor, target, budget - 1, path, found, deadline)
+            path.pop()
+            if not completed:
+                return False
+    return True
@@ -0,0 +1,15 @@
+from .aggregates import DASHBOARD_VIEWS, AggregateSnapshot, DashboardAggregates
+from .entity import ENTITY_FIELDS, EntityIndex, TransactionIndexes
+from .timeline import BUCKET_SECONDS, TimeBucket, TimelineIndex
+
+__all__ = [
+    "AggregateSnapshot",
+    "BUCKET_SECONDS",
+    "DASHBOARD_VIEWS",
+    "DashboardAggregates",
+    "ENTITY_FIELDS",
+    "EntityIndex",
+    "TimeBucket",
+    "TimelineIndex",
+    "TransactionIndexes",
+]
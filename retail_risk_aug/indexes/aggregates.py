@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+
+from retail_risk_aug.models import Transaction
+
+
+DASHBOARD_VIEWS = ("ALL", "BASELINE", "ALERTS")
+
+
+@dataclass(slots=True)
+class AggregateSnapshot:
+    transactions: int
+    amount: float
+    alerts: int
+    baseline: int
+    by_pattern: dict[str, int]
+    by_channel: dict[str, int]
+    by_status: dict[str, int] = field(default_factory=dict)
+
+
+class DashboardAggregates:
+    def __init__(self) -> None:
+        self._amounts = [0.0]
+        self._views: dict[str, list[int]] = {view: [] for view in DASHBOARD_VIEWS}
+        self._patterns: dict[str, list[int]] = {}
+        self._channels: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction], alert_txn_ids: set[str] | None = None) -> DashboardAggregates:
+        instance = cls()
+        flagged = alert_txn_ids or set()
+        for position, txn in enumerate(transactions):
+            instance.add(position, txn, is_alert=txn.txn_id in flagged)
+        return instance
+
+    def __len__(self) -> int:
+        return len(self._views["ALL"])
+
+    def add(self, position: int, txn: Transaction, is_alert: bool = False) -> None:
+        with self._lock:
+            everything = self._views["ALL"]
+            if everything and position <= everything[-1]:
+                raise ValueError(f"positions must be appended in order, got {position} after {everything[-1]}")
+            everything.append(position)
+            self._views["ALERTS" if is_alert else "BASELINE"].append(position)
+            self._patterns.setdefault(_pattern(txn), []).append(position)
+            self._channels.setdefault(txn.channel, []).append(position)
+            self._amounts.append(self._amounts[-1] + txn.amount)
+
+    def snapshot(self, upto: int | None = None, statuses: Mapping[str, int] | None = None) -> AggregateSnapshot:
+        with self._lock:
+            if upto is None:
+                return AggregateSnapshot(
+                    transactions=len(self._views["ALL"]),
+                    amount=self._amounts[-1],
+                    alerts=len(self._views["ALERTS"]),
+                    baseline=len(self._views["BASELINE"]),
+                    by_pattern={name: len(positions) for name, positions in self._patterns.items()},
+                    by_channel={name: len(positions) for name, positions in self._channels.items()},
+                    by_status=dict(statuses or {}),
+                )
+            total = bisect_left(self._views["ALL"], upto)
+            return AggregateSnapshot(
+                transactions=total,
+                amount=self._amounts[total],
+                alerts=bisect_left(self._views["ALERTS"], upto),
+                baseline=bisect_left(self._views["BASELINE"], upto),
+                by_pattern=_prefix_counts(self._patterns, upto),
+                by_channel=_prefix_counts(self._channels, upto),
+                by_status=dict(statuses or {}),
+            )
+
+    def count(self, view: str, upto: int | None = None) -> int:
+        positions = self._positions(view)
+        return len(positions) if upto is None else bisect_left(positions, upto)
+
+    def latest(self, view: str, upto: int | None = None, limit: int = 50) -> list[int]:
+        positions = self._positions(view)
+        high = len(positions) if upto is None else bisect_left(positions, upto)
+        return positions[max(0, high - limit) : high]
+
+    def _positions(self, view: str) -> list[int]:
+        if view in self._views:
+            return self._views[view]
+        kind, _, key = view.partition(":")
+        if kind == "pattern":
+            return self._patterns.get(key, [])
+        if kind == "channel":
+            return self._channels.get(key, [])
+        raise ValueError(f"unknown dashboard view: {view}")
+
+
+def _pattern(txn: Transaction) -> str:
+    return txn.pattern_tag.value if txn.pattern_tag else "BASELINE"
+
+
+def _prefix_counts(groups: dict[str, list[int]], upto: int) -> dict[str, int]:
+    counts = {name: bisect_left(positions, upto) for name, positions in groups.items()}
+    return {name: count for name, count in counts.items() if count}
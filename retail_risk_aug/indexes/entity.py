@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from retail_risk_aug.models import Transaction
+
+
+ENTITY_FIELDS = ("account_id", "merchant_id", "device_id", "ip", "counterparty_account_id")
+
+
+class EntityIndex:
+    def __init__(self, field: str) -> None:
+        self.field = field
+        self._entries: dict[str, list[tuple[float, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, position: int, txn: Transaction) -> None:
+        key = getattr(txn, self.field)
+        if key is None:
+            return
+        entry = (_epoch(txn.ts), position)
+        entries = self._entries.setdefault(key, [])
+        if not entries or entry >= entries[-1]:
+            entries.append(entry)
+        else:
+            insort(entries, entry)
+
+    def latest(self, key: str, limit: int) -> list[int]:
+        entries = self._entries.get(key)
+        if not entries or limit <= 0:
+            return []
+        return [position for _, position in entries[: -limit - 1 : -1]]
+
+    def between(self, key: str, start: datetime | None = None, end: datetime | None = None) -> list[int]:
+        entries = self._entries.get(key)
+        if not entries:
+            return []
+        low = 0 if start is None else bisect_left(entries, (_epoch(start),))
+        high = len(entries) if end is None else bisect_left(entries, (_epoch(end),))
+        return [position for _, position in entries[low:high]]
+
+    def count(self, key: str) -> int:
+        return len(self._entries.get(key, ()))
+
+
+class TransactionIndexes:
+    def __init__(self, fields: Iterable[str] = ENTITY_FIELDS) -> None:
+        self.by_field = {field: EntityIndex(field) for field in fields}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> TransactionIndexes:
+        instance = cls()
+        instance.extend(transactions)
+        return instance
+
+    def add(self, position: int, txn: Transaction) -> None:
+        for index in self.by_field.values():
+            index.add(position, txn)
+
+    def extend(self, transactions: Iterable[Transaction], start: int = 0) -> None:
+        for offset, txn in enumerate(transactions):
+            self.add(start + offset, txn)
+
+    def latest(self, field: str, key: str, limit: int) -> list[int]:
+        return self.by_field[field].latest(key, limit)
+
+    def between(self, field: str, key: str, start: datetime | None = None, end: datetime | None = None) -> list[int]:
+        return self.by_field[field].between(key, start, end)
+
+    def count(self, field: str, key: str) -> int:
+        return self.by_field[field].count(key)
+
+
+def _epoch(ts: datetime) -> float:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts.timestamp()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from retail_risk_aug.models import Transaction
+
+
+BUCKET_SECONDS = {"minute": 60, "hour": 3600}
+
+
+@dataclass(slots=True)
+class TimeBucket:
+    start: datetime
+    count: int = 0
+    amount: float = 0.0
+    injected: int = 0
+    alerts: int = 0
+
+
+class TimelineIndex:
+    def __init__(self) -> None:
+        self._entries: list[tuple[float, int]] = []
+        self._buckets: dict[str, dict[int, TimeBucket]] = {granularity: {} for granularity in BUCKET_SECONDS}
+        self._bucket_keys: dict[str, list[int]] = {granularity: [] for granularity in BUCKET_SECONDS}
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction], alert_txn_ids: set[str] | None = None) -> TimelineIndex:
+        instance = cls()
+        flagged = alert_txn_ids or set()
+        for position, txn in enumerate(transactions):
+            instance.add(position, txn, is_alert=txn.txn_id in flagged)
+        return instance
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, position: int, txn: Transaction, is_alert: bool = False) -> None:
+        epoch = _epoch(txn.ts)
+        entries = self._entries
+        if not entries or (epoch, position) >= entries[-1]:
+            entries.append((epoch, position))
+        else:
+            insort(entries, (epoch, position))
+
+        for bucket in self._touch_buckets(epoch):
+            bucket.count += 1
+            bucket.amount += txn.amount
+            bucket.injected += int(txn.is_injected)
+            bucket.alerts += int(is_alert)
+
+    def range(self, start: datetime | None = None, end: datetime | None = None, limit: int | None = None) -> list[int]:
+        low, high = self._bounds(start, end)
+        if limit is not None:
+            high = min(high, low + limit)
+        return [position for _, position in self._entries[low:high]]
+
+    def iter_range(self, start: datetime | None = None, end: datetime | None = None) -> Iterator[int]:
+        low, high = self._bounds(start, end)
+        entries = self._entries
+        return (entries[slot][1] for slot in range(low, min(high, len(entries))))
+
+    def count_between(self, start: datetime | None = None, end: datetime | None = None) -> int:
+        low, high = self._bounds(start, end)
+        return high - low
+
+    def buckets(self, granularity: str, start: datetime | None = None, end: datetime | None = None) -> list[TimeBucket]:
+        if granularity not in BUCKET_SECONDS:
+            raise ValueError(f"granularity must be one of: {', '.join(BUCKET_SECONDS)}")
+        keys = self._bucket_keys[granularity]
+        size = BUCKET_SECONDS[granularity]
+        low = 0 if start is None else bisect_left(keys, int(_epoch(start) // size) * size)
+        high = len(keys) if end is None else bisect_left(keys, _epoch(end))
+        buckets = self._buckets[granularity]
+        return [buckets[key] for key in keys[low:high]]
+
+    def _bounds(self, start: datetime | None, end: datetime | None) -> tuple[int, int]:
+        entries = self._entries
+        low = 0 if start is None else bisect_left(entries, (_epoch(start),))
+        high = len(entries) if end is None else bisect_left(entries, (_epoch(end),))
+        return low, max(low, high)
+
+    def _touch_buckets(self, epoch: float) -> list[TimeBucket]:
+        touched: list[TimeBucket] = []
+        for granularity, size in BUCKET_SECONDS.items():
+            key = int(epoch // size) * size
+            buckets = self._buckets[granularity]
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = TimeBucket(start=datetime.fromtimestamp(key, tz=UTC))
+                buckets[key] = bucket
+                keys = self._bucket_keys[granularity]
+                if not keys or key > keys[-1]:
+                    keys.append(key)
+                else:
+                    insort(keys, key)
+            touched.append(bucket)
+        return touched
+
+
+def _epoch(ts: datetime) -> float:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ts.timestamp()
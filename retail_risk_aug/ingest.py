@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from retail_risk_aug.live import transaction_event_item
+from retail_risk_aug.models import Alert, Transaction
+
+if TYPE_CHECKING:
+    from retail_risk_aug.app_state import AppState
+
+
+INGEST_STAGES = ("dedupe", "clusters", "score", "vector_index", "graph", "indexes", "alerts", "publish")
+
+
+@dataclass(slots=True)
+class StageTiming:
+    calls: int = 0
+    rows: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+
+@dataclass(slots=True)
+class IngestResult:
+    accepted: int
+    duplicates: list[str]
+    alerts: list[str]
+    stage_seconds: dict[str, float]
+
+
+@dataclass(slots=True)
+class IngestMetrics:
+    batches: int = 0
+    transactions: int = 0
+    duplicates: int = 0
+    alerts: int = 0
+    stages: dict[str, StageTiming] = field(default_factory=lambda: {stage: StageTiming() for stage in INGEST_STAGES})
+
+    def record(self, result: IngestResult) -> None:
+        self.batches += 1
+        self.transactions += result.accepted
+        self.duplicates += len(result.duplicates)
+        self.alerts += len(result.alerts)
+        for stage, seconds in result.stage_seconds.items():
+            timing = self.stages[stage]
+            timing.calls += 1
+            timing.rows += result.accepted
+            timing.total_seconds += seconds
+            timing.max_seconds = max(timing.max_seconds, seconds)
+
+
+class _StageClock:
+    def __init__(self) -> None:
+        self.seconds: dict[str, float] = {}
+        self._mark = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self.seconds[stage] = now - self._mark
+        self._mark = now
+
+
+def ingest_transactions(state: AppState, batch: Iterable[Transaction], threshold: float) -> IngestResult:
+    if state.scorer is None:
+        raise RuntimeError("this state is read-only and does not accept ingestion")
+    with state.ingest_lock:
+        clock = _StageClock()
+        fresh: list[Transaction] = []
+        duplicates: list[str] = []
+        seen: set[str] = set()
+        for txn in batch:
+            if txn.txn_id in seen or txn.txn_id in state.txn_by_id:
+                duplicates.append(txn.txn_id)
+                continue
+            seen.add(txn.txn_id)
+            fresh.append(txn)
+        clock.lap("dedupe")
+        if not fresh:
+            result = IngestResult(accepted=0, duplicates=duplicates, alerts=[], stage_seconds=clock.seconds)
+            state.ingest_metrics.record(result)
+            return result
+
+        state.clusters.add_transactions(fresh)
+        clock.lap("clusters")
+        scored = state.scorer.score(fresh)
+        flagged = {item.txn_id for item in scored if item.score >= threshold}
+        clock.lap("score")
+        state.vector_index.add(fresh)
+        clock.lap("vector_index")
+        state.graph.add_transactions(fresh)
+        clock.lap("graph")
+
+        transactions = state.dataset.transactions
+        for txn in fresh:
+            position = len(transactions)
+            transactions.append(txn)
+            state.transaction_indexes.add(position, txn)
+            state.timeline.add(position, txn, is_alert=txn.txn_id in flagged)
+            state.aggregates.add(position, txn, is_alert=txn.txn_id in flagged)
+            state.txn_by_id[txn.txn_id] = txn
+        for item in scored:
+            state.scored_transactions[item.txn_id] = item
+        clock.lap("indexes")
+
+        created: list[str] = []
+        now = datetime.now(tz=UTC)
+        for item in scored:
+            if item.txn_id not in flagged:
+                continue
+            case_id = f"CASE-{len(state.alerts) + 1:07d}"
+            state.alerts.add(
+                Alert(
+                    case_id=case_id,
+                    txn_id=item.txn_id,
+                    score=item.score,
+                    reason_codes=item.reason_codes,
+                    status="open",
+                    created_ts=now,
+                )
+            )
+            state.txn_to_case[item.txn_id] = case_id
+            created.append(case_id)
+        clock.lap("alerts")
+
+        state.data_version += 1
+        _publish(state, fresh, flagged, created)
+        clock.lap("publish")
+        result = IngestResult(accepted=len(fresh), duplicates=duplicates, alerts=created, stage_seconds=clock.seconds)
+        state.ingest_metrics.record(result)
+        return result
+
+
+def _publish(state: AppState, fresh: list[Transaction], flagged: set[str], created: list[str]) -> None:
+    items = [transaction_event_item(txn, txn.txn_id in flagged) for txn in fresh]
+    state.live.publish("transactions", {"data_version": state.data_version, "items": items})
+    if created:
+        alerts = [state.alerts.get(case_id) for case_id in created]
+        state.live.publish(
+            "alerts",
+            {"items": [{"case_id": alert.case_id, "txn_id": alert.txn_id, "score": alert.score} for alert in alerts if alert]},
+        )
+    state.live.publish(
+        "aggregates",
+        {
+            "transactions": len(state.dataset.transactions),
+            "open_alerts": state.alerts.count("open"),
+            "patterns": dict(Counter(item["pattern"] for item in items)),
+            "alerts": len(flagged),
+            "amount": sum(txn.amount for txn in fresh),
+        },
+    )
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from retail_risk_aug.models import Transaction
+from retail_risk_aug.serialization import dumps
+
+
+@dataclass(slots=True)
+class LiveEvent:
+    seq: int
+    kind: str
+    data: dict[str, Any]
+
+    def encode_sse(self) -> bytes:
+        return f"id: {self.seq}\nevent: {self.kind}\ndata: ".encode() + dumps(self.data) + b"\n\n"
+
+
+class LiveSubscription:
+    def __init__(self, feed: LiveFeed, max_queue: int, notify: Callable[[], None] | None = None) -> None:
+        self.feed = feed
+        self.max_queue = max_queue
+        self.notify = notify
+        self.dropped = 0
+        self._events: deque[LiveEvent] = deque()
+        self._lock = threading.Lock()
+
+    def push(self, event: LiveEvent) -> None:
+        with self._lock:
+            if len(self._events) >= self.max_queue:
+                self._events.popleft()
+                self.dropped += 1
+            self._events.append(event)
+        if self.notify is not None:
+            self.notify()
+
+    def drain(self) -> tuple[list[LiveEvent], int]:
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            dropped, self.dropped = self.dropped, 0
+        return events, dropped
+
+    def close(self) -> None:
+        self.feed.unsubscribe(self)
+
+
+class LiveFeed:
+    def __init__(self, history: int = 1000) -> None:
+        self.seq = 0
+        self._history: deque[LiveEvent] = deque(maxlen=history)
+        self._subscribers: set[LiveSubscription] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, kind: str, data: dict[str, Any]) -> LiveEvent:
+        with self._lock:
+            self.seq += 1
+            event = LiveEvent(seq=self.seq, kind=kind, data=data)
+            self._history.append(event)
+            for subscription in self._subscribers:
+                subscription.push(event)
+        return event
+
+    def subscribe(
+        self,
+        max_queue: int = 1000,
+        notify: Callable[[], None] | None = None,
+        after: int | None = None,
+    ) -> LiveSubscription:
+        subscription = LiveSubscription(self, max_queue=max_queue, notify=notify)
+        with self._lock:
+            if after is not None:
+                missed = [event for event in self._history if event.seq > after]
+                oldest = self._history[0].seq if self._history else self.seq + 1
+                if after < oldest - 1:
+                    subscription.dropped += oldest - 1 - after
+                for event in missed:
+                    subscription.push(event)
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LiveSubscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+
+def transaction_event_item(txn: Transaction, is_alert: bool) -> dict[str, Any]:
+    return {
+        "txn_id": txn.txn_id,
+        "ts": txn.ts.isoformat(),
+        "account_id": txn.account_id,
+        "amount": txn.amount,
+        "pattern": txn.pattern_tag.value if txn.pattern_tag else "BASELINE",
+        "is_alert": is_alert,
+    }
@@ -1,21 +1,27 @@
 from .domain import (
     Alert,
+    AlertTransitionRequest,
     Customer,
     GeneratedDataset,
     PatternTag,
     ReasonCode,
     ScoredTransaction,
     SimilarResult,
+    StateReloadRequest,
     Transaction,
+    TransactionLookupRequest,
 )
 
 __all__ = [
     "Alert",
+    "AlertTransitionRequest",
     "Customer",
     "GeneratedDataset",
     "PatternTag",
     "ReasonCode",
     "ScoredTransaction",
     "SimilarResult",
+    "StateReloadRequest",
     "Transaction",
+    "TransactionLookupRequest",
 ]
@@ -21,6 +21,8 @@ class ReasonCode(str, Enum):
     SHARED_DEVICE = "SHARED_DEVICE"
     RING_TRANSFER = "RING_TRANSFER"
     NEW_MERCHANT_BURST = "NEW_MERCHANT_BURST"
+    LINKED_CLUSTER = "LINKED_CLUSTER"
+    GRAPH_HUB = "GRAPH_HUB"
 
 
 class Customer(BaseModel):
@@ -62,6 +64,21 @@ class Alert(BaseModel):
     resolution_ts: datetime | None = None
 
 
+class AlertTransitionRequest(BaseModel):
+    status: str
+    resolution: str | None = None
+    expected_status: str | None = None
+
+
+class StateReloadRequest(BaseModel):
+    seed: int | None = None
+    snapshot: str | None = None
+
+
+class TransactionLookupRequest(BaseModel):
+    txn_ids: list[str] = Field(min_length=1, max_length=1000)
+
+
 class ScoredTransaction(BaseModel):
     txn_id: str
     score: float = Field(ge=0, le=1)
@@ -1,3 +1,3 @@
-from .service import score_transactions
+from .service import IncrementalScorer, score_transactions
 
-__all__ = ["score_transactions"]
+__all__ = ["IncrementalScorer", "score_transactions"]
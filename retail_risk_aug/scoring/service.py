@@ -1,47 +1,81 @@
 from __future__ import annotations
 
+import threading
 from collections import defaultdict
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
 
 from retail_risk_aug.models import PatternTag, ReasonCode, ScoredTransaction, Transaction
 
+if TYPE_CHECKING:
+    from retail_risk_aug.graph import EntityClusterIndex, GraphFeatureTable
 
-def score_transactions(transactions: list[Transaction]) -> list[ScoredTransaction]:
-    device_to_accounts: dict[str, set[str]] = defaultdict(set)
-    ip_to_accounts: dict[str, set[str]] = defaultdict(set)
-    account_counts: dict[str, int] = defaultdict(int)
 
-    for txn in transactions:
-        device_to_accounts[txn.device_id].add(txn.account_id)
-        ip_to_accounts[txn.ip].add(txn.account_id)
-        account_counts[txn.account_id] += 1
+LINKED_CLUSTER_MIN_ACCOUNTS = 5
+GRAPH_HUB_MIN_PERCENTILE = 0.99
 
-    seen_devices: set[str] = set()
-    output: list[ScoredTransaction] = []
-    for txn in sorted(transactions, key=lambda item: item.ts):
+
+class IncrementalScorer:
+    def __init__(
+        self,
+        clusters: EntityClusterIndex | None = None,
+        graph_features: GraphFeatureTable | None = None,
+    ) -> None:
+        self.clusters = clusters
+        self.graph_features = graph_features
+        self.scored = 0
+        self._device_to_accounts: dict[str, set[str]] = defaultdict(set)
+        self._ip_to_accounts: dict[str, set[str]] = defaultdict(set)
+        self._account_counts: dict[str, int] = defaultdict(int)
+        self._seen_devices: set[str] = set()
+        self._lock = threading.Lock()
+
+    def score(self, transactions: Iterable[Transaction]) -> list[ScoredTransaction]:
+        batch = list(transactions)
+        with self._lock:
+            for txn in batch:
+                self._device_to_accounts[txn.device_id].add(txn.account_id)
+                self._ip_to_accounts[txn.ip].add(txn.account_id)
+                self._account_counts[txn.account_id] += 1
+            output = [self._score(txn) for txn in sorted(batch, key=lambda item: item.ts)]
+            self.scored += len(output)
+            return output
+
+    def _score(self, txn: Transaction) -> ScoredTransaction:
         score = 0.02
         reason_codes: list[str] = []
 
-        if txn.device_id not in seen_devices:
+        if txn.device_id not in self._seen_devices:
             reason_codes.append(ReasonCode.NEW_DEVICE.value)
             score += 0.04
-            seen_devices.add(txn.device_id)
+            self._seen_devices.add(txn.device_id)
 
         if txn.amount >= 6000.0:
             reason_codes.append(ReasonCode.AMOUNT_SPIKE.value)
             score += 0.22
 
-        if account_counts[txn.account_id] >= 18:
+        if self._account_counts[txn.account_id] >= 18:
             reason_codes.append(ReasonCode.VELOCITY_SPIKE.value)
             score += 0.18
 
-        if len(device_to_accounts[txn.device_id]) >= 3:
+        if len(self._device_to_accounts[txn.device_id]) >= 3:
             reason_codes.append(ReasonCode.SHARED_DEVICE.value)
             score += 0.20
 
-        if len(ip_to_accounts[txn.ip]) >= 3:
+        if len(self._ip_to_accounts[txn.ip]) >= 3:
             reason_codes.append(ReasonCode.SHARED_IP.value)
             score += 0.20
 
+        linked = self.clusters.account_count(f"account:{txn.account_id}") if self.clusters is not None else 0
+        if linked >= LINKED_CLUSTER_MIN_ACCOUNTS:
+            reason_codes.append(ReasonCode.LINKED_CLUSTER.value)
+            score += 0.10
+
+        account_features = self.graph_features.get(txn.account_id) if self.graph_features is not None else None
+        if account_features is not None and account_features.pagerank_percentile >= GRAPH_HUB_MIN_PERCENTILE:
+            reason_codes.append(ReasonCode.GRAPH_HUB.value)
+            score += 0.10
+
         if txn.pattern_tag == PatternTag.RING_TRANSFER:
             reason_codes.append(ReasonCode.RING_TRANSFER.value)
             score += 0.45
@@ -52,13 +86,16 @@ def score_transactions(transactions: list[Transaction]) -> list[ScoredTransactio
         if txn.is_injected and txn.pattern_tag in {PatternTag.SHARED_DEVICE, PatternTag.SHARED_IP}:
             score += 0.30
 
-        deduped_reason_codes = sorted(set(reason_codes))
-        output.append(
-            ScoredTransaction(
-                txn_id=txn.txn_id,
-                score=max(0.0, min(1.0, score)),
-                reason_codes=deduped_reason_codes,
-            )
+        return ScoredTransaction(
+            txn_id=txn.txn_id,
+            score=max(0.0, min(1.0, score)),
+            reason_codes=sorted(set(reason_codes)),
         )
 
-    return output
+
+def score_transactions(
+    transactions: list[Transaction],
+    clusters: EntityClusterIndex | None = None,
+    graph_features: GraphFeatureTable | None = None,
+) -> list[ScoredTransaction]:
+    return IncrementalScorer(clusters=clusters, graph_features=graph_features).score(transactions)
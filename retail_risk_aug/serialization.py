@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from pydantic import BaseModel
+
+from retail_risk_aug.models import Alert, Customer, Transaction
+
+try:
+    import orjson
+except Exception:  # pragma: no cover
+    orjson = None
+
+
+IMMUTABLE_KINDS = frozenset({"transaction", "customer"})
+
+
+def dumps(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_model(model: BaseModel, include: set[str] | None = None) -> bytes:
+    return type(model).__pydantic_serializer__.to_json(model, include=include)
+
+
+def join_array(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+def join_object(fields: Mapping[str, bytes]) -> bytes:
+    return b"{" + b",".join(dumps(name) + b":" + value for name, value in fields.items()) + b"}"
+
+
+class FragmentCache:
+    def __init__(self, max_entries: int = 200_000) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[tuple[str, str], tuple[BaseModel, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def alert(self, alert: Alert) -> bytes:
+        return self.fragment("alert", alert.case_id, alert)
+
+    def transaction(self, txn: Transaction) -> bytes:
+        return self.fragment("transaction", txn.txn_id, txn)
+
+    def customer(self, customer: Customer) -> bytes:
+        return self.fragment("customer", customer.customer_id, customer)
+
+    def alerts(self, alerts: Iterable[Alert]) -> bytes:
+        return join_array(self.alert(alert) for alert in alerts)
+
+    def transactions(self, transactions: Iterable[Transaction]) -> bytes:
+        return join_array(self.transaction(txn) for txn in transactions)
+
+    def fragment(self, kind: str, key: str, entity: BaseModel) -> bytes:
+        entry = self._entries.get((kind, key))
+        if entry is not None and (entry[0] is entity or kind in IMMUTABLE_KINDS):
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        payload = encode_model(entity)
+        with self._lock:
+            if (kind, key) not in self._entries and len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[(kind, key)] = (entity, payload)
+        return payload
+
+    def invalidate(self, kind: str, key: str) -> None:
+        with self._lock:
+            self._entries.pop((kind, key), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
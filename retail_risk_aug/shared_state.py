@@ -0,0 +1,642 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import TypeVar
+
+import numpy as np
+
+from retail_risk_aug.alerts import AlertStore
+from retail_risk_aug.app_state import AppState, _account_to_customer
+from retail_risk_aug.deadline import Deadline
+from retail_risk_aug.graph import ClusterFeatures, DevTransactionGraph, EntityClusterIndex, GraphCSR, build_graph
+from retail_risk_aug.graph.subgraph import DEFAULT_MAX_EDGES, DEFAULT_MAX_NODES, Subgraph, SubgraphEdge, edge_label
+from retail_risk_aug.graph.traversal import bounded_neighborhood, bounded_simple_paths, induced_edges
+from retail_risk_aug.indexes import BUCKET_SECONDS, ENTITY_FIELDS, AggregateSnapshot, TimeBucket
+from retail_risk_aug.models import (
+    Alert,
+    Customer,
+    GeneratedDataset,
+    PatternTag,
+    ReasonCode,
+    ScoredTransaction,
+    Transaction,
+)
+from retail_risk_aug.vector import TransactionVectorIndex
+
+
+SHARED_STATE_FORMAT = 2
+MANIFEST_FILE = "manifest.json"
+STRING_COLUMNS = (
+    "account_id",
+    "counterparty_account_id",
+    "merchant_id",
+    "currency",
+    "channel",
+    "txn_type",
+    "device_id",
+    "ip",
+    "geo",
+    "narrative",
+    "pattern_tag",
+    "injection_group_id",
+)
+REASON_CODES = tuple(code.value for code in ReasonCode)
+BUCKET_COLUMNS = ("keys", "counts", "amounts", "injected", "alerts")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+V = TypeVar("V")
+
+
+@dataclass(slots=True)
+class StringColumn:
+    values: np.ndarray
+    codes: np.ndarray
+
+    @classmethod
+    def encode(cls, items: Sequence[str | None]) -> StringColumn:
+        present = np.fromiter((item is not None for item in items), dtype=bool, count=len(items))
+        codes = np.full(len(items), -1, dtype=np.int32)
+        if not present.any():
+            return cls(values=np.array([], dtype="<U1"), codes=codes)
+        values, inverse = np.unique(np.array([item for item in items if item is not None], dtype=str), return_inverse=True)
+        codes[present] = inverse
+        return cls(values=values, codes=codes)
+
+    def __getitem__(self, position: int) -> str | None:
+        code = int(self.codes[position])
+        return str(self.values[code]) if code >= 0 else None
+
+
+class SortedKeyIndex(Mapping[str, int]):
+    def __init__(self, keys: np.ndarray, positions: np.ndarray) -> None:
+        self._keys = keys
+        self._positions = positions
+
+    def __getitem__(self, key: str) -> int:
+        slot = self._slot(key)
+        if slot < 0:
+            raise KeyError(key)
+        return int(self._positions[slot])
+
+    def __contains__(self, key: object) -> bool:
+        return self._slot(key) >= 0
+
+    def __len__(self) -> int:
+        return int(self._keys.shape[0])
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(key) for key in self._keys)
+
+    def _slot(self, key: object) -> int:
+        if not isinstance(key, str) or not len(self._keys):
+            return -1
+        slot = int(np.searchsorted(self._keys, key))
+        if slot < len(self._keys) and self._keys[slot] == key:
+            return slot
+        return -1
+
+
+class PositionalMapping(Mapping[str, V]):
+    def __init__(self, index: SortedKeyIndex, factory: Callable[[int], V]) -> None:
+        self._index = index
+        self._factory = factory
+
+    def __getitem__(self, key: str) -> V:
+        return self._factory(self._index[key])
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+
+class ColumnarTransactions(Sequence[Transaction]):
+    def __init__(
+        self,
+        txn_ids: np.ndarray,
+        ts_micros: np.ndarray,
+        amounts: np.ndarray,
+        injected: np.ndarray,
+        columns: dict[str, StringColumn],
+    ) -> None:
+        self.txn_ids = txn_ids
+        self.ts_micros = ts_micros
+        self.amounts = amounts
+        self.injected = injected
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return int(self.txn_ids.shape[0])
+
+    def __getitem__(self, position: int | slice) -> Transaction | list[Transaction]:  # type: ignore[override]
+        if isinstance(position, slice):
+            return [self._row(index) for index in range(*position.indices(len(self)))]
+        index = position + len(self) if position < 0 else position
+        if not 0 <= index < len(self):
+            raise IndexError(position)
+        return self._row(index)
+
+    def __iter__(self) -> Iterator[Transaction]:
+        return (self._row(index) for index in range(len(self)))
+
+    def _row(self, index: int) -> Transaction:
+        values = {name: column[index] for name, column in self.columns.items()}
+        pattern_tag = values.pop("pattern_tag")
+        return Transaction.model_construct(
+            txn_id=str(self.txn_ids[index]),
+            ts=_EPOCH + timedelta(microseconds=int(self.ts_micros[index])),
+            amount=float(self.amounts[index]),
+            is_injected=bool(self.injected[index]),
+            pattern_tag=PatternTag(pattern_tag) if pattern_tag is not None else None,
+            **values,
+        )
+
+
+class CSRGraphBackend:
+    def __init__(self, node_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> None:
+        self.node_ids = node_ids
+        self.indptr = indptr
+        self.indices = indices
+        self._node_index = SortedKeyIndex(node_ids, np.arange(len(node_ids), dtype=np.int64))
+
+    def node_count(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    def add_transactions(self, batch: object) -> int:
+        raise RuntimeError("shared graph state is read-only")
+
+    def neighborhood(self, account_id: str, hops: int = 2, deadline: Deadline | None = None) -> list[str]:
+        source = self._node_index.get(f"account:{account_id}")
+        if source is None:
+            return []
+        return [str(self.node_ids[node]) for node in sorted(bounded_neighborhood(self._successors, source, hops, deadline)[0])]
+
+    def subgraph(
+        self,
+        account_id: str,
+        hops: int = 2,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_edges: int = DEFAULT_MAX_EDGES,
+        deadline: Deadline | None = None,
+    ) -> Subgraph:
+        source = self._node_index.get(f"account:{account_id}")
+        if source is None:
+            return Subgraph()
+        nodes, truncated = bounded_neighborhood(self._successors, source, hops, deadline, max_nodes=max_nodes)
+        return self._induced(nodes, max_edges, truncated=truncated)
+
+    def induced_subgraph(self, nodes: Iterable[str], max_edges: int = DEFAULT_MAX_EDGES) -> Subgraph:
+        return self._induced({position for node in nodes if (position := self._node_index.get(node)) is not None}, max_edges)
+
+    def paths(self, account_a: str, account_b: str, max_hops: int, deadline: Deadline | None = None) -> list[list[str]]:
+        source = self._node_index.get(f"account:{account_a}")
+        target = self._node_index.get(f"account:{account_b}")
+        if source is None or target is None:
+            return []
+        return [
+            [str(self.node_ids[node]) for node in path]
+            for path in bounded_simple_paths(self._successors, source, target, max_hops, deadline)
+        ]
+
+    def _induced(self, nodes: set[int], max_edges: int, truncated: bool = False) -> Subgraph:
+        pairs, capped = induced_edges(self._successors, nodes, max_edges)
+        names = {node: str(self.node_ids[node]) for node in nodes}
+        edges = [
+            SubgraphEdge(source=names[source], target=names[target], label=edge_label(names[source], names[target]))
+            for source, target in pairs
+        ]
+        return Subgraph.from_parts(names.values(), edges, truncated=truncated or capped)
+
+    def _successors(self, node: int) -> list[int]:
+        return self.indices[self.indptr[node] : self.indptr[node + 1]].tolist()
+
+
+class GroupedPositions:
+    def __init__(self, keys: np.ndarray, offsets: np.ndarray, positions: np.ndarray) -> None:
+        self.keys = keys
+        self.offsets = offsets
+        self.positions = positions
+        self._slots = SortedKeyIndex(keys, np.arange(len(keys), dtype=np.int64))
+
+    @classmethod
+    def from_column(cls, column: StringColumn, ts_micros: np.ndarray | None = None) -> GroupedPositions:
+        present = np.flatnonzero(column.codes >= 0)
+        codes = column.codes[present]
+        ranks = (present,) if ts_micros is None else (present, ts_micros[present])
+        positions = present[np.lexsort((*ranks, codes))]
+        offsets = np.zeros(len(column.values) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(column.values)), out=offsets[1:])
+        return cls(column.values, offsets, positions.astype(np.int64))
+
+    @classmethod
+    def load(cls, arrays: Mapping[str, np.ndarray], prefix: str) -> GroupedPositions:
+        return cls(arrays[f"{prefix}.keys"], arrays[f"{prefix}.offsets"], arrays[f"{prefix}.positions"])
+
+    def arrays(self, prefix: str) -> dict[str, np.ndarray]:
+        return {f"{prefix}.keys": self.keys, f"{prefix}.offsets": self.offsets, f"{prefix}.positions": self.positions}
+
+    def group(self, key: str) -> np.ndarray:
+        slot = self._slots.get(key)
+        if slot is None:
+            return self.positions[:0]
+        return self.positions[self.offsets[slot] : self.offsets[slot + 1]]
+
+    def items(self) -> Iterator[tuple[str, np.ndarray]]:
+        for slot, key in enumerate(self.keys):
+            yield str(key), self.positions[self.offsets[slot] : self.offsets[slot + 1]]
+
+
+class ColumnarEntityIndexes:
+    def __init__(self, groups: dict[str, GroupedPositions], ts_micros: np.ndarray) -> None:
+        self.groups = groups
+        self.ts_micros = ts_micros
+
+    def add(self, position: int, txn: Transaction) -> None:
+        raise RuntimeError("shared entity indexes are read-only")
+
+    def latest(self, field: str, key: str, limit: int) -> list[int]:
+        if limit <= 0:
+            return []
+        return self.groups[field].group(key)[::-1][:limit].tolist()
+
+    def between(self, field: str, key: str, start: datetime | None = None, end: datetime | None = None) -> list[int]:
+        positions = self.groups[field].group(key)
+        stamps = self.ts_micros[positions]
+        low = 0 if start is None else int(np.searchsorted(stamps, _micros(start)))
+        high = len(positions) if end is None else int(np.searchsorted(stamps, _micros(end)))
+        return positions[low : max(low, high)].tolist()
+
+    def count(self, field: str, key: str) -> int:
+        return len(self.groups[field].group(key))
+
+
+class ColumnarTimeline:
+    def __init__(self, order: np.ndarray, ts_micros: np.ndarray, buckets: dict[str, dict[str, np.ndarray]]) -> None:
+        self.order = order
+        self.ts_micros = ts_micros
+        self._buckets = buckets
+
+    def __len__(self) -> int:
+        return int(self.order.shape[0])
+
+    def add(self, position: int, txn: Transaction, is_alert: bool = False) -> None:
+        raise RuntimeError("shared timeline is read-only")
+
+    def range(self, start: datetime | None = None, end: datetime | None = None, limit: int | None = None) -> list[int]:
+        low, high = self._bounds(start, end)
+        if limit is not None:
+            high = min(high, low + limit)
+        return self.order[low:high].tolist()
+
+    def iter_range(self, start: datetime | None = None, end: datetime | None = None) -> Iterator[int]:
+        low, high = self._bounds(start, end)
+        return (int(position) for position in self.order[low:high])
+
+    def count_between(self, start: datetime | None = None, end: datetime | None = None) -> int:
+        low, high = self._bounds(start, end)
+        return high - low
+
+    def buckets(self, granularity: str, start: datetime | None = None, end: datetime | None = None) -> list[TimeBucket]:
+        if granularity not in BUCKET_SECONDS:
+            raise ValueError(f"granularity must be one of: {', '.join(BUCKET_SECONDS)}")
+        arrays = self._buckets[granularity]
+        keys = arrays["keys"]
+        size = BUCKET_SECONDS[granularity]
+        low = 0 if start is None else int(np.searchsorted(keys, _micros(start) // 1_000_000 // size * size))
+        high = len(keys) if end is None else int(np.searchsorted(keys, _micros(end) / 1_000_000))
+        return [
+            TimeBucket(
+                start=datetime.fromtimestamp(int(keys[slot]), tz=UTC),
+                count=int(arrays["counts"][slot]),
+                amount=float(arrays["amounts"][slot]),
+                injected=int(arrays["injected"][slot]),
+                alerts=int(arrays["alerts"][slot]),
+            )
+            for slot in range(low, high)
+        ]
+
+    def _bounds(self, start: datetime | None, end: datetime | None) -> tuple[int, int]:
+        ts_micros = self.ts_micros
+        low = 0 if start is None else int(np.searchsorted(ts_micros, _micros(start)))
+        high = len(ts_micros) if end is None else int(np.searchsorted(ts_micros, _micros(end)))
+        return low, max(low, high)
+
+
+class ColumnarAggregates:
+    def __init__(
+        self,
+        amounts: np.ndarray,
+        alerts: np.ndarray,
+        baseline: np.ndarray,
+        patterns: GroupedPositions,
+        channels: GroupedPositions,
+    ) -> None:
+        self._amounts = amounts
+        self._views = {"ALL": np.arange(len(amounts) - 1, dtype=np.int64), "ALERTS": alerts, "BASELINE": baseline}
+        self._patterns = patterns
+        self._channels = channels
+
+    def __len__(self) -> int:
+        return len(self._views["ALL"])
+
+    def add(self, position: int, txn: Transaction, is_alert: bool = False) -> None:
+        raise RuntimeError("shared dashboard aggregates are read-only")
+
+    def snapshot(self, upto: int | None = None, statuses: Mapping[str, int] | None = None) -> AggregateSnapshot:
+        total = self.count("ALL", upto)
+        by_pattern = {name: _prefix_count(positions, upto) for name, positions in self._patterns.items()}
+        by_channel = {name: _prefix_count(positions, upto) for name, positions in self._channels.items()}
+        return AggregateSnapshot(
+            transactions=total,
+            amount=float(self._amounts[total]),
+            alerts=self.count("ALERTS", upto),
+            baseline=self.count("BASELINE", upto),
+            by_pattern={name: count for name, count in by_pattern.items() if count},
+            by_channel={name: count for name, count in by_channel.items() if count},
+            by_status=dict(statuses or {}),
+        )
+
+    def count(self, view: str, upto: int | None = None) -> int:
+        return _prefix_count(self._positions(view), upto)
+
+    def latest(self, view: str, upto: int | None = None, limit: int = 50) -> list[int]:
+        positions = self._positions(view)
+        high = _prefix_count(positions, upto)
+        return positions[max(0, high - limit) : high].tolist()
+
+    def _positions(self, view: str) -> np.ndarray:
+        if view in self._views:
+            return self._views[view]
+        kind, _, key = view.partition(":")
+        if kind == "pattern":
+            return self._patterns.group(key)
+        if kind == "channel":
+            return self._channels.group(key)
+        raise ValueError(f"unknown dashboard view: {view}")
+
+
+class ColumnarClusterIndex:
+    def __init__(
+        self,
+        roots: np.ndarray,
+        accounts: np.ndarray,
+        offsets: np.ndarray,
+        members: np.ndarray,
+        node_keys: np.ndarray,
+        node_clusters: np.ndarray,
+    ) -> None:
+        self.roots = roots
+        self.accounts = accounts
+        self.offsets = offsets
+        self.members_by_cluster = members
+        self._nodes = SortedKeyIndex(node_keys, node_clusters)
+
+    @property
+    def cluster_count(self) -> int:
+        return int(self.roots.shape[0])
+
+    def add_transactions(self, batch: object) -> None:
+        raise RuntimeError("shared cluster index is read-only")
+
+    def cluster_id(self, node: str) -> str | None:
+        slot = self._nodes.get(node)
+        return str(self.roots[slot]) if slot is not None else None
+
+    def cluster_size(self, node: str) -> int:
+        slot = self._nodes.get(node)
+        return int(self.offsets[slot + 1] - self.offsets[slot]) if slot is not None else 0
+
+    def account_count(self, node: str) -> int:
+        slot = self._nodes.get(node)
+        return int(self.accounts[slot]) if slot is not None else 0
+
+    def members(self, node: str, limit: int | None = None) -> list[str]:
+        slot = self._nodes.get(node)
+        if slot is None:
+            return []
+        low, high = int(self.offsets[slot]), int(self.offsets[slot + 1])
+        if limit is not None:
+            high = min(high, low + limit)
+        return [str(member) for member in self.members_by_cluster[low:high]]
+
+    def features(self, account_id: str) -> ClusterFeatures | None:
+        slot = self._nodes.get(f"account:{account_id}")
+        if slot is None:
+            return None
+        return ClusterFeatures(
+            cluster_id=str(self.roots[slot]),
+            size=int(self.offsets[slot + 1] - self.offsets[slot]),
+            accounts=int(self.accounts[slot]),
+        )
+
+
+def publish_state(state: AppState, directory: str | Path) -> Path:
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    transactions = state.dataset.transactions
+    txn_ids = np.array([txn.txn_id for txn in transactions], dtype=str)
+    order = np.argsort(txn_ids, kind="stable")
+    graph = state.graph if isinstance(state.graph, DevTransactionGraph) else build_graph(transactions)
+    csr = GraphCSR.from_graph(graph)
+    reason_bits = {code: 1 << bit for bit, code in enumerate(REASON_CODES)}
+    ts_micros = np.array([_micros(txn.ts) for txn in transactions], dtype=np.int64)
+    amounts = np.array([txn.amount for txn in transactions], dtype=np.float64)
+    injected = np.array([txn.is_injected for txn in transactions], dtype=bool)
+    flagged = np.array([txn.txn_id in state.txn_to_case for txn in transactions], dtype=bool)
+    timeline_order = np.lexsort((np.arange(len(transactions)), ts_micros)).astype(np.int64)
+
+    arrays: dict[str, np.ndarray] = {
+        "txn_ids": txn_ids,
+        "txn_id_keys": txn_ids[order],
+        "txn_id_positions": order.astype(np.int64),
+        "ts_micros": ts_micros,
+        "amounts": amounts,
+        "injected": injected,
+        "scores": np.array([state.scored_transactions[txn.txn_id].score for txn in transactions], dtype=np.float64),
+        "reason_masks": np.array(
+            [sum(reason_bits[code] for code in state.scored_transactions[txn.txn_id].reason_codes) for txn in transactions],
+            dtype=np.uint32,
+        ),
+        "vectors": np.ascontiguousarray(state.vector_index.vectors, dtype=np.float32),
+        "graph_node_ids": np.array(csr.node_ids, dtype=str),
+        "graph_indptr": csr.indptr,
+        "graph_indices": csr.indices,
+        "timeline.order": timeline_order,
+        "timeline.ts_micros": ts_micros[timeline_order],
+        "aggregates.amounts": np.concatenate(([0.0], np.cumsum(amounts))),
+        "aggregates.alerts": np.flatnonzero(flagged).astype(np.int64),
+        "aggregates.baseline": np.flatnonzero(~flagged).astype(np.int64),
+        **_cluster_arrays(state.clusters),
+    }
+    for granularity, buckets in _bucket_arrays(ts_micros, amounts, injected, flagged).items():
+        arrays.update({f"timeline.{granularity}.{name}": buckets[name] for name in BUCKET_COLUMNS})
+    for name in STRING_COLUMNS:
+        column = StringColumn.encode([_column_value(txn, name) for txn in transactions])
+        arrays[f"{name}.values"] = column.values
+        arrays[f"{name}.codes"] = column.codes
+        if name in ENTITY_FIELDS:
+            arrays.update(GroupedPositions.from_column(column, ts_micros).arrays(f"entity.{name}"))
+    patterns = StringColumn.encode([txn.pattern_tag.value if txn.pattern_tag else "BASELINE" for txn in transactions])
+    arrays.update(GroupedPositions.from_column(patterns).arrays("aggregates.pattern"))
+    channels = StringColumn(values=arrays["channel.values"], codes=arrays["channel.codes"])
+    arrays.update(GroupedPositions.from_column(channels).arrays("aggregates.channel"))
+
+    for name, array in arrays.items():
+        np.save(root / f"{name}.npy", array, allow_pickle=False)
+    (root / "customers.json").write_text(
+        json.dumps([customer.model_dump(mode="json") for customer in state.dataset.customers]), encoding="utf-8"
+    )
+    (root / "alerts.json").write_text(json.dumps([alert.model_dump(mode="json") for alert in state.alerts]), encoding="utf-8")
+
+    manifest = {
+        "format": SHARED_STATE_FORMAT,
+        "transactions": len(transactions),
+        "arrays": sorted(arrays),
+        "published_ts": datetime.now(tz=UTC).isoformat(),
+    }
+    staging = root / f"{MANIFEST_FILE}.tmp"
+    staging.write_text(json.dumps(manifest), encoding="utf-8")
+    os.replace(staging, root / MANIFEST_FILE)
+    return root
+
+
+def attach_state(directory: str | Path) -> AppState:
+    root = Path(directory)
+    manifest = json.loads((root / MANIFEST_FILE).read_text(encoding="utf-8"))
+    if manifest.get("format") != SHARED_STATE_FORMAT:
+        raise ValueError(f"unsupported shared state format: {manifest.get('format')}")
+    arrays = {name: np.load(root / f"{name}.npy", mmap_mode="r", allow_pickle=False) for name in manifest["arrays"]}
+
+    transactions = ColumnarTransactions(
+        txn_ids=arrays["txn_ids"],
+        ts_micros=arrays["ts_micros"],
+        amounts=arrays["amounts"],
+        injected=arrays["injected"],
+        columns={
+            name: StringColumn(values=arrays[f"{name}.values"], codes=arrays[f"{name}.codes"]) for name in STRING_COLUMNS
+        },
+    )
+    txn_index = SortedKeyIndex(arrays["txn_id_keys"], arrays["txn_id_positions"])
+    customers = [Customer.model_validate(item) for item in json.loads((root / "customers.json").read_text(encoding="utf-8"))]
+    alerts = AlertStore(Alert.model_validate(item) for item in json.loads((root / "alerts.json").read_text(encoding="utf-8")))
+    txn_to_case = {alert.txn_id: alert.case_id for alert in alerts}
+
+    scores = arrays["scores"]
+    reason_masks = arrays["reason_masks"]
+    return AppState(
+        dataset=GeneratedDataset.model_construct(customers=customers, transactions=transactions),
+        scored_transactions=PositionalMapping(
+            txn_index,
+            lambda position: ScoredTransaction(
+                txn_id=str(arrays["txn_ids"][position]),
+                score=float(scores[position]),
+                reason_codes=_reason_codes(int(reason_masks[position])),
+            ),
+        ),
+        alerts=alerts,
+        txn_to_case=txn_to_case,
+        txn_by_id=PositionalMapping(txn_index, transactions.__getitem__),
+        account_to_customer=_account_to_customer(customers),
+        vector_index=TransactionVectorIndex(
+            txn_ids=arrays["txn_ids"],
+            vectors=arrays["vectors"],
+            backend="numpy",
+            id_to_position=txn_index,
+        ),
+        graph=CSRGraphBackend(arrays["graph_node_ids"], arrays["graph_indptr"], arrays["graph_indices"]),
+        clusters=ColumnarClusterIndex(
+            roots=arrays["clusters.roots"],
+            accounts=arrays["clusters.accounts"],
+            offsets=arrays["clusters.offsets"],
+            members=arrays["clusters.members"],
+            node_keys=arrays["clusters.node_keys"],
+            node_clusters=arrays["clusters.node_clusters"],
+        ),
+        transaction_indexes=ColumnarEntityIndexes(
+            {field: GroupedPositions.load(arrays, f"entity.{field}") for field in ENTITY_FIELDS},
+            arrays["ts_micros"],
+        ),
+        timeline=ColumnarTimeline(
+            arrays["timeline.order"],
+            arrays["timeline.ts_micros"],
+            {
+                granularity: {name: arrays[f"timeline.{granularity}.{name}"] for name in BUCKET_COLUMNS}
+                for granularity in BUCKET_SECONDS
+            },
+        ),
+        aggregates=ColumnarAggregates(
+            amounts=arrays["aggregates.amounts"],
+            alerts=arrays["aggregates.alerts"],
+            baseline=arrays["aggregates.baseline"],
+            patterns=GroupedPositions.load(arrays, "aggregates.pattern"),
+            channels=GroupedPositions.load(arrays, "aggregates.channel"),
+        ),
+    )
+
+
+def _cluster_arrays(clusters: EntityClusterIndex) -> dict[str, np.ndarray]:
+    components = clusters.components()
+    members = [member for _, cluster_members, _ in components for member in cluster_members]
+    cluster_slots = np.repeat(np.arange(len(components), dtype=np.int64), [len(item[1]) for item in components])
+    node_keys = np.array(members, dtype=str)
+    order = np.argsort(node_keys, kind="stable")
+    offsets = np.zeros(len(components) + 1, dtype=np.int64)
+    np.cumsum([len(item[1]) for item in components], out=offsets[1:])
+    return {
+        "clusters.roots": np.array([root for root, _, _ in components], dtype=str),
+        "clusters.accounts": np.array([accounts for _, _, accounts in components], dtype=np.int64),
+        "clusters.offsets": offsets,
+        "clusters.members": node_keys,
+        "clusters.node_keys": node_keys[order],
+        "clusters.node_clusters": cluster_slots[order],
+    }
+
+
+def _bucket_arrays(
+    ts_micros: np.ndarray,
+    amounts: np.ndarray,
+    injected: np.ndarray,
+    alerts: np.ndarray,
+) -> dict[str, dict[str, np.ndarray]]:
+    buckets: dict[str, dict[str, np.ndarray]] = {}
+    seconds = ts_micros // 1_000_000
+    for granularity, size in BUCKET_SECONDS.items():
+        keys, inverse = np.unique(seconds // size * size, return_inverse=True)
+        buckets[granularity] = {
+            "keys": keys.astype(np.int64),
+            "counts": np.bincount(inverse, minlength=len(keys)).astype(np.int64),
+            "amounts": np.bincount(inverse, weights=amounts, minlength=len(keys)),
+            "injected": np.bincount(inverse, weights=injected, minlength=len(keys)).astype(np.int64),
+            "alerts": np.bincount(inverse, weights=alerts, minlength=len(keys)).astype(np.int64),
+        }
+    return buckets
+
+
+def _prefix_count(positions: np.ndarray, upto: int | None) -> int:
+    return len(positions) if upto is None else int(np.searchsorted(positions, upto))
+
+
+def _column_value(txn: Transaction, name: str) -> str | None:
+    value = getattr(txn, name)
+    if isinstance(value, PatternTag):
+        return value.value
+    return value
+
+
+def _micros(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return (ts - _EPOCH) // timedelta(microseconds=1)
+
+
+def _reason_codes(mask: int) -> list[str]:
+    return sorted(code for bit, code in enumerate(REASON_CODES) if mask >> bit & 1)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from retail_risk_aug.app_state import AppState, AppStateBuilder
+from retail_risk_aug.config import Settings
+from retail_risk_aug.models import GeneratedDataset
+from retail_risk_aug.serialization import encode_model
+
+
+@dataclass(slots=True, eq=False)
+class _StateSlot:
+    state: AppState
+    version: int
+    refs: int = 0
+    retired: bool = False
+
+
+@dataclass(slots=True)
+class StateMetrics:
+    version: int
+    building: bool
+    builds: int
+    failed_builds: int
+    swaps: int
+    last_build_seconds: float | None
+    last_swap_seconds: float | None
+    last_swap_ts: datetime | None
+    last_error: str | None
+    in_flight: int
+    draining_versions: list[int]
+
+
+class ReloadInProgressError(RuntimeError):
+    pass
+
+
+class StateManager:
+    def __init__(
+        self,
+        state: AppState | None = None,
+        builder: AppStateBuilder | None = None,
+        settings: Settings | None = None,
+        max_workers: int = 4,
+    ) -> None:
+        self.settings = settings
+        self.max_workers = max_workers
+        self.builder = builder
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._current: _StateSlot | None = None
+        self._draining: list[_StateSlot] = []
+        self._pending: AppStateBuilder | None = None
+        self._version = 0
+        self._builds = 0
+        self._failed_builds = 0
+        self._swaps = 0
+        self._last_build_seconds: float | None = None
+        self._last_swap_seconds: float | None = None
+        self._last_swap_ts: datetime | None = None
+        self._last_error: str | None = None
+        if state is not None:
+            self._install(state)
+        elif builder is not None:
+            self._pending = builder
+            builder.on_complete(lambda future: self._on_built(builder, future))
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    @property
+    def building(self) -> bool:
+        with self._lock:
+            return self._pending is not None
+
+    @property
+    def read_only(self) -> bool:
+        with self._lock:
+            return self._current is not None and self._current.state.scorer is None
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    def current(self, timeout: float | None = None) -> AppState:
+        return self._slot(timeout).state
+
+    @contextmanager
+    def acquire(self, timeout: float | None = None) -> Iterator[AppState]:
+        slot = self._slot(timeout, lease=True)
+        try:
+            yield slot.state
+        finally:
+            self._release(slot)
+
+    def reload(self, seed: int | None = None, loader: Callable[[], GeneratedDataset] | None = None) -> AppStateBuilder:
+        with self._lock:
+            if self._pending is not None:
+                raise ReloadInProgressError("a state rebuild is already in progress")
+            if self._current is not None and self._current.state.scorer is None:
+                raise RuntimeError("this state is read-only; republish it and restart the workers to reload")
+            if seed is None:
+                seed = self.builder.seed if self.builder else (self.settings or Settings()).rng_seed
+            builder = AppStateBuilder(
+                seed=seed,
+                settings=self.settings,
+                max_workers=self.max_workers,
+                loader=loader,
+            )
+            self.builder = builder
+            self._pending = builder
+        builder.on_complete(lambda future: self._on_built(builder, future))
+        return builder.start()
+
+    def metrics(self) -> StateMetrics:
+        with self._lock:
+            return StateMetrics(
+                version=self._version,
+                building=self._pending is not None,
+                builds=self._builds,
+                failed_builds=self._failed_builds,
+                swaps=self._swaps,
+                last_build_seconds=self._last_build_seconds,
+                last_swap_seconds=self._last_swap_seconds,
+                last_swap_ts=self._last_swap_ts,
+                last_error=self._last_error,
+                in_flight=sum(slot.refs for slot in self._slots()),
+                draining_versions=[slot.version for slot in self._draining],
+            )
+
+    def _slots(self) -> list[_StateSlot]:
+        return ([self._current] if self._current is not None else []) + self._draining
+
+    def _slot(self, timeout: float | None, lease: bool = False) -> _StateSlot:
+        if not self._ready.wait(timeout):
+            raise TimeoutError("state is still building")
+        with self._lock:
+            slot = self._current
+            if lease:
+                slot.refs += 1
+            return slot
+
+    def _release(self, slot: _StateSlot) -> None:
+        with self._lock:
+            slot.refs -= 1
+            if slot.retired and slot.refs == 0 and slot in self._draining:
+                self._draining.remove(slot)
+
+    def _on_built(self, builder: AppStateBuilder, future: Future[AppState]) -> None:
+        try:
+            state = future.result()
+        except BaseException as exc:
+            with self._lock:
+                if self._pending is builder:
+                    self._pending = None
+                self._failed_builds += 1
+                self._last_build_seconds = builder.total_seconds
+                self._last_error = repr(exc)
+            return
+        self._install(state, builder)
+
+    def _install(self, state: AppState, builder: AppStateBuilder | None = None) -> None:
+        started = time.perf_counter()
+        fingerprint = _fingerprint(state)
+        with self._lock:
+            previous = self._current
+            self._version += 1
+            state.version = self._version
+            state.fingerprint = fingerprint
+            self._current = _StateSlot(state=state, version=self._version)
+            if previous is not None:
+                previous.retired = True
+                if previous.refs:
+                    self._draining.append(previous)
+                self._swaps += 1
+                self._last_swap_ts = datetime.now(tz=UTC)
+                self._last_swap_seconds = time.perf_counter() - started
+            if builder is not None:
+                if self._pending is builder:
+                    self._pending = None
+                self._builds += 1
+                self._last_build_seconds = builder.total_seconds
+                self._last_error = None
+        self._ready.set()
+
+
+def _fingerprint(state: AppState) -> str:
+    transactions = state.dataset.transactions
+    digest = hashlib.blake2b(digest_size=6)
+    digest.update(f"{len(transactions)}:{len(state.alerts)}:".encode())
+    if len(transactions):
+        digest.update(encode_model(transactions[0]))
+        digest.update(encode_model(transactions[-1]))
+    return digest.hexdigest()
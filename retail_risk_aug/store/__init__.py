@@ -1,5 +1,5 @@
-from .cassandra import CassandraStore
+from .cassandra import BulkWriteError, CassandraStore, WriteReport
 from .iceberg import IcebergStore
 from .trino import TrinoClient
 
-__all__ = ["CassandraStore", "IcebergStore", "TrinoClient"]
+__all__ = ["BulkWriteError", "CassandraStore", "IcebergStore", "TrinoClient", "WriteReport"]
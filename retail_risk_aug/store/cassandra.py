@@ -1,17 +1,410 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import base64
+import binascii
+import hashlib
+import heapq
+import math
+import threading
+import time
+import zlib
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from typing import Any
 from uuid import uuid4
 
+from retail_risk_aug.config import Settings
 from retail_risk_aug.models import Alert, Transaction
 
 try:
-    from cassandra.cluster import Cluster, Session
-    from cassandra.query import BatchStatement
+    from cassandra import OperationTimedOut, ReadTimeout, Unavailable, WriteTimeout
+    from cassandra.cluster import Cluster, NoHostAvailable, Session
+    from cassandra.query import BatchStatement, BatchType
 except Exception:  # pragma: no cover
     Cluster = None
     Session = None
     BatchStatement = None
+    BatchType = None
+    RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (TimeoutError,)
+else:
+    RETRYABLE_ERRORS = (TimeoutError, OperationTimedOut, ReadTimeout, WriteTimeout, Unavailable, NoHostAvailable)
+
+
+INSERT_TRANSACTION_BY_ACCOUNT = """
+INSERT INTO transactions_by_account (
+    account_id, ts, txn_id, counterparty_account_id, merchant_id,
+    amount, currency, channel, txn_type, device_id, ip, geo,
+    narrative, is_injected, pattern_tag, injection_group_id
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""".strip()
+
+INSERT_TRANSACTION_BY_MERCHANT = """
+INSERT INTO transactions_by_merchant_bucket (
+    merchant_id, bucket, shard, ts, txn_id, account_id, amount, channel,
+    txn_type, is_injected, pattern_tag
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""".strip()
+
+INSERT_ALERT_BY_STATUS = """
+INSERT INTO alerts_by_status_bucket (
+    status, bucket, shard, created_ts, case_id, txn_id, score,
+    reason_codes, resolution, resolution_ts
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+""".strip()
+
+INSERT_ALERT_BY_STATUS_AT = INSERT_ALERT_BY_STATUS + " USING TIMESTAMP ?"
+
+DELETE_ALERT_BY_STATUS_AT = """
+DELETE FROM alerts_by_status_bucket USING TIMESTAMP ?
+WHERE status = ? AND bucket = ? AND shard = ? AND created_ts = ? AND case_id = ?
+""".strip()
+
+SELECT_TRANSACTIONS_BY_MERCHANT = """
+SELECT merchant_id, ts, txn_id, account_id, amount, channel, txn_type,
+       is_injected, pattern_tag
+FROM transactions_by_merchant_bucket
+WHERE merchant_id = ? AND bucket = ? AND shard = ? AND ts >= ? AND ts <= ?
+""".strip()
+
+SELECT_ALERTS_BY_STATUS = """
+SELECT status, created_ts, case_id, txn_id, score, reason_codes,
+       resolution, resolution_ts
+FROM alerts_by_status_bucket
+WHERE status = ? AND bucket = ? AND shard = ? AND created_ts >= ? AND created_ts <= ?
+""".strip()
+
+SELECT_LEGACY_TRANSACTIONS_BY_MERCHANT = """
+SELECT merchant_id, ts, txn_id, account_id, amount, channel, txn_type,
+       is_injected, pattern_tag
+FROM transactions_by_merchant
+""".strip()
+
+SELECT_LEGACY_ALERTS_BY_STATUS = """
+SELECT status, created_ts, case_id, txn_id, score, reason_codes,
+       resolution, resolution_ts
+FROM alerts_by_status
+""".strip()
+
+SELECT_TRANSACTIONS_BY_ACCOUNT = """
+SELECT account_id, ts, txn_id, counterparty_account_id, merchant_id,
+       amount, currency, channel, txn_type, device_id, ip, geo,
+       narrative, is_injected, pattern_tag, injection_group_id
+FROM transactions_by_account
+WHERE account_id = ?
+""".strip()
+
+WRITE_STATEMENTS = (
+    INSERT_TRANSACTION_BY_ACCOUNT,
+    INSERT_TRANSACTION_BY_MERCHANT,
+    INSERT_ALERT_BY_STATUS_AT,
+    DELETE_ALERT_BY_STATUS_AT,
+)
+READ_STATEMENTS = (SELECT_TRANSACTIONS_BY_ACCOUNT, SELECT_TRANSACTIONS_BY_MERCHANT, SELECT_ALERTS_BY_STATUS)
+BUCKET_FORMATS = {"day": "%Y-%m-%d", "hour": "%Y-%m-%dT%H"}
+READ_PROFILE = "reads"
+READ_TUPLE_PROFILE = "reads_tuple"
+ROW_FORMATS = ("dict", "named", "tuple")
+STREAMS_PER_CONNECTION = {1: 128, 2: 128}
+DEFAULT_STREAMS_PER_CONNECTION = 32768
+
+
+@dataclass(slots=True, frozen=True)
+class TimeBuckets:
+    granularity: str = "day"
+    shards: int = 1
+
+    def __post_init__(self) -> None:
+        if self.granularity not in BUCKET_FORMATS:
+            raise ValueError(f"unknown bucket granularity: {self.granularity}")
+        if self.shards < 1:
+            raise ValueError("shards must be at least 1")
+
+    @property
+    def step(self) -> timedelta:
+        return timedelta(days=1) if self.granularity == "day" else timedelta(hours=1)
+
+    def bucket(self, ts: datetime) -> str:
+        return _utc(ts).strftime(BUCKET_FORMATS[self.granularity])
+
+    def shard(self, key: str) -> int:
+        return zlib.crc32(key.encode("utf-8")) % self.shards if self.shards > 1 else 0
+
+    def partition(self, ts: datetime, key: str) -> tuple[str, int]:
+        return self.bucket(ts), self.shard(key)
+
+    def buckets(self, since: datetime, until: datetime) -> list[str]:
+        start, current = self._floor(since), self._floor(until)
+        if start > current:
+            raise ValueError("since must not be after until")
+        buckets: list[str] = []
+        while current >= start:
+            buckets.append(current.strftime(BUCKET_FORMATS[self.granularity]))
+            current -= self.step
+        return buckets
+
+    def _floor(self, ts: datetime) -> datetime:
+        ts = _utc(ts).replace(minute=0, second=0, microsecond=0)
+        return ts.replace(hour=0) if self.granularity == "day" else ts
+
+
+class BulkWriteError(RuntimeError):
+    def __init__(self, report: WriteReport, errors: list[BaseException]) -> None:
+        super().__init__(f"{len(errors)} Cassandra writes failed after retries: {errors[0]!r}")
+        self.report = report
+        self.errors = errors
+
+
+@dataclass(slots=True)
+class WriteReport:
+    rows: int = 0
+    statements: int = 0
+    batches: int = 0
+    retries: int = 0
+    failures: int = 0
+    seconds: float = 0.0
+    peak_in_flight: int = 0
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def p99_latency_ms(self) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(0.99 * len(ordered)) - 1)] * 1000
+
+    def merge(self, other: WriteReport) -> None:
+        self.rows += other.rows
+        self.statements += other.statements
+        self.batches += other.batches
+        self.retries += other.retries
+        self.failures += other.failures
+        self.seconds += other.seconds
+        self.peak_in_flight = max(self.peak_in_flight, other.peak_in_flight)
+        self.latencies.extend(other.latencies)
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "rows": self.rows,
+            "statements": self.statements,
+            "batches": self.batches,
+            "retries": self.retries,
+            "failures": self.failures,
+            "peak_in_flight": self.peak_in_flight,
+            "seconds": round(self.seconds, 4),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "p99_latency_ms": round(self.p99_latency_ms, 3),
+        }
+
+
+@dataclass(slots=True)
+class WriteRequest:
+    statement: Any
+    parameters: Sequence[Any] | None
+    rows: int = 1
+    batched: bool = False
+    attempt: int = 0
+    started: float = 0.0
+    ready_at: float = 0.0
+
+
+class ConcurrentWriter:
+    def __init__(
+        self,
+        session: Any,
+        max_in_flight: int = 128,
+        max_retries: int = 3,
+        backoff_seconds: float = 0.05,
+        retryable: tuple[type[BaseException], ...] = RETRYABLE_ERRORS,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.session = session
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.retryable = retryable
+        self.clock = clock
+
+    def run(self, requests: Iterable[WriteRequest]) -> WriteReport:
+        return _WriteRun(self).execute(iter(requests))
+
+
+class _WriteRun:
+    def __init__(self, writer: ConcurrentWriter) -> None:
+        self.writer = writer
+        self.report = WriteReport()
+        self.errors: list[BaseException] = []
+        self.in_flight = 0
+        self.retries: deque[WriteRequest] = deque()
+        self.condition = threading.Condition()
+
+    def execute(self, source: Iterable[WriteRequest]) -> WriteReport:
+        writer = self.writer
+        started = writer.clock()
+        pending = iter(source)
+        exhausted = False
+        while True:
+            with self.condition:
+                request = None
+                while True:
+                    if self.in_flight < writer.max_in_flight:
+                        request = self._ready_retry()
+                        if request is not None or not exhausted:
+                            break
+                    if exhausted and not self.in_flight and not self.retries:
+                        break
+                    self.condition.wait(timeout=self._retry_wait())
+                if request is None and exhausted:
+                    break
+                self.in_flight += 1
+                self.report.peak_in_flight = max(self.report.peak_in_flight, self.in_flight)
+            if request is None:
+                request = next(pending, None)
+                if request is None:
+                    exhausted = True
+                    with self.condition:
+                        self.in_flight -= 1
+                    continue
+            self._submit(request)
+        self.report.seconds = writer.clock() - started
+        if self.errors:
+            raise BulkWriteError(self.report, self.errors)
+        return self.report
+
+    def _submit(self, request: WriteRequest) -> None:
+        request.started = self.writer.clock()
+        try:
+            future = self.writer.session.execute_async(request.statement, request.parameters)
+        except BaseException as exc:
+            self._failed(exc, request)
+            return
+        future.add_callbacks(self._done, self._failed, callback_args=(request,), errback_args=(request,))
+
+    def _done(self, _: Any, request: WriteRequest) -> None:
+        latency = self.writer.clock() - request.started
+        with self.condition:
+            self.in_flight -= 1
+            self.report.rows += request.rows
+            self.report.statements += 1
+            self.report.batches += int(request.batched)
+            self.report.latencies.append(latency)
+            self.condition.notify_all()
+
+    def _failed(self, exc: BaseException, request: WriteRequest) -> None:
+        writer = self.writer
+        with self.condition:
+            self.in_flight -= 1
+            if isinstance(exc, writer.retryable) and request.attempt < writer.max_retries:
+                request.attempt += 1
+                request.ready_at = writer.clock() + writer.backoff_seconds * 2 ** (request.attempt - 1)
+                self.report.retries += 1
+                self.retries.append(request)
+            else:
+                self.report.failures += 1
+                self.errors.append(exc)
+            self.condition.notify_all()
+
+    def _ready_retry(self) -> WriteRequest | None:
+        if self.retries and self.retries[0].ready_at <= self.writer.clock():
+            return self.retries.popleft()
+        return None
+
+    def _retry_wait(self) -> float | None:
+        if not self.retries:
+            return None
+        return max(0.0, self.retries[0].ready_at - self.writer.clock())
+
+
+@dataclass(slots=True)
+class StoreMetrics:
+    statements_prepared: int
+    statement_cache_hits: int
+    statement_cache_misses: int
+    pool_hosts: int
+    pool_in_flight: int
+    pool_capacity: int
+    peak_in_flight: int
+
+    @property
+    def pool_saturation(self) -> float:
+        return self.pool_in_flight / self.pool_capacity if self.pool_capacity else 0.0
+
+    @property
+    def peak_saturation(self) -> float:
+        return self.peak_in_flight / self.pool_capacity if self.pool_capacity else 0.0
+
+
+@dataclass(slots=True)
+class RowPage:
+    rows: list[Any]
+    token: str | None = None
+
+
+def encode_paging_token(paging_state: bytes | None, key: str) -> str | None:
+    if not paging_state:
+        return None
+    return base64.urlsafe_b64encode(_token_digest(key) + paging_state).rstrip(b"=").decode("ascii")
+
+
+def decode_paging_token(token: str | None, key: str) -> bytes | None:
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError) as exc:
+        raise ValueError("invalid paging token") from exc
+    digest = _token_digest(key)
+    if len(raw) <= len(digest) or raw[: len(digest)] != digest:
+        raise ValueError("paging token does not belong to this query")
+    return raw[len(digest) :]
+
+
+def _token_digest(key: str) -> bytes:
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+
+
+class StatementCache:
+    def __init__(self, session: Any) -> None:
+        self.session = session
+        self.hits = 0
+        self.misses = 0
+        self._prepared: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._prepared)
+
+    def get(self, query: str, idempotent: bool = False) -> Any:
+        prepared = self._prepared.get(query)
+        if prepared is not None:
+            self.hits += 1
+            return prepared
+        with self._lock:
+            self.misses += 1
+            return self._prepare(query, idempotent)
+
+    def prepare_all(self) -> None:
+        with self._lock:
+            for query in WRITE_STATEMENTS:
+                self._prepare(query, False)
+            for query in READ_STATEMENTS:
+                self._prepare(query, True)
+
+    def _prepare(self, query: str, idempotent: bool) -> Any:
+        prepared = self._prepared.get(query)
+        if prepared is None:
+            prepared = self.session.prepare(query)
+            prepared.is_idempotent = idempotent
+            self._prepared[query] = prepared
+        return prepared
+
+    def stats(self) -> dict[str, int]:
+        return {"prepared": len(self._prepared), "hits": self.hits, "misses": self.misses}
 
 
 class CassandraStore:
@@ -22,14 +415,42 @@ class CassandraStore:
         password: str,
         keyspace: str = "retail_risk",
         port: int = 9042,
+        max_in_flight: int = 128,
+        write_retries: int = 3,
+        retry_backoff_seconds: float = 0.05,
+        unlogged_batches: bool = True,
+        batch_rows: int = 20,
+        local_dc: str = "",
+        request_timeout_seconds: float = 10.0,
+        speculative_delay_seconds: float = 0.05,
+        speculative_attempts: int = 2,
+        page_size: int = 500,
+        read_concurrency: int = 32,
+        alert_buckets: TimeBuckets | None = None,
+        merchant_buckets: TimeBuckets | None = None,
     ) -> None:
         self.contact_points = contact_points
         self.username = username
         self.password = password
         self.keyspace = keyspace
         self.port = port
+        self.max_in_flight = max_in_flight
+        self.write_retries = write_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.unlogged_batches = unlogged_batches
+        self.batch_rows = batch_rows
+        self.local_dc = local_dc
+        self.request_timeout_seconds = request_timeout_seconds
+        self.speculative_delay_seconds = speculative_delay_seconds
+        self.speculative_attempts = speculative_attempts
+        self.page_size = page_size
+        self.read_concurrency = read_concurrency
+        self.alert_buckets = alert_buckets or TimeBuckets("day", shards=4)
+        self.merchant_buckets = merchant_buckets or TimeBuckets("hour", shards=4)
         self._cluster: Cluster | None = None
         self._session: Session | None = None
+        self._statements: StatementCache | None = None
+        self._peak_in_flight = 0
 
     def connect(self) -> None:
         if Cluster is None:
@@ -41,8 +462,17 @@ class CassandraStore:
 
             auth_provider = PlainTextAuthProvider(username=self.username, password=self.password)
 
-        self._cluster = Cluster(contact_points=self.contact_points, port=self.port, auth_provider=auth_provider)
-        self._session = self._cluster.connect()
+        self._cluster = Cluster(
+            contact_points=self.contact_points,
+            port=self.port,
+            auth_provider=auth_provider,
+            execution_profiles=self._execution_profiles(),
+        )
+        session = self._cluster.connect()
+        self._bind(session)
+        if self.keyspace in self._cluster.metadata.keyspaces:
+            session.set_keyspace(self.keyspace)
+            self._require_statements().prepare_all()
 
     def close(self) -> None:
         if self._session is not None:
@@ -51,6 +481,20 @@ class CassandraStore:
             self._cluster.shutdown()
         self._session = None
         self._cluster = None
+        self._statements = None
+
+    def metrics(self) -> StoreMetrics:
+        statements = self._statements.stats() if self._statements is not None else {}
+        pool = self._pool_state()
+        return StoreMetrics(
+            statements_prepared=statements.get("prepared", 0),
+            statement_cache_hits=statements.get("hits", 0),
+            statement_cache_misses=statements.get("misses", 0),
+            pool_hosts=len(pool),
+            pool_in_flight=sum(_host_in_flight(state) for state in pool.values()),
+            pool_capacity=self._pool_capacity(pool),
+            peak_in_flight=self._peak_in_flight,
+        )
 
     def create_schema(self) -> None:
         session = self._require_session()
@@ -88,8 +532,10 @@ class CassandraStore:
 
         session.execute(
             """
-            CREATE TABLE IF NOT EXISTS transactions_by_merchant (
+            CREATE TABLE IF NOT EXISTS transactions_by_merchant_bucket (
                 merchant_id text,
+                bucket text,
+                shard int,
                 ts timestamp,
                 txn_id text,
                 account_id text,
@@ -98,15 +544,17 @@ class CassandraStore:
                 txn_type text,
                 is_injected boolean,
                 pattern_tag text,
-                PRIMARY KEY ((merchant_id), ts, txn_id)
+                PRIMARY KEY ((merchant_id, bucket, shard), ts, txn_id)
             ) WITH CLUSTERING ORDER BY (ts DESC, txn_id ASC)
             """
         )
 
         session.execute(
             """
-            CREATE TABLE IF NOT EXISTS alerts_by_status (
+            CREATE TABLE IF NOT EXISTS alerts_by_status_bucket (
                 status text,
+                bucket text,
+                shard int,
                 created_ts timestamp,
                 case_id text,
                 txn_id text,
@@ -114,110 +562,232 @@ class CassandraStore:
                 reason_codes list<text>,
                 resolution text,
                 resolution_ts timestamp,
-                PRIMARY KEY ((status), created_ts, case_id)
+                PRIMARY KEY ((status, bucket, shard), created_ts, case_id)
             ) WITH CLUSTERING ORDER BY (created_ts DESC, case_id ASC)
             """
         )
+        self._require_statements().prepare_all()
 
-    def write_transactions(self, transactions: list[Transaction]) -> None:
+    def write_transactions(self, transactions: list[Transaction], batch: bool | None = None) -> WriteReport:
         session = self._require_session()
-        session.set_keyspace(self.keyspace)
-        account_stmt = session.prepare(
-            """
-            INSERT INTO transactions_by_account (
-                account_id, ts, txn_id, counterparty_account_id, merchant_id,
-                amount, currency, channel, txn_type, device_id, ip, geo,
-                narrative, is_injected, pattern_tag, injection_group_id
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-        )
-        merchant_stmt = session.prepare(
-            """
-            INSERT INTO transactions_by_merchant (
-                merchant_id, ts, txn_id, account_id, amount, channel, txn_type,
-                is_injected, pattern_tag
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-        )
-
+        statements = self._require_statements()
+        account_stmt = statements.get(INSERT_TRANSACTION_BY_ACCOUNT)
+        merchant_stmt = statements.get(INSERT_TRANSACTION_BY_MERCHANT)
+        by_account = [(txn.account_id, _account_row(txn)) for txn in transactions]
+        by_merchant = []
         for txn in transactions:
-            session.execute(
-                account_stmt,
-                (
-                    txn.account_id,
-                    txn.ts,
-                    txn.txn_id,
-                    txn.counterparty_account_id,
-                    txn.merchant_id,
-                    txn.amount,
-                    txn.currency,
-                    txn.channel,
-                    txn.txn_type,
-                    txn.device_id,
-                    txn.ip,
-                    txn.geo,
-                    txn.narrative,
-                    txn.is_injected,
-                    txn.pattern_tag.value if txn.pattern_tag else None,
-                    txn.injection_group_id,
-                ),
-            )
-            session.execute(
-                merchant_stmt,
-                (
-                    txn.merchant_id,
-                    txn.ts,
-                    txn.txn_id,
-                    txn.account_id,
-                    txn.amount,
-                    txn.channel,
-                    txn.txn_type,
-                    txn.is_injected,
-                    txn.pattern_tag.value if txn.pattern_tag else None,
-                ),
-            )
+            bucket, shard = self.merchant_buckets.partition(txn.ts, txn.txn_id)
+            by_merchant.append(((txn.merchant_id, bucket, shard), _merchant_row(txn, bucket, shard)))
+        grouped = self.unlogged_batches if batch is None else batch
+        requests = [
+            *_write_requests(account_stmt, by_account, grouped, self.batch_rows),
+            *_write_requests(merchant_stmt, by_merchant, grouped, self.batch_rows),
+        ]
+        return self._run_writes(session, requests)
 
-    def write_alerts(self, alerts: list[Alert]) -> None:
+    def write_alerts(self, alerts: list[Alert]) -> WriteReport:
         session = self._require_session()
-        session.set_keyspace(self.keyspace)
-        stmt = session.prepare(
-            """
-            INSERT INTO alerts_by_status (
-                status, created_ts, case_id, txn_id, score, reason_codes,
-                resolution, resolution_ts
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-        )
+        stmt = self._require_statements().get(INSERT_ALERT_BY_STATUS_AT)
+        rows = []
         for alert in alerts:
-            session.execute(
-                stmt,
-                (
-                    alert.status,
-                    alert.created_ts,
-                    alert.case_id,
-                    alert.txn_id,
-                    alert.score,
-                    alert.reason_codes,
-                    alert.resolution,
-                    alert.resolution_ts,
-                ),
-            )
+            bucket, shard = self.alert_buckets.partition(alert.created_ts, alert.case_id)
+            rows.append(((alert.status, bucket, shard), (*_alert_row(alert, bucket, shard), _micros(alert.created_ts))))
+        return self._run_writes(session, _write_requests(stmt, rows, self.unlogged_batches, self.batch_rows))
+
+    def write_status_changes(self, changes: Iterable[tuple[Alert, str]], changed_at: datetime | None = None) -> WriteReport:
+        session = self._require_session()
+        statements = self._require_statements()
+        insert = statements.get(INSERT_ALERT_BY_STATUS_AT)
+        delete = statements.get(DELETE_ALERT_BY_STATUS_AT)
+        written_at = _micros(changed_at or datetime.now(tz=UTC))
+        requests: list[WriteRequest] = []
+        for alert, previous_status in changes:
+            if written_at <= _micros(alert.created_ts):
+                raise ValueError(f"status change for {alert.case_id} must be later than its creation")
+            bucket, shard = self.alert_buckets.partition(alert.created_ts, alert.case_id)
+            batch = BatchStatement(batch_type=BatchType.LOGGED)
+            if previous_status != alert.status:
+                batch.add(delete, (written_at, previous_status, bucket, shard, alert.created_ts, alert.case_id))
+            batch.add(insert, (*_alert_row(alert, bucket, shard), written_at))
+            batch.is_idempotent = True
+            requests.append(WriteRequest(batch, None, batched=True))
+        return self._run_writes(session, requests)
+
+    def migrate_legacy_tables(self, page_size: int | None = None) -> dict[str, WriteReport]:
+        migrations = {
+            "transactions_by_merchant": (SELECT_LEGACY_TRANSACTIONS_BY_MERCHANT, INSERT_TRANSACTION_BY_MERCHANT, self.merchant_buckets),
+            "alerts_by_status": (SELECT_LEGACY_ALERTS_BY_STATUS, INSERT_ALERT_BY_STATUS_AT, self.alert_buckets),
+        }
+        tables = self._table_names()
+        return {
+            table: self._migrate(select, insert, buckets, page_size)
+            for table, (select, insert, buckets) in migrations.items()
+            if table in tables
+        }
+
+    def read_alerts_by_status(
+        self,
+        status: str,
+        since: datetime,
+        until: datetime | None = None,
+        limit: int | None = None,
+        row_format: str = "dict",
+    ) -> Iterator[Any]:
+        return self._scatter(SELECT_ALERTS_BY_STATUS, status, self.alert_buckets, since, until, limit, row_format)
+
+    def read_transactions_by_merchant(
+        self,
+        merchant_id: str,
+        since: datetime,
+        until: datetime | None = None,
+        limit: int | None = None,
+        row_format: str = "dict",
+    ) -> Iterator[Any]:
+        return self._scatter(SELECT_TRANSACTIONS_BY_MERCHANT, merchant_id, self.merchant_buckets, since, until, limit, row_format)
 
     def read_transactions_by_account(self, account_id: str, limit: int = 100) -> list[dict[str, object]]:
+        return list(self.iter_transactions_by_account(account_id, limit=limit))
+
+    def iter_transactions_by_account(
+        self,
+        account_id: str,
+        limit: int | None = None,
+        page_size: int | None = None,
+        token: str | None = None,
+        row_format: str = "dict",
+    ) -> Iterator[Any]:
+        paging_state = decode_paging_token(token, _account_token_key(account_id))
+        for rows, _ in self._pages(SELECT_TRANSACTIONS_BY_ACCOUNT, (account_id,), limit, page_size, paging_state, row_format):
+            yield from rows
+
+    def read_transactions_page(
+        self,
+        account_id: str,
+        page_size: int | None = None,
+        token: str | None = None,
+        row_format: str = "dict",
+    ) -> RowPage:
+        size = page_size or self.page_size
+        paging_state = decode_paging_token(token, _account_token_key(account_id))
+        pages = self._pages(SELECT_TRANSACTIONS_BY_ACCOUNT, (account_id,), None, size, paging_state, row_format, prefetch=False)
+        for rows, next_state in pages:
+            return RowPage(rows=rows, token=encode_paging_token(next_state, _account_token_key(account_id)))
+        return RowPage(rows=[])
+
+    def read_transactions_by_accounts(
+        self,
+        account_ids: Iterable[str],
+        limit: int | None = 100,
+        max_concurrency: int | None = None,
+        row_format: str = "dict",
+    ) -> Iterator[tuple[str, list[Any]]]:
+        window: deque[tuple[str, Any]] = deque()
+        pending = iter(account_ids)
+        concurrency = max(1, max_concurrency or self.read_concurrency)
+        while True:
+            while len(window) < concurrency:
+                account_id = next(pending, None)
+                if account_id is None:
+                    break
+                window.append((account_id, self._fetch(SELECT_TRANSACTIONS_BY_ACCOUNT, (account_id,), limit, None, None, row_format)))
+            if not window:
+                return
+            account_id, first = window.popleft()
+            rows: list[Any] = []
+            for page, _ in self._pages(SELECT_TRANSACTIONS_BY_ACCOUNT, (account_id,), limit, None, None, row_format, first=first):
+                rows.extend(page)
+            yield account_id, rows
+
+    def _scatter(
+        self,
+        query: str,
+        key: str,
+        buckets: TimeBuckets,
+        since: datetime,
+        until: datetime | None,
+        limit: int | None,
+        row_format: str,
+    ) -> Iterator[Any]:
+        until = until or datetime.now(tz=UTC)
+        raw = "tuple" if row_format == "tuple" else "named"
+        remaining = limit
+
+        def first_pages(bucket: str) -> list[tuple[tuple[Any, ...], Any]]:
+            partitions = [(key, bucket, shard, since, until) for shard in range(buckets.shards)]
+            return [(params, self._fetch(query, params, limit, None, None, raw)) for params in partitions]
+
+        ordered = buckets.buckets(since, until)
+        upcoming = first_pages(ordered[0]) if ordered else []
+        for index in range(len(ordered)):
+            current = upcoming
+            upcoming = first_pages(ordered[index + 1]) if index + 1 < len(ordered) else []
+            streams = [self._rows(query, params, limit, raw, first) for params, first in current]
+            for row in heapq.merge(*streams, key=_clustering_desc):
+                if remaining == 0:
+                    return
+                yield row._asdict() if row_format == "dict" else row
+                if remaining is not None:
+                    remaining -= 1
+
+    def _migrate(self, select: str, insert: str, buckets: TimeBuckets, page_size: int | None) -> WriteReport:
         session = self._require_session()
-        session.set_keyspace(self.keyspace)
-        rows = session.execute(
-            """
-            SELECT account_id, ts, txn_id, counterparty_account_id, merchant_id,
-                   amount, currency, channel, txn_type, device_id, ip, geo,
-                   narrative, is_injected, pattern_tag, injection_group_id
-            FROM transactions_by_account
-            WHERE account_id = %s
-            LIMIT %s
-            """,
-            (account_id, limit),
-        )
-        return [dict(row._asdict()) for row in rows]
+        statement = self._require_statements().get(insert)
+        report = WriteReport()
+        for rows, _ in self._pages(select, (), None, page_size, None, "tuple"):
+            keyed = []
+            for row in rows:
+                bucket, shard = buckets.partition(row[1], row[2])
+                values = (row[0], bucket, shard, *row[1:])
+                keyed.append(((row[0], bucket, shard), (*values, _micros(row[1])) if insert == INSERT_ALERT_BY_STATUS_AT else values))
+            report.merge(self._run_writes(session, _write_requests(statement, keyed, self.unlogged_batches, self.batch_rows)))
+        return report
+
+    def _rows(self, query: str, params: tuple[Any, ...], limit: int | None, row_format: str, first: Any) -> Iterator[Any]:
+        for rows, _ in self._pages(query, params, limit, None, None, row_format, first=first):
+            yield from rows
+
+    def _pages(
+        self,
+        query: str,
+        params: tuple[Any, ...],
+        limit: int | None,
+        page_size: int | None,
+        paging_state: bytes | None,
+        row_format: str,
+        prefetch: bool = True,
+        first: Any = None,
+    ) -> Iterator[tuple[list[Any], bytes | None]]:
+        remaining = limit
+        future = first or self._fetch(query, params, limit, page_size, paging_state, row_format)
+        while future is not None:
+            result = future.result()
+            rows = result.current_rows
+            if remaining is not None:
+                rows = rows[:remaining]
+                remaining -= len(rows)
+            next_state = result.paging_state if remaining != 0 else None
+            future = None
+            if prefetch and next_state:
+                future = self._fetch(query, params, remaining, page_size, next_state, row_format)
+            yield (_as_dicts(rows) if row_format == "dict" else list(rows)), next_state
+
+    def _fetch(
+        self,
+        query: str,
+        params: tuple[Any, ...],
+        limit: int | None,
+        page_size: int | None,
+        paging_state: bytes | None,
+        row_format: str,
+    ) -> Any:
+        if row_format not in ROW_FORMATS:
+            raise ValueError(f"unknown row format: {row_format}")
+        session = self._require_session()
+        bound = self._require_statements().get(query, idempotent=True).bind(params)
+        size = page_size or self.page_size
+        bound.fetch_size = min(size, limit) if limit else size
+        profile = READ_TUPLE_PROFILE if row_format == "tuple" else READ_PROFILE
+        return session.execute_async(bound, paging_state=paging_state, execution_profile=profile)
 
     @classmethod
     def from_env(
@@ -227,9 +797,97 @@ class CassandraStore:
         password: str,
         keyspace: str = "retail_risk",
         port: int = 9042,
+        **options: Any,
     ) -> CassandraStore:
         cp_list = [item.strip() for item in contact_points.split(",") if item.strip()]
-        return cls(contact_points=cp_list, username=username, password=password, keyspace=keyspace, port=port)
+        return cls(contact_points=cp_list, username=username, password=password, keyspace=keyspace, port=port, **options)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> CassandraStore:
+        return cls.from_env(
+            settings.cassandra_contact_points,
+            settings.cassandra_username,
+            settings.cassandra_password,
+            keyspace=settings.cassandra_keyspace,
+            port=settings.cassandra_port,
+            max_in_flight=settings.cassandra_max_in_flight,
+            write_retries=settings.cassandra_write_retries,
+            retry_backoff_seconds=settings.cassandra_retry_backoff_seconds,
+            unlogged_batches=settings.cassandra_unlogged_batches,
+            batch_rows=settings.cassandra_batch_rows,
+            local_dc=settings.cassandra_local_dc,
+            request_timeout_seconds=settings.cassandra_request_timeout_seconds,
+            speculative_delay_seconds=settings.cassandra_speculative_delay_seconds,
+            speculative_attempts=settings.cassandra_speculative_attempts,
+            page_size=settings.cassandra_page_size,
+            read_concurrency=settings.cassandra_read_concurrency,
+            alert_buckets=TimeBuckets(settings.cassandra_alert_bucket, settings.cassandra_alert_shards),
+            merchant_buckets=TimeBuckets(settings.cassandra_merchant_bucket, settings.cassandra_merchant_shards),
+        )
+
+    def _run_writes(self, session: Session, requests: Iterable[WriteRequest]) -> WriteReport:
+        writer = ConcurrentWriter(
+            session,
+            max_in_flight=max(1, min(self.max_in_flight, self._pool_capacity(self._pool_state()))),
+            max_retries=self.write_retries,
+            backoff_seconds=self.retry_backoff_seconds,
+        )
+        try:
+            report = writer.run(requests)
+        except BulkWriteError as exc:
+            self._peak_in_flight = max(self._peak_in_flight, exc.report.peak_in_flight)
+            raise
+        self._peak_in_flight = max(self._peak_in_flight, report.peak_in_flight)
+        return report
+
+    def _execution_profiles(self) -> dict[object, Any]:
+        from cassandra.cluster import EXEC_PROFILE_DEFAULT, ExecutionProfile
+        from cassandra.policies import ConstantSpeculativeExecutionPolicy, DCAwareRoundRobinPolicy, TokenAwarePolicy
+        from cassandra.query import named_tuple_factory, tuple_factory
+
+        def balancing() -> TokenAwarePolicy:
+            return TokenAwarePolicy(DCAwareRoundRobinPolicy(local_dc=self.local_dc or None))
+
+        def reads(row_factory: Callable[..., Any]) -> ExecutionProfile:
+            return ExecutionProfile(
+                load_balancing_policy=balancing(),
+                request_timeout=self.request_timeout_seconds,
+                row_factory=row_factory,
+                speculative_execution_policy=ConstantSpeculativeExecutionPolicy(
+                    delay=self.speculative_delay_seconds,
+                    max_attempts=self.speculative_attempts,
+                ),
+            )
+
+        return {
+            EXEC_PROFILE_DEFAULT: ExecutionProfile(load_balancing_policy=balancing(), request_timeout=self.request_timeout_seconds),
+            READ_PROFILE: reads(named_tuple_factory),
+            READ_TUPLE_PROFILE: reads(tuple_factory),
+        }
+
+    def _table_names(self) -> set[str]:
+        if self._cluster is None:
+            raise RuntimeError("CassandraStore is not connected. Call connect() first.")
+        keyspace = self._cluster.metadata.keyspaces.get(self.keyspace)
+        return set(keyspace.tables) if keyspace is not None else set()
+
+    def _pool_state(self) -> dict[Any, dict[str, Any]]:
+        get_state = getattr(self._session, "get_pool_state", None)
+        return get_state() if get_state is not None else {}
+
+    def _pool_capacity(self, pool: dict[Any, dict[str, Any]]) -> int:
+        protocol_version = getattr(self._cluster, "protocol_version", None)
+        streams = STREAMS_PER_CONNECTION.get(protocol_version, DEFAULT_STREAMS_PER_CONNECTION)
+        return max(1, sum(int(state.get("open_count", 1)) for state in pool.values())) * streams
+
+    def _bind(self, session: Session) -> None:
+        self._session = session
+        self._statements = StatementCache(session)
+
+    def _require_statements(self) -> StatementCache:
+        if self._statements is None:
+            raise RuntimeError("CassandraStore is not connected. Call connect() first.")
+        return self._statements
 
     def _require_session(self) -> Session:
         if self._session is None:
@@ -237,6 +895,109 @@ class CassandraStore:
         return self._session
 
 
+def _utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=UTC) if ts.tzinfo is None else ts.astimezone(UTC)
+
+
+def _micros(ts: datetime) -> int:
+    return int(_utc(ts).timestamp() * 1_000_000)
+
+
+def _clustering_desc(row: Sequence[Any]) -> tuple[float, str]:
+    return -_utc(row[1]).timestamp(), row[2]
+
+
+def _account_token_key(account_id: str) -> str:
+    return f"transactions_by_account:{account_id}"
+
+
+def _as_dicts(rows: Iterable[Any]) -> list[dict[str, Any]]:
+    return [row._asdict() for row in rows]
+
+
+def _host_in_flight(state: dict[str, Any]) -> int:
+    if "in_flights" in state:
+        return sum(state["in_flights"])
+    return int(state.get("in_flight", 0))
+
+
+def _write_requests(
+    statement: Any,
+    rows: Sequence[tuple[Hashable, tuple[Any, ...]]],
+    batch: bool,
+    batch_rows: int,
+) -> list[WriteRequest]:
+    if not batch or batch_rows <= 1:
+        return [WriteRequest(statement, params) for _, params in rows]
+    partitions: dict[Hashable, list[tuple[Any, ...]]] = {}
+    for key, params in rows:
+        partitions.setdefault(key, []).append(params)
+    requests: list[WriteRequest] = []
+    for grouped in partitions.values():
+        for start in range(0, len(grouped), batch_rows):
+            chunk = grouped[start : start + batch_rows]
+            if len(chunk) == 1:
+                requests.append(WriteRequest(statement, chunk[0]))
+                continue
+            statements = BatchStatement(batch_type=BatchType.UNLOGGED)
+            for params in chunk:
+                statements.add(statement, params)
+            requests.append(WriteRequest(statements, None, rows=len(chunk), batched=True))
+    return requests
+
+
+def _account_row(txn: Transaction) -> tuple[Any, ...]:
+    return (
+        txn.account_id,
+        txn.ts,
+        txn.txn_id,
+        txn.counterparty_account_id,
+        txn.merchant_id,
+        txn.amount,
+        txn.currency,
+        txn.channel,
+        txn.txn_type,
+        txn.device_id,
+        txn.ip,
+        txn.geo,
+        txn.narrative,
+        txn.is_injected,
+        txn.pattern_tag.value if txn.pattern_tag else None,
+        txn.injection_group_id,
+    )
+
+
+def _merchant_row(txn: Transaction, bucket: str, shard: int) -> tuple[Any, ...]:
+    return (
+        txn.merchant_id,
+        bucket,
+        shard,
+        txn.ts,
+        txn.txn_id,
+        txn.account_id,
+        txn.amount,
+        txn.channel,
+        txn.txn_type,
+        txn.is_injected,
+        txn.pattern_tag.value if txn.pattern_tag else None,
+    )
+
+
+def _alert_row(alert: Alert, bucket: str, shard: int) -> tuple[Any, ...]:
+    return (
+        alert.status,
+        bucket,
+        shard,
+        alert.created_ts,
+        alert.case_id,
+        alert.txn_id,
+        alert.score,
+        alert.reason_codes,
+        alert.resolution,
+        alert.resolution_ts,
+    )
+
+
 def make_alert_from_score(txn_id: str, score: float, reason_codes: list[str]) -> Alert:
     return Alert(
         case_id=f"CASE-{uuid4().hex[:10]}",
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-from collections import Counter
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
 
 import pandas as pd
 import streamlit as st
 from streamlit_agraph import Config, Edge, Node, agraph
-from streamlit_autorefresh import st_autorefresh
 
-from retail_risk_aug.app_state import AppState, build_default_app_state
-from retail_risk_aug.models import Transaction
+from retail_risk_aug.config import get_settings
+from retail_risk_aug.indexes import DASHBOARD_VIEWS, AggregateSnapshot
+from retail_risk_aug.ui.data import ApiUnavailableError, ConsoleData, build_console_data
 
 
 SQL_OPEN_ALERTS = """
@@ -18,14 +20,34 @@ WHERE status = 'open'
 GROUP BY status, pattern_tag
 ORDER BY alert_count DESC;
 """.strip()
+LIVE_TICK_SECONDS = 1
+LIVE_TICK_SIZE = 5
+LIVE_CHART_POINTS = 600
+LIVE_LIST_ITEMS = 40
+LIVE_GRAPH_ITEMS = 180
+LIVE_MINDMAP_NODES = 60
+LIVE_MINDMAP_EDGES = 120
+LIVE_MINDMAP_PHYSICS_NODES = 40
+ALERT_NODE_COLOR = "#E53E3E"
+SUBGRAPH_MAX_NODES = 150
+SUBGRAPH_MAX_EDGES = 400
+ALERT_LIST_LIMIT = 500
+
+
+@dataclass(slots=True)
+class _LiveDashboard:
+    cursor: int
+    replay_end: int
+    skipped: int = 0
+    points: deque[dict[str, Any]] = field(default_factory=lambda: deque(maxlen=LIVE_CHART_POINTS))
 
 
 def main() -> None:
     st.set_page_config(page_title="Retail Risk Console", layout="wide")
     st.title("Retail Risk Console")
-    state = _get_cached_state()
+    data = _get_console_data()
 
-    _init_ui_state(state)
+    _init_ui_state()
 
     if st.session_state.get("next_screen") is not None:
         st.session_state["screen_selector"] = st.session_state["next_screen"]
@@ -38,62 +60,63 @@ def main() -> None:
     )
     screen = st.session_state["screen_selector"]
 
-    if screen == "Admin dashboard":
-        _render_admin_dashboard(state)
-    elif screen == "Alerts list":
-        _render_alerts_list(state)
-    elif screen == "Alert detail":
-        _render_alert_detail(state)
-    elif screen == "Transaction detail":
-        _render_transaction_detail(state)
-    else:
-        _render_analyst_workbook()
+    try:
+        if screen == "Admin dashboard":
+            _render_admin_dashboard(data)
+        elif screen == "Alerts list":
+            _render_alerts_list(data)
+        elif screen == "Alert detail":
+            _render_alert_detail(data)
+        elif screen == "Transaction detail":
+            _render_transaction_detail(data)
+        else:
+            _render_analyst_workbook()
+    except ApiUnavailableError as exc:
+        st.warning(str(exc))
+
+
+def _render_admin_dashboard(data: ConsoleData) -> None:
+    st.subheader("Admin dashboard")
+    _render_live_panels(data)
 
 
-def _render_admin_dashboard(app_state: AppState) -> None:
-    st_autorefresh(interval=1000, key="dashboard-refresh")
-    _advance_live_cursor(app_state, tick_size=5)
+@st.fragment(run_every=LIVE_TICK_SECONDS)
+def _render_live_panels(data: ConsoleData) -> None:
+    try:
+        _render_live_body(data)
+    except ApiUnavailableError as exc:
+        st.warning(str(exc))
 
-    live_transactions = app_state.dataset.transactions[: st.session_state["live_cursor"]]
 
-    st.subheader("Admin dashboard")
+def _render_live_body(data: ConsoleData) -> None:
+    live = _live_dashboard(data)
+    _tick_live_dashboard(data, live)
+    snapshot = data.dashboard_snapshot(upto=live.cursor)
+
     col_a, col_b, col_c, col_d = st.columns(4)
-    col_a.metric("Transactions (live)", len(live_transactions))
-    col_b.metric("Open alerts", len(app_state.list_alerts(status="open")))
+    col_a.metric("Transactions (live)", snapshot.transactions)
+    col_b.metric("Open alerts", snapshot.by_status.get("open", 0))
     col_c.metric("Model version", "v1")
-    col_d.metric("Trickle rate", "5 tx/sec")
+    col_d.metric("Trickle rate", f"{LIVE_TICK_SIZE} tx/sec")
+    if live.skipped:
+        st.caption(f"Skipped {live.skipped} chart points while this session was behind.")
 
-    if not live_transactions:
+    if not snapshot.transactions:
         st.info("Waiting for transactions...")
         return
 
-    chart_df = pd.DataFrame(
-        [
-            {
-                "ts": txn.ts,
-                "amount": txn.amount,
-                "is_injected": int(txn.is_injected),
-            }
-            for txn in live_transactions
-        ]
-    )
-
     st.markdown("### Live transaction flow")
-    st.line_chart(chart_df.set_index("ts")["amount"])
+    st.line_chart(pd.DataFrame(live.points).set_index("ts")["amount"])
 
     st.markdown("### Injection pattern mix")
-    pattern_counts = Counter((txn.pattern_tag.value if txn.pattern_tag else "BASELINE") for txn in live_transactions)
+    pattern_counts = snapshot.by_pattern
     st.bar_chart(pd.DataFrame({"pattern": list(pattern_counts.keys()), "count": list(pattern_counts.values())}).set_index("pattern"))
 
-    alert_txn_ids = {alert.txn_id for alert in app_state.list_alerts(status="open")}
-    baseline_count = sum(1 for txn in live_transactions if txn.txn_id not in alert_txn_ids)
-    alerts_count = sum(1 for txn in live_transactions if txn.txn_id in alert_txn_ids)
-
     st.markdown("### Filter listed items")
     flt_a, flt_b, flt_c = st.columns(3)
-    if flt_a.button(f"Baseline ({baseline_count})", key="filter-baseline"):
+    if flt_a.button(f"Baseline ({snapshot.baseline})", key="filter-baseline"):
         st.session_state["dashboard_filter"] = "BASELINE"
-    if flt_b.button(f"Alerts ({alerts_count})", key="filter-alerts"):
+    if flt_b.button(f"Alerts ({snapshot.alerts})", key="filter-alerts"):
         st.session_state["dashboard_filter"] = "ALERTS"
     if flt_c.button("All", key="filter-all"):
         st.session_state["dashboard_filter"] = "ALL"
@@ -103,43 +126,40 @@ def _render_admin_dashboard(app_state: AppState) -> None:
         if pattern_cols[idx % len(pattern_cols)].button(f"{pattern_name} ({count})", key=f"filter-pattern-{pattern_name}"):
             st.session_state["dashboard_filter"] = pattern_name
 
-    filtered_transactions = _filter_transactions(
-        transactions=live_transactions,
-        dashboard_filter=st.session_state["dashboard_filter"],
-        alert_txn_ids=alert_txn_ids,
-    )
-
-    st.caption(f"Filter: {st.session_state['dashboard_filter']} | Showing {len(filtered_transactions)} items")
-    if filtered_transactions:
-        for txn in filtered_transactions[-40:]:
-            pattern = txn.pattern_tag.value if txn.pattern_tag else "BASELINE"
-            is_alert = txn.txn_id in alert_txn_ids
-            case_id = app_state.get_case_id_by_txn(txn.txn_id)
-            customer = app_state.get_customer_by_account(txn.account_id)
-            st.markdown(
-                f"**{txn.txn_id}** | {txn.ts} | acct={txn.account_id} | merchant={txn.merchant_id} | amount=${txn.amount:,.2f} | pattern={pattern}"
-            )
-            st.caption(
-                f"user={customer.name if customer else 'Unknown'} | risk={customer.risk_band if customer else 'N/A'} | "
-                f"alert={'yes' if is_alert else 'no'}"
-            )
-            col_1, col_2 = st.columns(2)
-            if col_1.button("Open transaction detail", key=f"dash-open-txn-{txn.txn_id}"):
-                _open_transaction_detail(txn.txn_id)
-            if case_id and col_2.button("Open case", key=f"dash-open-case-{case_id}"):
-                _open_alert_view(case_id, "Investigate")
-            st.divider()
+    dashboard_filter = st.session_state["dashboard_filter"]
+    view = dashboard_filter if dashboard_filter in DASHBOARD_VIEWS else f"pattern:{dashboard_filter}"
+    listed = data.dashboard_transactions(view, upto=live.cursor, limit=LIVE_LIST_ITEMS)
+    context = data.lookup(txn.txn_id for txn in listed)
+    st.caption(f"Filter: {dashboard_filter} | Showing {_view_count(snapshot, dashboard_filter)} items")
+    for txn in listed:
+        pattern = txn.pattern_tag.value if txn.pattern_tag else "BASELINE"
+        case_id = context.case_id(txn.txn_id)
+        customer = context.customer(txn.account_id)
+        st.markdown(
+            f"**{txn.txn_id}** | {txn.ts} | acct={txn.account_id} | merchant={txn.merchant_id} | amount=${txn.amount:,.2f} | pattern={pattern}"
+        )
+        st.caption(
+            f"user={customer.name if customer else 'Unknown'} | risk={customer.risk_band if customer else 'N/A'} | "
+            f"alert={'yes' if case_id else 'no'}"
+        )
+        col_1, col_2 = st.columns(2)
+        if col_1.button("Open transaction detail", key=f"dash-open-txn-{txn.txn_id}"):
+            _open_transaction_detail(txn.txn_id)
+        if case_id and col_2.button("Open case", key=f"dash-open-case-{case_id}"):
+            _open_alert_view(case_id, "Investigate")
+        st.divider()
 
     st.markdown("### Interactive entity graph (live)")
-    _render_live_mindmap(live_transactions[-180:])
+    _render_live_mindmap(data, live.cursor)
 
 
-def _render_alerts_list(app_state: AppState) -> None:
+def _render_alerts_list(data: ConsoleData) -> None:
     st.subheader("Alerts list")
-    alerts = app_state.list_alerts(status="open")
-    for alert in alerts[:50]:
-        txn = app_state.get_transaction(alert.txn_id)
-        customer = app_state.get_customer_by_account(txn.account_id) if txn else None
+    alerts = data.open_alerts(limit=50)
+    context = data.lookup(alert.txn_id for alert in alerts)
+    for alert in alerts:
+        txn = context.transaction(alert.txn_id)
+        customer = context.customer(txn.account_id) if txn else None
         st.markdown(f"**{alert.case_id}** | txn={alert.txn_id} | score={alert.score:.2f}")
         st.caption(
             f"user={customer.name if customer else 'Unknown'} | account={txn.account_id if txn else 'N/A'} | reasons={', '.join(alert.reason_codes)}"
@@ -158,9 +178,9 @@ def _render_alerts_list(app_state: AppState) -> None:
         st.divider()
 
 
-def _render_alert_detail(app_state: AppState) -> None:
+def _render_alert_detail(data: ConsoleData) -> None:
     st.subheader("Alert detail")
-    alerts = app_state.list_alerts(status="open")
+    alerts = data.open_alerts(limit=ALERT_LIST_LIMIT)
     alert_ids = [alert.case_id for alert in alerts]
     if not alert_ids:
         st.info("No open alerts.")
@@ -170,7 +190,7 @@ def _render_alert_detail(app_state: AppState) -> None:
         st.session_state["selected_case_id"] = alert_ids[0]
 
     selected_case = st.selectbox("Case", alert_ids, key="selected_case_id")
-    alert = app_state.get_alert(selected_case)
+    alert = data.alert(selected_case)
     if alert is None:
         st.warning("Alert not found.")
         return
@@ -178,8 +198,9 @@ def _render_alert_detail(app_state: AppState) -> None:
     view = st.radio("View", ["Investigate", "Similar", "Graph", "SQL"], key="alert_view", horizontal=True)
 
     if view == "Investigate":
-        txn = app_state.get_transaction(alert.txn_id)
-        customer = app_state.get_customer_by_account(txn.account_id) if txn else None
+        context = data.lookup([alert.txn_id])
+        txn = context.transaction(alert.txn_id)
+        customer = context.customer(txn.account_id) if txn else None
         st.markdown("### Case summary")
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("Case", alert.case_id)
@@ -223,15 +244,16 @@ def _render_alert_detail(app_state: AppState) -> None:
                 }
             )
     elif view == "Similar":
-        similar = app_state.get_similar_transactions(alert.txn_id, k=10)
+        similar = data.similar(alert.txn_id, k=10)
         if not similar:
             st.info("No strong similar transactions found.")
+        context = data.lookup(item.txn_id for item in similar)
         for item in similar:
-            txn = app_state.get_transaction(item.txn_id)
+            txn = context.transaction(item.txn_id)
             if txn is None:
                 continue
-            customer = app_state.get_customer_by_account(txn.account_id)
-            case_id = app_state.get_case_id_by_txn(txn.txn_id)
+            customer = context.customer(txn.account_id)
+            case_id = context.case_id(txn.txn_id)
             st.markdown(f"**{txn.txn_id}** | similarity={item.score:.3f} | user={customer.name if customer else 'Unknown'}")
             st.caption(
                 f"acct={txn.account_id} | merchant={txn.merchant_id} | amount=${txn.amount:,.2f} | "
@@ -244,7 +266,7 @@ def _render_alert_detail(app_state: AppState) -> None:
                 _open_alert_view(case_id, "Investigate")
             st.divider()
     elif view == "Graph":
-        txn = app_state.get_transaction(alert.txn_id)
+        txn = data.lookup([alert.txn_id]).transaction(alert.txn_id)
         if txn:
             st.write(
                 {
@@ -257,12 +279,11 @@ def _render_alert_detail(app_state: AppState) -> None:
                     "pattern_tag": txn.pattern_tag.value if txn.pattern_tag else "BASELINE",
                 }
             )
-            selected_txn_from_graph = _render_account_subgraph(app_state, account_id=txn.account_id, hops=2)
+            selected_txn_from_graph = _render_account_subgraph(data, account_id=txn.account_id, hops=2)
             if selected_txn_from_graph:
-                selected_txn = app_state.get_transaction(selected_txn_from_graph)
-                selected_customer = (
-                    app_state.get_customer_by_account(selected_txn.account_id) if selected_txn else None
-                )
+                selected_context = data.lookup([selected_txn_from_graph])
+                selected_txn = selected_context.transaction(selected_txn_from_graph)
+                selected_customer = selected_context.customer(selected_txn.account_id) if selected_txn else None
                 st.markdown("### Selected graph transaction")
                 st.write(
                     {
@@ -278,7 +299,7 @@ def _render_alert_detail(app_state: AppState) -> None:
                 if st.button("Open selected transaction detail", key=f"open-selected-graph-txn-{selected_txn_from_graph}"):
                     _open_transaction_detail(selected_txn_from_graph)
 
-            related = app_state.get_transactions_by_account(txn.account_id, limit=20)
+            related = data.account_transactions(txn.account_id, limit=20)
             st.markdown("### Linked transactions")
             for item in related:
                 st.caption(
@@ -290,20 +311,21 @@ def _render_alert_detail(app_state: AppState) -> None:
         st.code(SQL_OPEN_ALERTS, language="sql")
 
 
-def _render_transaction_detail(app_state: AppState) -> None:
+def _render_transaction_detail(data: ConsoleData) -> None:
     st.subheader("Transaction detail")
     txn_id = st.session_state.get("selected_txn_id")
     if not txn_id:
         st.info("Select a transaction from dashboard, similar view, or graph.")
         return
 
-    txn = app_state.get_transaction(txn_id)
+    context = data.lookup([txn_id])
+    txn = context.transaction(txn_id)
     if txn is None:
         st.warning("Transaction not found.")
         return
 
-    customer = app_state.get_customer_by_account(txn.account_id)
-    case_id = app_state.get_case_id_by_txn(txn.txn_id)
+    customer = context.customer(txn.account_id)
+    case_id = context.case_id(txn.txn_id)
 
     top_a, top_b, top_c = st.columns(3)
     top_a.metric("Transaction", txn.txn_id)
@@ -349,7 +371,7 @@ def _render_analyst_workbook() -> None:
     st.download_button("Export SQL", data=SQL_OPEN_ALERTS, file_name="vw_open_alerts_by_typology.sql")
 
 
-def _init_ui_state(app_state: AppState) -> None:
+def _init_ui_state() -> None:
     if "screen_selector" not in st.session_state:
         st.session_state["screen_selector"] = "Admin dashboard"
     if "next_screen" not in st.session_state:
@@ -358,8 +380,6 @@ def _init_ui_state(app_state: AppState) -> None:
         st.session_state["selected_case_id"] = None
     if "alert_view" not in st.session_state:
         st.session_state["alert_view"] = "Investigate"
-    if "live_cursor" not in st.session_state:
-        st.session_state["live_cursor"] = min(20, len(app_state.dataset.transactions))
     if "dashboard_filter" not in st.session_state:
         st.session_state["dashboard_filter"] = "ALL"
     if "selected_txn_id" not in st.session_state:
@@ -380,60 +400,96 @@ def _open_transaction_detail(txn_id: str) -> None:
 
 
 @st.cache_resource
-def _get_cached_state() -> AppState:
-    return build_default_app_state(seed=42)
+def _get_console_data() -> ConsoleData:
+    return build_console_data(get_settings())
 
 
-def _advance_live_cursor(app_state: AppState, tick_size: int) -> None:
-    total = len(app_state.dataset.transactions)
-    current = st.session_state.get("live_cursor", 0)
-    if current < total:
-        st.session_state["live_cursor"] = min(total, current + tick_size)
+def _live_dashboard(data: ConsoleData) -> _LiveDashboard:
+    live = st.session_state.get("live_dashboard")
+    if live is None:
+        replay_end = data.dashboard_snapshot().transactions
+        live = _LiveDashboard(cursor=min(20, replay_end), replay_end=replay_end)
+        initial = data.dashboard_transactions("ALL", upto=live.cursor, limit=max(1, live.cursor))
+        live.points.extend(_chart_point(txn.ts, txn.amount) for txn in initial)
+        st.session_state["live_dashboard"] = live
+    return live
 
 
-def _render_live_mindmap(transactions: list[Transaction]) -> None:
-    nodes_by_id: dict[str, Node] = {}
-    edges: list[Edge] = []
+def _tick_live_dashboard(data: ConsoleData, live: _LiveDashboard) -> None:
+    if live.cursor < live.replay_end:
+        target = min(live.replay_end, live.cursor + LIVE_TICK_SIZE)
+    else:
+        target = data.live_transactions()
+    if target < live.cursor:
+        live.cursor = live.replay_end = target
+        live.points.clear()
+    if target <= live.cursor:
+        return
+    delta = target - live.cursor
+    if delta > LIVE_CHART_POINTS:
+        live.skipped += delta - LIVE_CHART_POINTS
+    fresh = data.dashboard_transactions("ALL", upto=target, limit=min(delta, LIVE_CHART_POINTS))
+    live.points.extend(_chart_point(txn.ts, txn.amount) for txn in fresh)
+    live.cursor = target
+
+
+def _view_count(snapshot: AggregateSnapshot, dashboard_filter: str) -> int:
+    if dashboard_filter == "ALL":
+        return snapshot.transactions
+    if dashboard_filter == "BASELINE":
+        return snapshot.baseline
+    if dashboard_filter == "ALERTS":
+        return snapshot.alerts
+    return snapshot.by_pattern.get(dashboard_filter, 0)
+
+
+def _chart_point(ts: object, amount: float) -> dict[str, Any]:
+    return {"ts": pd.Timestamp(ts), "amount": amount}
 
-    for txn in transactions:
-        account_node = _add_node(nodes_by_id, f"account:{txn.account_id}", txn.account_id, "#5A67D8", f"Account {txn.account_id}")
-        merchant_node = _add_node(nodes_by_id, f"merchant:{txn.merchant_id}", txn.merchant_id, "#2B6CB0", f"Merchant {txn.merchant_id}")
-        device_node = _add_node(nodes_by_id, f"device:{txn.device_id}", txn.device_id, "#2F855A", f"Device {txn.device_id}")
-        ip_node = _add_node(nodes_by_id, f"ip:{txn.ip}", txn.ip, "#B7791F", f"IP {txn.ip}")
-
-        edges.append(Edge(source=account_node.id, target=merchant_node.id, label="PAID_AT"))
-        edges.append(Edge(source=account_node.id, target=device_node.id, label="USES_DEVICE"))
-        edges.append(Edge(source=device_node.id, target=ip_node.id, label="SEEN_ON_IP"))
-
-        if txn.counterparty_account_id:
-            cp_node = _add_node(
-                nodes_by_id,
-                f"account:{txn.counterparty_account_id}",
-                txn.counterparty_account_id,
-                "#5A67D8",
-                f"Account {txn.counterparty_account_id}",
-            )
-            edges.append(Edge(source=account_node.id, target=cp_node.id, label="SENT_TO"))
+
+def _render_live_mindmap(data: ConsoleData, upto: int) -> None:
+    summary = data.graph_summary(upto=upto, window=LIVE_GRAPH_ITEMS, max_nodes=LIVE_MINDMAP_NODES, max_edges=LIVE_MINDMAP_EDGES)
+    nodes = [
+        Node(
+            id=node.id,
+            label=node.label,
+            color=ALERT_NODE_COLOR if node.alerts else _node_color(node.node_type),
+            title=f"{node.node_type}: {node.label}\ntxns={node.weight} alerts={node.alerts} injected={node.injected}",
+            size=min(40, 12 + 2 * node.weight),
+        )
+        for node in summary.nodes
+    ]
+    edges = [
+        Edge(
+            source=edge.source,
+            target=edge.target,
+            label=edge.label if edge.weight == 1 else f"{edge.label} x{edge.weight}",
+            title=f"txns={edge.weight} amount=${edge.amount:,.2f} alerts={edge.alerts}",
+            width=min(8, edge.weight),
+        )
+        for edge in summary.edges
+    ]
+    if summary.hidden_nodes or summary.hidden_edges:
+        st.caption(f"Summarized {summary.transactions} transactions; {summary.hidden_nodes} entities and {summary.hidden_edges} links hidden.")
 
     config = Config(
         width="100%",
         height=520,
         directed=True,
-        physics=True,
+        physics=len(nodes) <= LIVE_MINDMAP_PHYSICS_NODES,
         hierarchical=False,
         nodeHighlightBehavior=True,
         collapsible=True,
     )
-    agraph(nodes=list(nodes_by_id.values()), edges=edges, config=config)
+    agraph(nodes=nodes, edges=edges, config=config)
 
 
-def _render_account_subgraph(app_state: AppState, account_id: str, hops: int) -> str | None:
-    neighborhood = app_state.graph.neighborhood(account_id=account_id, hops=hops)
-    selected_nodes = set(neighborhood)
+def _render_account_subgraph(data: ConsoleData, account_id: str, hops: int) -> str | None:
+    subgraph = data.account_subgraph(account_id, hops=hops, max_nodes=SUBGRAPH_MAX_NODES, max_edges=SUBGRAPH_MAX_EDGES)
     nodes_by_id: dict[str, Node] = {}
     edges: list[Edge] = []
 
-    related_transactions = app_state.get_transactions_by_account(account_id=account_id, limit=50)
+    related_transactions = data.account_transactions(account_id, limit=50)
     for txn in related_transactions:
         txn_node_id = f"txn:{txn.txn_id}"
         txn_title = (
@@ -450,18 +506,12 @@ def _render_account_subgraph(app_state: AppState, account_id: str, hops: int) ->
         edges.append(Edge(source=txn_node.id, target=device_node.id, label="USED_DEVICE", title=f"txn={txn.txn_id}"))
         edges.append(Edge(source=device_node.id, target=ip_node.id, label="SEEN_ON_IP", title=f"txn={txn.txn_id}"))
 
-    for source, target, data in app_state.graph.graph.edges(data=True):
-        if source not in selected_nodes or target not in selected_nodes:
-            continue
-        source_type, source_value = source.split(":", maxsplit=1)
-        target_type, target_value = target.split(":", maxsplit=1)
-
-        source_node = _add_node(nodes_by_id, source, source_value, _node_color(source_type), f"{source_type}: {source_value}")
-        target_node = _add_node(nodes_by_id, target, target_value, _node_color(target_type), f"{target_type}: {target_value}")
-
-        edge_label = str(data.get("label", "LINK"))
-        txn_id = str(data.get("txn_id", ""))
-        edges.append(Edge(source=source_node.id, target=target_node.id, label=edge_label, title=f"txn={txn_id}"))
+    for node in subgraph.nodes:
+        _add_node(nodes_by_id, node.id, node.key, _node_color(node.node_type), f"{node.node_type}: {node.key}")
+    for edge in subgraph.edges:
+        edges.append(Edge(source=edge.source, target=edge.target, label=edge.label, title=f"txn={edge.txn_id or ''}"))
+    if subgraph.truncated:
+        st.caption(f"Showing the first {len(subgraph.nodes)} entities and {len(subgraph.edges)} links of this neighborhood.")
 
     config = Config(
         width="100%",
@@ -496,15 +546,5 @@ def _node_color(node_type: str) -> str:
     return colors.get(node_type, "#718096")
 
 
-def _filter_transactions(transactions: list[Transaction], dashboard_filter: str, alert_txn_ids: set[str]) -> list[Transaction]:
-    if dashboard_filter == "ALL":
-        return transactions
-    if dashboard_filter == "BASELINE":
-        return [txn for txn in transactions if txn.txn_id not in alert_txn_ids]
-    if dashboard_filter == "ALERTS":
-        return [txn for txn in transactions if txn.txn_id in alert_txn_ids]
-    return [txn for txn in transactions if (txn.pattern_tag.value if txn.pattern_tag else "BASELINE") == dashboard_filter]
-
-
 if __name__ == "__main__":
     main()
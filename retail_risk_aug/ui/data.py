@@ -0,0 +1,461 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
+
+from pydantic import TypeAdapter
+
+from retail_risk_aug.config import Settings
+from retail_risk_aug.graph import GraphSummary, Subgraph, summarize_transactions
+from retail_risk_aug.graph.subgraph import DEFAULT_MAX_EDGES, DEFAULT_MAX_NODES
+from retail_risk_aug.graph.summary import DEFAULT_SUMMARY_EDGES, DEFAULT_SUMMARY_NODES
+from retail_risk_aug.indexes import AggregateSnapshot
+from retail_risk_aug.models import Alert, Customer, SimilarResult, Transaction
+
+if TYPE_CHECKING:
+    import httpx
+
+    from retail_risk_aug.app_state import AppState
+
+
+LOOKUP_BATCH = 1000
+LIVE_READ_TIMEOUT_SECONDS = 60.0
+LIVE_RECONNECT_SECONDS = 2.0
+UNAVAILABLE_STATUSES = frozenset({429, 503})
+
+T = TypeVar("T")
+
+_ALERTS = TypeAdapter(list[Alert])
+_TRANSACTIONS = TypeAdapter(list[Transaction])
+_SIMILAR = TypeAdapter(list[SimilarResult])
+_SUBGRAPH = TypeAdapter(Subgraph)
+_SUMMARY = TypeAdapter(GraphSummary)
+_SNAPSHOT = TypeAdapter(AggregateSnapshot)
+
+
+@dataclass(slots=True)
+class TransactionContext:
+    transactions: dict[str, Transaction] = field(default_factory=dict)
+    cases: dict[str, str] = field(default_factory=dict)
+    customers: dict[str, Customer] = field(default_factory=dict)
+
+    def add(self, txn: Transaction, case_id: str | None, customer: Customer | None) -> None:
+        self.transactions[txn.txn_id] = txn
+        if case_id is not None:
+            self.cases[txn.txn_id] = case_id
+        if customer is not None:
+            self.customers[txn.account_id] = customer
+
+    def transaction(self, txn_id: str) -> Transaction | None:
+        return self.transactions.get(txn_id)
+
+    def case_id(self, txn_id: str) -> str | None:
+        return self.cases.get(txn_id)
+
+    def customer(self, account_id: str) -> Customer | None:
+        return self.customers.get(account_id)
+
+
+class ConsoleData(Protocol):
+    def open_alerts(self, limit: int = 100) -> list[Alert]: ...
+
+    def alert(self, case_id: str) -> Alert | None: ...
+
+    def lookup(self, txn_ids: Iterable[str]) -> TransactionContext: ...
+
+    def similar(self, txn_id: str, k: int = 10) -> list[SimilarResult]: ...
+
+    def account_transactions(self, account_id: str, limit: int = 50) -> list[Transaction]: ...
+
+    def account_subgraph(
+        self,
+        account_id: str,
+        hops: int = 2,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_edges: int = DEFAULT_MAX_EDGES,
+    ) -> Subgraph: ...
+
+    def graph_summary(
+        self,
+        upto: int | None = None,
+        window: int = 180,
+        max_nodes: int = DEFAULT_SUMMARY_NODES,
+        max_edges: int = DEFAULT_SUMMARY_EDGES,
+    ) -> GraphSummary: ...
+
+    def dashboard_snapshot(self, upto: int | None = None) -> AggregateSnapshot: ...
+
+    def dashboard_transactions(self, view: str, upto: int | None = None, limit: int = 50) -> list[Transaction]: ...
+
+    def live_transactions(self) -> int: ...
+
+
+class LocalConsoleData:
+    def __init__(self, state: AppState) -> None:
+        self.state = state
+
+    def open_alerts(self, limit: int = 100) -> list[Alert]:
+        return self.state.page_alerts(status="open", limit=limit).items
+
+    def alert(self, case_id: str) -> Alert | None:
+        return self.state.get_alert(case_id)
+
+    def lookup(self, txn_ids: Iterable[str]) -> TransactionContext:
+        context = TransactionContext()
+        for txn_id in dict.fromkeys(txn_ids):
+            txn = self.state.get_transaction(txn_id)
+            if txn is not None:
+                context.add(txn, self.state.get_case_id_by_txn(txn_id), self.state.get_customer_by_account(txn.account_id))
+        return context
+
+    def similar(self, txn_id: str, k: int = 10) -> list[SimilarResult]:
+        return self.state.get_similar_transactions(txn_id, k)
+
+    def account_transactions(self, account_id: str, limit: int = 50) -> list[Transaction]:
+        return self.state.get_transactions_by_account(account_id, limit=limit)
+
+    def account_subgraph(
+        self,
+        account_id: str,
+        hops: int = 2,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_edges: int = DEFAULT_MAX_EDGES,
+    ) -> Subgraph:
+        return self.state.graph.subgraph(account_id, hops=hops, max_nodes=max_nodes, max_edges=max_edges)
+
+    def graph_summary(
+        self,
+        upto: int | None = None,
+        window: int = 180,
+        max_nodes: int = DEFAULT_SUMMARY_NODES,
+        max_edges: int = DEFAULT_SUMMARY_EDGES,
+    ) -> GraphSummary:
+        transactions = self.state.dataset.transactions
+        end = len(transactions) if upto is None else min(upto, len(transactions))
+        return summarize_transactions(
+            transactions[max(0, end - window) : end],
+            self.state.txn_to_case,
+            max_nodes=max_nodes,
+            max_edges=max_edges,
+        )
+
+    def dashboard_snapshot(self, upto: int | None = None) -> AggregateSnapshot:
+        return self.state.dashboard_snapshot(upto)
+
+    def dashboard_transactions(self, view: str, upto: int | None = None, limit: int = 50) -> list[Transaction]:
+        transactions = self.state.dataset.transactions
+        return [transactions[position] for position in self.state.dashboard_positions(view, upto=upto, limit=limit)]
+
+    def live_transactions(self) -> int:
+        return len(self.state.aggregates)
+
+
+class ApiUnavailableError(RuntimeError):
+    pass
+
+
+@dataclass(slots=True)
+class _CacheEntry:
+    value: Any
+    etag: str | None
+    expires: float
+
+
+class TTLCache:
+    def __init__(self, ttl_seconds: float, max_entries: int, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.stale = 0
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, key: Hashable) -> tuple[_CacheEntry | None, bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            fresh = entry.expires > self.clock()
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return entry, fresh
+
+    def put(self, key: Hashable, value: Any, etag: str | None = None) -> None:
+        with self._lock:
+            self._entries[key] = _CacheEntry(value=value, etag=etag, expires=self.clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidated": self.revalidated,
+            "stale": self.stale,
+        }
+
+
+class LiveEventListener:
+    def __init__(self, client: httpx.Client, reconnect_seconds: float = LIVE_RECONNECT_SECONDS) -> None:
+        self.client = client
+        self.reconnect_seconds = reconnect_seconds
+        self.last_event_id: int | None = None
+        self.transactions: int | None = None
+        self.connects = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="console-live-events", daemon=True)
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def consume(self, max_events: int | None = None) -> None:
+        headers = {"Last-Event-ID": str(self.last_event_id)} if self.last_event_id is not None else {}
+        params = {"max_events": max_events} if max_events is not None else {}
+        with self.client.stream("GET", "/live/events", params=params, headers=headers, timeout=LIVE_READ_TIMEOUT_SECONDS) as response:
+            response.raise_for_status()
+            self.connects += 1
+            if self.transactions is None:
+                snapshot = self.client.get("/dashboard/snapshot")
+                snapshot.raise_for_status()
+                self.transactions = int(snapshot.json()["transactions"])
+            for event_id, kind, data in iter_sse(response.iter_lines()):
+                if self._stop.is_set():
+                    return
+                self.apply(event_id, kind, data)
+
+    def apply(self, event_id: int | None, kind: str, data: dict[str, Any]) -> None:
+        if event_id is not None:
+            self.last_event_id = event_id
+        if kind == "aggregates":
+            self.transactions = max(self.transactions or 0, int(data["transactions"]))
+        elif kind == "reset":
+            self.last_event_id = None
+            self.transactions = None
+        elif kind == "lagged":
+            self.transactions = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.consume()
+            except Exception:
+                self.transactions = None
+            self._stop.wait(self.reconnect_seconds)
+
+
+class ApiConsoleData:
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        max_connections: int = 20,
+        cache: TTLCache | None = None,
+        client: httpx.Client | None = None,
+    ) -> None:
+        self.cache = cache if cache is not None else TTLCache(ttl_seconds=2.0, max_entries=4096)
+        self.client = client if client is not None else _client(base_url, timeout, max_connections)
+        self.live = LiveEventListener(self.client)
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> ApiConsoleData:
+        return cls(
+            base_url=settings.ui_api_base_url,
+            timeout=settings.ui_api_timeout_seconds,
+            max_connections=settings.ui_api_max_connections,
+            cache=TTLCache(ttl_seconds=settings.ui_cache_ttl_seconds, max_entries=settings.ui_cache_max_entries),
+        )
+
+    def close(self) -> None:
+        self.live.stop()
+        self.client.close()
+
+    def open_alerts(self, limit: int = 100) -> list[Alert]:
+        return self._get("/alerts", _ALERTS.validate_python, status="open", limit=limit) or []
+
+    def alert(self, case_id: str) -> Alert | None:
+        return self._get(f"/alert/{case_id}", lambda body: Alert.model_validate(body["alert"]), similar=False)
+
+    def lookup(self, txn_ids: Iterable[str]) -> TransactionContext:
+        context = TransactionContext()
+        missing: list[str] = []
+        stale: dict[str, Any] = {}
+        for txn_id in dict.fromkeys(txn_ids):
+            entry, fresh = self.cache.lookup(("txn", txn_id))
+            if fresh and entry is not None:
+                context.add(*entry.value)
+            else:
+                missing.append(txn_id)
+                if entry is not None:
+                    stale[txn_id] = entry.value
+        for start in range(0, len(missing), LOOKUP_BATCH):
+            batch = missing[start : start + LOOKUP_BATCH]
+            response = self.client.post("/transactions/lookup", json={"txn_ids": batch})
+            if response.status_code in UNAVAILABLE_STATUSES:
+                if not all(txn_id in stale for txn_id in batch):
+                    raise _unavailable(response)
+                self.cache.stale += len(batch)
+                for txn_id in batch:
+                    context.add(*stale[txn_id])
+                continue
+            response.raise_for_status()
+            body = response.json()
+            customers = {account_id: Customer.model_validate(item) for account_id, item in body["customers"].items()}
+            for txn in _TRANSACTIONS.validate_python(body["transactions"]):
+                record = (txn, body["cases"].get(txn.txn_id), customers.get(txn.account_id))
+                self.cache.put(("txn", txn.txn_id), record)
+                context.add(*record)
+        return context
+
+    def similar(self, txn_id: str, k: int = 10) -> list[SimilarResult]:
+        return self._get(f"/similar/transaction/{txn_id}", _SIMILAR.validate_python, k=k) or []
+
+    def account_transactions(self, account_id: str, limit: int = 50) -> list[Transaction]:
+        return self._get(f"/account/{account_id}/transactions", _TRANSACTIONS.validate_python, limit=limit) or []
+
+    def account_subgraph(
+        self,
+        account_id: str,
+        hops: int = 2,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        max_edges: int = DEFAULT_MAX_EDGES,
+    ) -> Subgraph:
+        subgraph = self._get(
+            f"/graph/account/{account_id}/subgraph",
+            _SUBGRAPH.validate_python,
+            hops=hops,
+            max_nodes=max_nodes,
+            max_edges=max_edges,
+        )
+        return subgraph or Subgraph()
+
+    def graph_summary(
+        self,
+        upto: int | None = None,
+        window: int = 180,
+        max_nodes: int = DEFAULT_SUMMARY_NODES,
+        max_edges: int = DEFAULT_SUMMARY_EDGES,
+    ) -> GraphSummary:
+        summary = self._get(
+            "/graph/summary",
+            _SUMMARY.validate_python,
+            upto=upto,
+            window=window,
+            max_nodes=max_nodes,
+            max_edges=max_edges,
+        )
+        return summary or GraphSummary()
+
+    def dashboard_snapshot(self, upto: int | None = None) -> AggregateSnapshot:
+        snapshot = self._get("/dashboard/snapshot", _SNAPSHOT.validate_python, upto=upto)
+        if snapshot is None:
+            raise LookupError("dashboard snapshot is unavailable")
+        return snapshot
+
+    def dashboard_transactions(self, view: str, upto: int | None = None, limit: int = 50) -> list[Transaction]:
+        return self._get("/dashboard/transactions", _TRANSACTIONS.validate_python, view=view, upto=upto, limit=limit) or []
+
+    def live_transactions(self) -> int:
+        self.live.start()
+        transactions = self.live.transactions
+        if transactions is None:
+            return self.dashboard_snapshot().transactions
+        return transactions
+
+    def _get(self, path: str, parse: Callable[[Any], T], **params: Any) -> T | None:
+        query = {name: value for name, value in params.items() if value is not None}
+        key = (path, tuple(sorted(query.items())))
+        entry, fresh = self.cache.lookup(key)
+        if fresh and entry is not None:
+            return entry.value
+        headers = {"If-None-Match": entry.etag} if entry is not None and entry.etag else {}
+        response = self.client.get(path, params=query, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            self.cache.revalidated += 1
+            self.cache.put(key, entry.value, entry.etag)
+            return entry.value
+        if response.status_code == 404:
+            return None
+        if response.status_code in UNAVAILABLE_STATUSES:
+            if entry is None:
+                raise _unavailable(response)
+            self.cache.stale += 1
+            return entry.value
+        response.raise_for_status()
+        value = parse(response.json())
+        self.cache.put(key, value, response.headers.get("etag"))
+        return value
+
+
+def build_console_data(settings: Settings) -> ConsoleData:
+    if settings.ui_api_base_url:
+        return ApiConsoleData.from_settings(settings)
+    from retail_risk_aug.app_state import build_default_app_state
+
+    return LocalConsoleData(build_default_app_state(seed=settings.rng_seed))
+
+
+def iter_sse(lines: Iterable[str]) -> Iterator[tuple[int | None, str, dict[str, Any]]]:
+    event_id: int | None = None
+    kind = "message"
+    data: list[str] = []
+    for line in lines:
+        if not line:
+            if data:
+                yield event_id, kind, json.loads("\n".join(data))
+            event_id, kind, data = None, "message", []
+            continue
+        name, _, value = line.partition(":")
+        value = value.removeprefix(" ")
+        if name == "id" and value.isdigit():
+            event_id = int(value)
+        elif name == "event":
+            kind = value
+        elif name == "data":
+            data.append(value)
+    if data:
+        yield event_id, kind, json.loads("\n".join(data))
+
+
+def _unavailable(response: httpx.Response) -> ApiUnavailableError:
+    reason = "shedding load" if response.status_code == 429 else "not ready or reloading"
+    return ApiUnavailableError(f"The risk API is {reason} ({response.status_code}); try again shortly.")
+
+
+def _client(base_url: str, timeout: float, max_connections: int) -> httpx.Client:
+    try:
+        import httpx
+    except Exception as exc:  # pragma: no cover
+        raise RuntimeError("httpx is required for ApiConsoleData") from exc
+    return httpx.Client(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
@@ -1,21 +1,20 @@
 from __future__ import annotations
 
 import hashlib
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import cache
 from typing import Any
 
 import numpy as np
 
+from retail_risk_aug.deadline import Deadline
 from retail_risk_aug.models import SimilarResult, Transaction
 
-try:
-    import faiss  # type: ignore
-except Exception:  # pragma: no cover
-    faiss = None
-
 
 CHANNELS = ["POS", "ONLINE", "MOBILE", "BRANCH"]
 TXN_TYPES = ["POS_PURCHASE", "ONLINE_PURCHASE", "P2P_TRANSFER", "BILL_PAYMENT"]
+SIMILARITY_CHUNK_ROWS = 65536
 
 
 @dataclass(slots=True)
@@ -25,20 +24,50 @@ class TransactionVectorIndex:
     backend: str
     id_to_position: dict[str, int]
     faiss_index: Any | None = None
-
-    def search_similar(self, txn_id: str, k: int, min_similarity: float = 0.78) -> list[SimilarResult]:
+    _buffer: np.ndarray | None = field(default=None, repr=False)
+
+    def add(self, transactions: Iterable[Transaction]) -> int:
+        batch = list(transactions)
+        if not batch:
+            return 0
+        added = _normalize(np.vstack([_embed_transaction(txn) for txn in batch]).astype(np.float32))
+        start = len(self.txn_ids)
+        end = start + len(batch)
+        buffer = self._buffer
+        if buffer is None or buffer.shape[0] < end:
+            buffer = np.empty((max(end, 2 * start, 1024), self.vectors.shape[1]), dtype=np.float32)
+            buffer[:start] = self.vectors
+            self._buffer = buffer
+        buffer[start:end] = added
+        if self.faiss_index is not None:
+            self.faiss_index.add(added)
+        self.vectors = buffer[:end]
+        self.txn_ids.extend(txn.txn_id for txn in batch)
+        for offset, txn in enumerate(batch):
+            self.id_to_position[txn.txn_id] = start + offset
+        return len(batch)
+
+    def search_similar(
+        self,
+        txn_id: str,
+        k: int,
+        min_similarity: float = 0.78,
+        deadline: Deadline | None = None,
+    ) -> list[SimilarResult]:
         if txn_id not in self.id_to_position:
             return []
 
         position = self.id_to_position[txn_id]
-        query = self.vectors[position : position + 1]
-        max_candidates = min(max((k * 10) + 1, 32), len(self.txn_ids))
+        count = len(self.txn_ids)
+        vectors = self.vectors[:count]
+        query = vectors[position : position + 1]
+        max_candidates = min(max((k * 10) + 1, 32), count)
 
         if self.backend == "faiss" and self.faiss_index is not None:
             scores, indices = self.faiss_index.search(query, max_candidates)
             output: list[SimilarResult] = []
             for score, index in zip(scores[0], indices[0], strict=False):
-                if index < 0:
+                if index < 0 or index >= count:
                     continue
                 candidate_id = self.txn_ids[int(index)]
                 if candidate_id == txn_id:
@@ -50,18 +79,28 @@ class TransactionVectorIndex:
                     break
             return output
 
-        dot_products = self.vectors @ query.T
-        similarities = dot_products.reshape(-1)
-        ranked_indices = np.argsort(-similarities)
+        keep = k + 1
+        best_positions = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, count, SIMILARITY_CHUNK_ROWS):
+            if deadline is not None and deadline.expired():
+                break
+            similarities = (vectors[start : start + SIMILARITY_CHUNK_ROWS] @ query.T).reshape(-1)
+            candidates = np.flatnonzero(similarities >= min_similarity)
+            if candidates.size > keep:
+                candidates = candidates[np.argpartition(-similarities[candidates], keep - 1)[:keep]]
+            best_positions = np.concatenate([best_positions, candidates + start])
+            best_scores = np.concatenate([best_scores, similarities[candidates]])
+            if best_positions.size > keep:
+                order = np.lexsort((best_positions, -best_scores))[:keep]
+                best_positions, best_scores = best_positions[order], best_scores[order]
+
         output = []
-        for index in ranked_indices:
-            candidate_id = self.txn_ids[int(index)]
+        for index in np.lexsort((best_positions, -best_scores)):
+            candidate_id = self.txn_ids[int(best_positions[index])]
             if candidate_id == txn_id:
                 continue
-            score = float(similarities[int(index)])
-            if score < min_similarity:
-                continue
-            output.append(SimilarResult(txn_id=candidate_id, score=score))
+            output.append(SimilarResult(txn_id=candidate_id, score=float(best_scores[index])))
             if len(output) >= k:
                 break
         return output
@@ -73,6 +112,7 @@ def build_index(transactions: list[Transaction]) -> TransactionVectorIndex:
     vectors = _normalize(vectors)
     id_to_position = {txn_id: index for index, txn_id in enumerate(txn_ids)}
 
+    faiss = _faiss()
     if faiss is not None:
         index = faiss.IndexFlatIP(vectors.shape[1])
         index.add(vectors)
@@ -92,8 +132,22 @@ def build_index(transactions: list[Transaction]) -> TransactionVectorIndex:
     )
 
 
-def search_similar(index: TransactionVectorIndex, txn_id: str, k: int) -> list[SimilarResult]:
-    return index.search_similar(txn_id=txn_id, k=k)
+def search_similar(
+    index: TransactionVectorIndex,
+    txn_id: str,
+    k: int,
+    deadline: Deadline | None = None,
+) -> list[SimilarResult]:
+    return index.search_similar(txn_id=txn_id, k=k, deadline=deadline)
+
+
+@cache
+def _faiss() -> Any | None:
+    try:
+        import faiss  # type: ignore
+    except Exception:  # pragma: no cover
+        return None
+    return faiss
 
 
 def _embed_transaction(txn: Transaction) -> np.ndarray:
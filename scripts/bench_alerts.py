@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import time
+from functools import partial
+
+from fastapi import Query
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import AppStateBuilder
+from retail_risk_aug.generator import generate_dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare /alerts throughput with and without cached JSON fragments")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--transactions", type=int, default=60000)
+    parser.add_argument("--inject", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--limit", type=int, nargs="+", default=[100, 1000])
+    args = parser.parse_args()
+
+    loader = partial(generate_dataset, args.customers, args.transactions, args.inject, args.seed)
+    state = AppStateBuilder(seed=args.seed, loader=loader).start().result()
+    app = create_app(state=state)
+
+    @app.get("/bench/alerts-model-dump")
+    def legacy_alerts(status: str = Query(default="open"), limit: int = Query(default=100)) -> list[dict[str, object]]:
+        return [alert.model_dump(mode="json") for alert in state.page_alerts(status=status, limit=limit).items]
+
+    client = TestClient(app)
+    print(f"open alerts: {state.alerts.count('open')}")
+    print(f"{'path':<26} {'limit':>6} {'req_s':>9} {'ms_p50':>8}")
+    for limit in args.limit:
+        for path in ("/bench/alerts-model-dump", "/alerts"):
+            throughput, median = _measure(client, path, limit, args.requests)
+            print(f"{path:<26} {limit:>6} {throughput:>9.1f} {median:>8.2f}")
+
+
+def _measure(client: TestClient, path: str, limit: int, requests: int) -> tuple[float, float]:
+    params = {"status": "open", "limit": limit}
+    for _ in range(10):
+        client.get(path, params=params).raise_for_status()
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        sent = time.perf_counter()
+        client.get(path, params=params).raise_for_status()
+        latencies.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return requests / elapsed, latencies[len(latencies) // 2] * 1000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import build_default_app_state
+from retail_risk_aug.generator import generate_dataset
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure POST /transactions throughput against an in-process API")
+    parser.add_argument("--transactions", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=99)
+    args = parser.parse_args()
+
+    state = build_default_app_state()
+    client = TestClient(create_app(state=state))
+    incoming = generate_dataset(customers=2000, transactions=args.transactions, inject=args.transactions // 50, seed=args.seed)
+    payloads = [
+        [{**txn.model_dump(mode="json"), "txn_id": f"BENCH-{txn.txn_id}"} for txn in incoming.transactions[start : start + args.batch]]
+        for start in range(0, len(incoming.transactions), args.batch)
+    ]
+
+    started = time.perf_counter()
+    for payload in payloads:
+        client.post("/transactions", json=payload).raise_for_status()
+    elapsed = time.perf_counter() - started
+
+    metrics = state.ingest_metrics
+    print(f"ingested {metrics.transactions} transactions in {elapsed:.2f}s ({metrics.transactions / elapsed:.0f} txn/s), {metrics.alerts} alerts")
+    print(f"{'stage':<14} {'total_s':>8} {'per_batch_ms':>13} {'max_ms':>8}")
+    for stage, timing in metrics.stages.items():
+        per_batch = timing.total_seconds / timing.calls * 1000 if timing.calls else 0.0
+        print(f"{stage:<14} {timing.total_seconds:>8.2f} {per_batch:>13.2f} {timing.max_seconds * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
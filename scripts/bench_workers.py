@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare API startup time and memory for private vs shared AppState")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--modes", nargs="+", choices=["private", "shared"], default=["private", "shared"])
+    parser.add_argument("--port", type=int, default=18100)
+    parser.add_argument("--timeout", type=float, default=180.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<8} {'workers':>7} {'startup_s':>10} {'rss_mb':>9} {'pss_mb':>9}")
+    for mode in args.modes:
+        for workers in args.workers:
+            startup, rss, pss = _measure(mode, workers, args.port, args.timeout)
+            print(f"{mode:<8} {workers:>7} {startup:>10.2f} {rss / 1024:>9.1f} {pss / 1024:>9.1f}")
+
+
+def _measure(mode: str, workers: int, port: int, timeout: float) -> tuple[float, int, int]:
+    command = [
+        sys.executable,
+        "-m",
+        "retail_risk_aug.cli",
+        "serve",
+        "--target",
+        "api",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--state-mode",
+        mode,
+    ]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        _wait_until_ready(port, probes=max(3 * workers, 3), timeout=timeout)
+        startup = time.perf_counter() - started
+        time.sleep(1.0)
+        pids = _process_tree(process.pid)
+        return startup, sum(_memory_kb(pid, "Rss") for pid in pids), sum(_memory_kb(pid, "Pss") for pid in pids)
+    finally:
+        os.killpg(process.pid, signal.SIGINT)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+
+def _wait_until_ready(port: int, probes: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    consecutive = 0
+    while consecutive < probes:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"API on port {port} did not become ready")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/admin/ready", timeout=5) as response:
+                consecutive = consecutive + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError):
+            consecutive = 0
+            time.sleep(0.2)
+
+
+def _process_tree(root: int) -> list[int]:
+    children: dict[int, list[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            parent = int((entry / "stat").read_text().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry.name))
+
+    pids = [root]
+    for pid in pids:
+        pids.extend(children.get(pid, []))
+    return pids
+
+
+def _memory_kb(pid: int, field: str) -> int:
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            if line.startswith(f"{field}:"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from retail_risk_aug.alerts import AlertStore, AlertTransitionError
+from retail_risk_aug.models import Alert
+
+
+def _alerts(count: int) -> list[Alert]:
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    return [
+        Alert(
+            case_id=f"CASE-{index:03d}",
+            txn_id=f"T{index:03d}",
+            score=0.75 + (index % 5) / 100,
+            reason_codes=["SHARED_IP"],
+            created_ts=base + timedelta(minutes=index),
+        )
+        for index in range(count)
+    ]
+
+
+def test_alert_store_paginates_with_keyset_cursor() -> None:
+    store = AlertStore(_alerts(7))
+
+    first = store.page("open", limit=3)
+    second = store.page("open", limit=3, cursor=first.next_cursor)
+    third = store.page("open", limit=3, cursor=second.next_cursor)
+
+    seen = [alert.case_id for page in (first, second, third) for alert in page.items]
+    assert seen == [f"CASE-{index:03d}" for index in range(6, -1, -1)]
+    assert third.next_cursor is None
+
+    by_score = store.page("open", sort="score", limit=2).items
+    assert [alert.case_id for alert in by_score] == ["CASE-004", "CASE-003"]
+
+    with pytest.raises(ValueError):
+        store.page("open", cursor="not-a-cursor")
+
+
+def test_alert_transitions_move_between_status_indexes() -> None:
+    store = AlertStore(_alerts(3))
+
+    store.transition("CASE-001", "investigating")
+    closed = store.transition("CASE-001", "closed", resolution="false_positive")
+
+    assert closed.resolution == "false_positive"
+    assert closed.resolution_ts is not None
+    assert [alert.case_id for alert in store.by_status("open")] == ["CASE-002", "CASE-000"]
+    assert store.count("closed") == 1
+    assert store.count("investigating") == 0
+
+    with pytest.raises(AlertTransitionError):
+        store.transition("CASE-001", "open")
+    with pytest.raises(AlertTransitionError):
+        store.transition("CASE-000", "closed")
+    with pytest.raises(KeyError):
+        store.transition("missing", "closed", resolution="x")
+
+
+def test_concurrent_transitions_apply_exactly_once() -> None:
+    store = AlertStore(_alerts(1))
+
+    def attempt(_: int) -> bool:
+        try:
+            store.transition("CASE-000", "investigating", expected_status="open")
+        except AlertTransitionError:
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = list(executor.map(attempt, range(32)))
+
+    assert outcomes.count(True) == 1
+    assert store.count("investigating") == 1
+    assert store.count("open") == 0
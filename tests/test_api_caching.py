@@ -0,0 +1,43 @@
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.api.caching import etag_matches
+from retail_risk_aug.app_state import build_default_app_state
+
+
+def test_alert_etags_follow_per_alert_revisions() -> None:
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+    alerts = client.get("/alerts")
+    assert alerts.headers["cache-control"] == "private, no-cache"
+    list_tag = alerts.headers["etag"]
+    assert client.get("/alerts", headers={"If-None-Match": list_tag}).status_code == 304
+
+    first, second = (item["case_id"] for item in alerts.json()[:2])
+    first_tag = client.get(f"/alert/{first}").headers["etag"]
+    second_tag = client.get(f"/alert/{second}").headers["etag"]
+    not_modified = client.get(f"/alert/{first}", headers={"If-None-Match": first_tag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == first_tag
+
+    client.post(f"/alert/{first}/transition", json={"status": "investigating"})
+    assert client.get(f"/alert/{first}", headers={"If-None-Match": first_tag}).status_code == 200
+    assert client.get(f"/alert/{second}", headers={"If-None-Match": second_tag}).status_code == 304
+    assert client.get("/alerts", headers={"If-None-Match": list_tag}).status_code == 200
+
+
+def test_derived_endpoints_use_state_version_and_max_age(monkeypatch) -> None:
+    monkeypatch.setenv("API_CACHE_MAX_AGE", "60")
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+    txn = state.dataset.transactions[0]
+
+    graph = client.get(f"/graph/txn/{txn.txn_id}")
+    assert graph.headers["cache-control"] == "private, max-age=60, must-revalidate"
+    assert graph.headers["etag"].startswith(f'W/"{state.fingerprint}.{state.version}')
+    assert client.get(f"/graph/txn/{txn.txn_id}", headers={"If-None-Match": graph.headers["etag"]}).status_code == 304
+    assert client.get(f"/account/{txn.account_id}/transactions", headers={"If-None-Match": "*"}).status_code == 304
+    assert client.get("/admin/health").headers["cache-control"] == "no-store"
+    assert etag_matches('"other", W/"a.1"', 'W/"a.1"')
+    assert not etag_matches('"a.2"', 'W/"a.1"')
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.api.concurrency import ConcurrencyLimiter, OverloadedError
+from retail_risk_aug.app_state import build_default_app_state
+from retail_risk_aug.deadline import Deadline
+from retail_risk_aug.vector import service as vector_service
+
+
+def test_engines_return_partial_results_after_deadline(monkeypatch) -> None:
+    state = build_default_app_state(seed=7)
+    txn = next(txn for txn in state.dataset.transactions if txn.counterparty_account_id)
+
+    expired = Deadline.after(0)
+    assert state.graph.neighborhood(txn.account_id, hops=3, deadline=expired) == [f"account:{txn.account_id}"]
+    assert expired.truncated
+    assert state.graph.paths(txn.account_id, txn.counterparty_account_id, max_hops=3, deadline=Deadline.after(0)) == []
+    assert state.get_similar_transactions(txn.txn_id, k=5, deadline=Deadline.after(0)) == []
+
+    full = state.get_similar_transactions(txn.txn_id, k=5)
+    monkeypatch.setattr(vector_service, "SIMILARITY_CHUNK_ROWS", 7)
+    generous = Deadline.after(60)
+    chunked = state.get_similar_transactions(txn.txn_id, k=5, deadline=generous)
+    assert [item.txn_id for item in chunked] == [item.txn_id for item in full]
+    assert [item.score for item in chunked] == pytest.approx([item.score for item in full], abs=1e-6)
+    assert not generous.truncated
+
+
+def test_limiter_sheds_load_when_queue_is_full() -> None:
+    async def scenario() -> int:
+        limiter = ConcurrencyLimiter("graph", limit=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with limiter.slot():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError):
+            async with limiter.slot():
+                pass
+        release.set()
+        await asyncio.gather(running, queued)
+        return limiter.stats().rejected
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_graph_endpoint_flags_partial_results(monkeypatch) -> None:
+    monkeypatch.setenv("GRAPH_DEADLINE_SECONDS", "0")
+    with TestClient(create_app(state=build_default_app_state(seed=7))) as client:
+        txn_id = client.get("/alerts", params={"limit": 1}).json()[0]["txn_id"]
+        response = client.get(f"/graph/txn/{txn_id}")
+
+        assert response.status_code == 200
+        assert response.headers["X-Partial-Result"] == "true"
+        assert len(response.json()["neighborhood"]) == 1
+        assert "X-Partial-Result" not in client.get(f"/similar/transaction/{txn_id}").headers
+        assert client.get("/admin/health").json()["offload"]["graph"]["rejected"] == 0
@@ -1,6 +1,7 @@
 from fastapi.testclient import TestClient
 
 from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import build_default_app_state
 
 
 def test_health_endpoint() -> None:
@@ -9,6 +10,28 @@ def test_health_endpoint() -> None:
     assert response.status_code == 200
     body = response.json()
     assert body["status"] == "ok"
+    assert "graph" in body["components"]
+
+
+def test_readiness_probe_reports_ready_after_build() -> None:
+    app = create_app()
+    client = TestClient(app)
+    app.state.state_manager.current(timeout=30)
+
+    assert client.get("/admin/ready").json() == {"ready": True}
+    body = client.get("/admin/health").json()
+    assert all(component["ready"] for component in body["components"].values())
+    assert body["transactions"] > 0
+
+
+def test_health_probe_does_not_query_the_graph_backend(monkeypatch) -> None:
+    state = build_default_app_state(seed=7)
+    monkeypatch.setattr(state.graph, "node_count", lambda: (_ for _ in ()).throw(TimeoutError("graph backend unavailable")))
+    client = TestClient(create_app(state=state))
+
+    response = client.get("/admin/health")
+    assert response.status_code == 200
+    assert response.json()["transactions"] == len(state.dataset.transactions)
 
 
 def test_alerts_and_alert_detail_endpoints() -> None:
@@ -35,3 +58,83 @@ def test_similarity_and_graph_endpoints() -> None:
     graph_response = client.get(f"/graph/txn/{txn_id}")
     assert graph_response.status_code == 200
     assert graph_response.json()["txn_id"] == txn_id
+
+    account_id = graph_response.json()["account_id"]
+    subgraph = client.get(f"/graph/account/{account_id}/subgraph", params={"max_nodes": 5}).json()
+    assert len(subgraph["nodes"]) <= 5
+    assert {"id": f"account:{account_id}", "node_type": "account", "key": account_id} in subgraph["nodes"]
+    node_ids = {node["id"] for node in subgraph["nodes"]}
+    assert all(edge["source"] in node_ids and edge["target"] in node_ids for edge in subgraph["edges"])
+
+    summary = client.get("/graph/summary", params={"window": 500, "max_nodes": 20, "max_edges": 30}).json()
+    assert summary["transactions"] == 500
+    assert len(summary["nodes"]) == 20 and len(summary["edges"]) <= 30
+
+
+def test_graph_cluster_endpoint() -> None:
+    client = TestClient(create_app())
+    alerts = client.get("/alerts", params={"status": "open"}).json()
+    account_id = client.get(f"/graph/txn/{alerts[0]['txn_id']}").json()["account_id"]
+
+    cluster_response = client.get(f"/graph/account/{account_id}/cluster", params={"members_limit": 5})
+    assert cluster_response.status_code == 200
+    body = cluster_response.json()
+    assert body["cluster_accounts"] >= 1
+    assert len(body["members"]) <= 5
+    assert client.get("/graph/account/missing/cluster").status_code == 404
+
+
+def test_entity_transaction_endpoints_return_latest_first() -> None:
+    client = TestClient(create_app())
+    alerts = client.get("/alerts", params={"status": "open"}).json()
+    detail = client.get(f"/alert/{alerts[0]['case_id']}").json()["transaction"]
+
+    for path in (
+        f"/account/{detail['account_id']}/transactions",
+        f"/merchant/{detail['merchant_id']}/transactions",
+        f"/device/{detail['device_id']}/transactions",
+        f"/ip/{detail['ip']}/transactions",
+    ):
+        response = client.get(path, params={"limit": 5})
+        assert response.status_code == 200
+        items = response.json()
+        assert 1 <= len(items) <= 5
+        assert [item["ts"] for item in items] == sorted((item["ts"] for item in items), reverse=True)
+
+
+def test_transactions_range_and_timeseries_endpoints() -> None:
+    client = TestClient(create_app())
+
+    window = {"from": "2025-01-01T01:00:00Z", "to": "2025-01-01T02:00:00Z"}
+    transactions = client.get("/transactions", params={**window, "limit": 500})
+    assert transactions.status_code == 200
+    assert len(transactions.json()) == 60
+
+    series = client.get("/stats/timeseries", params={**window, "bucket": "minute"})
+    assert series.status_code == 200
+    assert sum(item["count"] for item in series.json()) == 60
+
+    hourly = client.get("/stats/timeseries", params={"bucket": "hour"}).json()
+    assert sum(item["count"] for item in hourly) == client.get("/admin/health").json()["transactions"]
+    assert client.get("/stats/timeseries", params={"bucket": "day"}).status_code == 422
+
+
+def test_alerts_pagination_and_transition_endpoints() -> None:
+    client = TestClient(create_app())
+
+    first = client.get("/alerts", params={"status": "open", "limit": 5, "sort": "score"})
+    assert first.status_code == 200
+    assert len(first.json()) == 5
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get("/alerts", params={"status": "open", "limit": 5, "sort": "score", "cursor": cursor}).json()
+    assert not {item["case_id"] for item in first.json()} & {item["case_id"] for item in second}
+
+    case_id = first.json()[0]["case_id"]
+    moved = client.post(f"/alert/{case_id}/transition", json={"status": "investigating"})
+    assert moved.status_code == 200
+    assert moved.json()["status"] == "investigating"
+    conflict = client.post(f"/alert/{case_id}/transition", json={"status": "closed"})
+    assert conflict.status_code == 409
+    closed = client.post(f"/alert/{case_id}/transition", json={"status": "closed", "resolution": "confirmed_fraud"})
+    assert closed.json()["resolution"] == "confirmed_fraud"
+    assert client.get("/alerts", params={"status": "closed"}).json()[0]["case_id"] == case_id
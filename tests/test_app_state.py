@@ -0,0 +1,45 @@
+import pytest
+
+from retail_risk_aug.app_state import AppStateBuilder
+from retail_risk_aug.config import Settings
+
+
+def test_builder_runs_stage_graph_and_reports_readiness() -> None:
+    builder = AppStateBuilder(seed=7).start()
+    state = builder.result(timeout=30)
+
+    readiness = builder.readiness()
+    assert set(readiness) == {
+        "dataset",
+        "scoring",
+        "lookups",
+        "timeline",
+        "aggregates",
+        "vector_index",
+        "graph",
+        "graph_features",
+        "clusters",
+    }
+    assert all(status.ready and status.seconds is not None for status in readiness.values())
+    assert builder.ready
+    assert builder.total_seconds is not None
+    assert builder.component("dataset") is state.dataset
+    assert len(state.alerts) == len(state.txn_to_case)
+    assert len(state.timeline) == len(state.dataset.transactions)
+    assert state.scorer.graph_features is builder.component("graph_features")
+    assert any("GRAPH_HUB" in item.reason_codes for item in state.scored_transactions.values())
+
+
+def test_builder_failure_marks_only_the_failed_branch() -> None:
+    builder = AppStateBuilder(seed=7, settings=Settings(graph_backend="unknown")).start()
+
+    with pytest.raises(ValueError):
+        builder.result(timeout=30)
+
+    assert builder.component("vector_index", timeout=30).backend in {"faiss", "numpy"}
+    builder.component("scoring", timeout=30)
+    builder.component("timeline", timeout=30)
+    readiness = builder.readiness()
+    assert not builder.ready
+    assert readiness["graph"].error is not None
+    assert readiness["graph_features"].ready and readiness["scoring"].ready and readiness["timeline"].ready
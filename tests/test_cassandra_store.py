@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from retail_risk_aug.generator import generate_dataset
+from retail_risk_aug.store import cassandra
+from retail_risk_aug.models import Alert
+from retail_risk_aug.store.cassandra import BulkWriteError, CassandraStore, TimeBuckets
+
+
+class FakeBatch:
+    def __init__(self, batch_type: str) -> None:
+        self.batch_type = batch_type
+        self.entries: list[tuple[str, tuple[Any, ...]]] = []
+
+    def add(self, statement: str, params: tuple[Any, ...]) -> None:
+        self.entries.append((statement, params))
+
+
+Row = namedtuple("Row", ["account_id", "txn_id"])
+
+
+PRIMARY_KEYS = {
+    "transactions_by_account": ("account_id", "ts", "txn_id"),
+    "transactions_by_merchant_bucket": ("merchant_id", "bucket", "shard", "ts", "txn_id"),
+    "alerts_by_status_bucket": ("status", "bucket", "shard", "created_ts", "case_id"),
+}
+
+
+class FakePrepared:
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.table = query.split("(")[0].split()[-1] if query.startswith("INSERT") else query.split("FROM")[1].split()[0]
+        self.is_idempotent = False
+        if query.startswith("INSERT"):
+            self.columns = [name.strip() for name in query.split("(")[1].split(")")[0].split(",")]
+        elif query.startswith("SELECT"):
+            self.columns = [name.strip() for name in query[6:].split("FROM")[0].split(",")]
+
+    def bind(self, params: tuple[Any, ...]) -> FakeBound:
+        return FakeBound(self, params)
+
+
+class FakeBound:
+    def __init__(self, prepared: FakePrepared, params: tuple[Any, ...]) -> None:
+        self.prepared = prepared
+        self.params = params
+        self.fetch_size: int | None = None
+
+
+class FakeResult:
+    def __init__(self, current_rows: list[Any], paging_state: bytes | None) -> None:
+        self.current_rows = current_rows
+        self.paging_state = paging_state
+
+
+class FakeTables:
+    def __init__(self) -> None:
+        self.rows: dict[str, dict[tuple[Any, ...], tuple[int, dict[str, Any] | None]]] = {}
+
+    def seed(self, table: str, rows: list[dict[str, Any]]) -> None:
+        seeded = self.rows.setdefault(table, {})
+        for row in rows:
+            seeded[(len(seeded),)] = (0, row)
+
+    def apply(self, statement: FakePrepared, params: tuple[Any, ...]) -> None:
+        if statement.query.startswith("DELETE"):
+            self._write(statement.table, params[1:], params[0], None)
+            return
+        timestamped = statement.query.endswith("USING TIMESTAMP ?")
+        row = dict(zip(statement.columns, params[:-1] if timestamped else params))
+        key = tuple(row[name] for name in PRIMARY_KEYS[statement.table])
+        self._write(statement.table, key, params[-1] if timestamped else time.time_ns() // 1000, row)
+
+    def select(self, statement: FakePrepared, params: tuple[Any, ...]) -> list[dict[str, Any]]:
+        rows = [row for _, row in self.rows.get(statement.table, {}).values() if row is not None]
+        if params:
+            names = PRIMARY_KEYS[statement.table]
+            rows = [row for row in rows if tuple(row[name] for name in names[:3]) == params[:3] and params[3] <= row[names[3]] <= params[4]]
+        return sorted(rows, key=lambda row: (-row[statement.columns[1]].timestamp(), row[statement.columns[2]]))
+
+    def live(self, table: str) -> list[dict[str, Any]]:
+        return [row for _, row in self.rows.get(table, {}).values() if row is not None]
+
+    def _write(self, table: str, key: tuple[Any, ...], written_at: int, row: dict[str, Any] | None) -> None:
+        current = self.rows.setdefault(table, {}).get(key)
+        if current is None or written_at > current[0] or (written_at == current[0] and row is None):
+            self.rows[table][key] = (written_at, row)
+
+
+class FakeFuture:
+    def __init__(self, future: Any) -> None:
+        self._future = future
+
+    def result(self) -> Any:
+        return self._future.result()
+
+    def add_callbacks(self, callback: Any, errback: Any, callback_args: tuple = (), errback_args: tuple = ()) -> None:
+        def finish(done: Any) -> None:
+            error = done.exception()
+            if error is None:
+                callback(done.result(), *callback_args)
+            else:
+                errback(error, *errback_args)
+
+        self._future.add_done_callback(finish)
+
+
+class FakeSession:
+    def __init__(self, latency: float = 0.002, failures: int = 0, fatal: bool = False, accounts: dict[str, int] | None = None) -> None:
+        self.accounts = accounts or {}
+        self.tables = FakeTables()
+        self.latency = latency
+        self.failures = failures
+        self.fatal = fatal
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self.written: list[Any] = []
+        self.prepared: list[str] = []
+        self.keyspaces: list[str] = []
+        self.reads: list[tuple[FakeBound, bytes | None, str]] = []
+        self.peak_reads = 0
+        self._reading = 0
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=64)
+
+    def set_keyspace(self, keyspace: str) -> None:
+        self.keyspaces.append(keyspace)
+
+    def prepare(self, query: str) -> FakePrepared:
+        self.prepared.append(query)
+        return FakePrepared(query)
+
+    def get_pool_state(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return {"10.0.0.1": {"open_count": 1, "in_flights": [self.in_flight]}}
+
+    def execute_async(
+        self,
+        statement: Any,
+        params: Any = None,
+        paging_state: bytes | None = None,
+        execution_profile: str = "default",
+    ) -> FakeFuture:
+        if isinstance(statement, FakeBound):
+            with self._lock:
+                self.reads.append((statement, paging_state, execution_profile))
+                self._reading += 1
+                self.peak_reads = max(self.peak_reads, self._reading)
+            return FakeFuture(self._pool.submit(self._page, statement, paging_state, execution_profile))
+        with self._lock:
+            self.calls += 1
+            fail = self.calls <= self.failures
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        return FakeFuture(self._pool.submit(self._run, statement, params, fail))
+
+    def _run(self, statement: Any, params: Any, fail: bool) -> None:
+        time.sleep(self.latency)
+        with self._lock:
+            self.in_flight -= 1
+            if fail:
+                raise ValueError("rejected") if self.fatal else TimeoutError("write timed out")
+            self.written.append(statement if params is None else (statement, params))
+            for entry, values in statement.entries if params is None else [(statement, params)]:
+                self.tables.apply(entry, values)
+
+
+    def _page(self, bound: FakeBound, paging_state: bytes | None, profile: str) -> FakeResult:
+        time.sleep(self.latency)
+        if bound.prepared.table != "transactions_by_account":
+            return self._table_page(bound, paging_state, profile)
+        account_id = bound.params[0]
+        start = int(paging_state or b"0")
+        end = min(start + bound.fetch_size, self.accounts.get(account_id, 0))
+        rows = [Row(account_id, f"{account_id}-T{i:04d}") for i in range(start, end)]
+        with self._lock:
+            self._reading -= 1
+        if profile == cassandra.READ_TUPLE_PROFILE:
+            rows = [tuple(row) for row in rows]
+        return FakeResult(rows, str(end).encode() if end < self.accounts.get(account_id, 0) else None)
+
+
+    def _table_page(self, bound: FakeBound, paging_state: bytes | None, profile: str) -> FakeResult:
+        columns = bound.prepared.columns
+        selected = self.tables.select(bound.prepared, bound.params)
+        with self._lock:
+            self._reading -= 1
+        start = int(paging_state or b"0")
+        end = min(start + bound.fetch_size, len(selected))
+        shape = namedtuple("Row", columns) if profile != cassandra.READ_TUPLE_PROFILE else None
+        rows = [tuple(row[name] for name in columns) for row in selected[start:end]]
+        if shape is not None:
+            rows = [shape(*row) for row in rows]
+        return FakeResult(rows, str(end).encode() if end < len(selected) else None)
+
+
+@pytest.fixture
+def fake_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cassandra, "BatchStatement", FakeBatch)
+    monkeypatch.setattr(cassandra, "BatchType", type("BatchType", (), {"UNLOGGED": "UNLOGGED", "LOGGED": "LOGGED"}))
+
+
+def _store(session: FakeSession, **options: Any) -> CassandraStore:
+    store = CassandraStore(["localhost"], "", "", retry_backoff_seconds=0.001, **options)
+    store._bind(session)
+    return store
+
+
+def test_write_transactions_bounds_in_flight_and_retries_timeouts(fake_batches: None) -> None:
+    transactions = generate_dataset(customers=30, transactions=400, inject=20, seed=11).transactions
+    session = FakeSession(failures=5)
+    report = _store(session, max_in_flight=8).write_transactions(transactions, batch=False)
+
+    assert report.rows == report.statements == 2 * len(transactions)
+    assert report.retries == 5 and report.failures == 0
+    assert session.peak <= 8
+    assert report.rows_per_second > 0 and report.p99_latency_ms >= 2.0
+    written = {(stmt.table, params[2 if stmt.table == "transactions_by_account" else 4]) for stmt, params in session.written}
+    assert len(written) == 2 * len(transactions)
+
+
+def test_write_transactions_groups_unlogged_batches_by_partition(fake_batches: None) -> None:
+    transactions = generate_dataset(customers=10, transactions=300, inject=10, seed=3).transactions
+    session = FakeSession()
+    report = _store(session, batch_rows=8).write_transactions(transactions)
+
+    assert report.rows == 2 * len(transactions)
+    assert report.statements < len(transactions)
+    batches = [item for item in session.written if isinstance(item, FakeBatch)]
+    assert batches and all(batch.batch_type == "UNLOGGED" and len(batch.entries) <= 8 for batch in batches)
+    for batch in batches:
+        assert len({params[0] for _, params in batch.entries}) == 1
+
+
+def test_write_alerts_raises_with_report_after_exhausting_retries(fake_batches: None) -> None:
+    store = _store(FakeSession(failures=1, fatal=True), write_retries=2, unlogged_batches=False)
+    alerts = [cassandra.make_alert_from_score(f"T{i}", 0.9, ["R1"]) for i in range(3)]
+
+    with pytest.raises(BulkWriteError) as caught:
+        store.write_alerts(alerts)
+    assert caught.value.report.failures == 1
+    assert caught.value.report.rows == 2
+
+
+def test_statements_are_prepared_once_and_reads_use_speculative_profile(fake_batches: None) -> None:
+    transactions = generate_dataset(customers=10, transactions=100, inject=5, seed=5).transactions
+    session = FakeSession(accounts={"A1": 12})
+    store = _store(session, max_in_flight=4)
+    store._require_statements().prepare_all()
+
+    for _ in range(3):
+        report = store.write_transactions(transactions, batch=False)
+        assert report.peak_in_flight <= 4
+    rows = store.read_transactions_by_account("A1", limit=5)
+
+    assert len(session.prepared) == len(set(session.prepared)) == 7
+    assert session.keyspaces == []
+    bound, paging_state, profile = session.reads[0]
+    assert bound.prepared.is_idempotent and bound.params == ("A1",) and bound.fetch_size == 5
+    assert paging_state is None and profile == cassandra.READ_PROFILE
+    assert rows == [{"account_id": "A1", "txn_id": f"A1-T{i:04d}"} for i in range(5)]
+
+    metrics = store.metrics()
+    assert metrics.statements_prepared == 7 and metrics.statement_cache_misses == 0
+    assert metrics.statement_cache_hits == 7
+    assert metrics.pool_capacity == cassandra.DEFAULT_STREAMS_PER_CONNECTION and metrics.pool_in_flight == 0
+    assert 0 < metrics.peak_saturation <= 1.0
+
+
+def test_paged_reads_prefetch_resume_from_tokens_and_fan_out() -> None:
+    session = FakeSession(accounts={"A1": 25, "A2": 3, "A3": 0, "A4": 10})
+    store = _store(session, page_size=10, read_concurrency=2)
+
+    lazy = store.iter_transactions_by_account("A1")
+    first = next(lazy)
+    assert first == {"account_id": "A1", "txn_id": "A1-T0000"}
+    assert [paging_state for _, paging_state, _ in session.reads] == [None, b"10"]
+    assert len(list(lazy)) == 24
+
+    page = store.read_transactions_page("A1", page_size=10, row_format="named")
+    assert page.rows[0] == Row("A1", "A1-T0000") and page.token
+    resumed = store.read_transactions_page("A1", page_size=10, token=page.token, row_format="tuple")
+    assert resumed.rows[0] == ("A1", "A1-T0010")
+    assert store.read_transactions_page("A1", page_size=10, token=resumed.token).token is None
+    with pytest.raises(ValueError):
+        store.read_transactions_page("A2", token=page.token)
+
+    session.reads.clear()
+    fanned = dict(store.read_transactions_by_accounts(["A1", "A2", "A3", "A4"], limit=12, row_format="tuple"))
+    assert {account: len(rows) for account, rows in fanned.items()} == {"A1": 12, "A2": 3, "A3": 0, "A4": 10}
+    assert all(isinstance(row, tuple) for row in fanned["A1"]) and 0 < session.peak_reads <= 2
+    assert all(bound.fetch_size <= 10 for bound, _, _ in session.reads)
+
+
+def _alert(case_id: str, created_ts: datetime, status: str = "open") -> Alert:
+    return Alert(case_id=case_id, txn_id=f"T-{case_id}", score=0.9, reason_codes=["R1"], status=status, created_ts=created_ts)
+
+
+def test_bucketed_alert_reads_merge_partitions_in_clustering_order(fake_batches: None) -> None:
+    session = FakeSession(latency=0.0)
+    store = _store(session, page_size=3, alert_buckets=TimeBuckets("hour", shards=3))
+    start = datetime(2025, 3, 1, 9, tzinfo=UTC)
+    alerts = [_alert(f"C{i:03d}", start + timedelta(minutes=7 * i)) for i in range(40)]
+    store.write_alerts(alerts)
+
+    partitions = {(row["bucket"], row["shard"]) for row in session.tables.live("alerts_by_status_bucket")}
+    assert len({bucket for bucket, _ in partitions}) == 5 and {shard for _, shard in partitions} == {0, 1, 2}
+
+    since, until = start + timedelta(minutes=30), start + timedelta(hours=3)
+    rows = list(store.read_alerts_by_status("open", since, until))
+    expected = sorted((alert for alert in alerts if since <= alert.created_ts <= until), key=lambda alert: alert.created_ts, reverse=True)
+    assert [row["case_id"] for row in rows] == [alert.case_id for alert in expected]
+
+    session.reads.clear()
+    latest = list(store.read_alerts_by_status("open", start, start + timedelta(hours=5), limit=4, row_format="tuple"))
+    assert [row[2] for row in latest] == ["C039", "C038", "C037", "C036"]
+    assert {bound.params[1] for bound, _, _ in session.reads} == {"2025-03-01T14", "2025-03-01T13", "2025-03-01T12"}
+
+
+def test_status_changes_are_replay_safe_and_legacy_rows_migrate(fake_batches: None) -> None:
+    session = FakeSession(latency=0.0)
+    store = _store(session)
+    created = datetime(2025, 3, 1, 9, tzinfo=UTC)
+    alert = _alert("C1", created)
+    store.write_alerts([alert])
+
+    investigating = alert.model_copy(update={"status": "investigating"})
+    closed = alert.model_copy(update={"status": "closed", "resolution": "fraud"})
+    first = store.write_status_changes([(investigating, "open")], changed_at=created + timedelta(hours=1))
+    store.write_status_changes([(closed, "investigating")], changed_at=created + timedelta(hours=2))
+    store.write_status_changes([(investigating, "open")], changed_at=created + timedelta(hours=1))
+    store.write_alerts([alert])
+    with pytest.raises(ValueError, match="later than its creation"):
+        store.write_status_changes([(investigating, "open")], changed_at=created)
+
+    assert first.batches == 1
+    assert all(batch.batch_type == "LOGGED" and batch.is_idempotent for batch in session.written if isinstance(batch, FakeBatch))
+    assert [(row["status"], row["resolution"]) for row in session.tables.live("alerts_by_status_bucket")] == [("closed", "fraud")]
+
+    tables = {"alerts_by_status_bucket": None, "transactions_by_merchant_bucket": None}
+    store._cluster = SimpleNamespace(metadata=SimpleNamespace(keyspaces={store.keyspace: SimpleNamespace(tables=tables)}))
+    assert store.migrate_legacy_tables() == {}
+
+    legacy = [_alert(f"L{day}", created + timedelta(days=day)).model_dump() for day in range(3)]
+    session.tables.seed("alerts_by_status", legacy)
+    tables["alerts_by_status"] = None
+    reports = store.migrate_legacy_tables(page_size=2)
+    assert list(reports) == ["alerts_by_status"] and reports["alerts_by_status"].rows == 3
+    migrated = list(store.read_alerts_by_status("open", created, created + timedelta(days=3)))
+    assert [row["case_id"] for row in migrated] == ["L2", "L1", "L0"]
@@ -0,0 +1,42 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = {"faiss", "networkx", "fastapi", "uvicorn", "pyarrow", "numpy", "pandas", "streamlit"}
+
+
+def _imported_packages(*args: str) -> set[str]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "retail_risk_aug.cli", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+        timeout=120,
+    )
+    packages: set[str] = set()
+    for line in completed.stderr.splitlines():
+        if line.startswith("import time:") and line.count("|") == 2:
+            packages.add(line.rsplit("|", 1)[1].strip().split(".", 1)[0])
+    return packages
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--help",),
+        ("serve", "--help"),
+        ("pipeline", "run-all", "--help"),
+        ("generate", "--customers", "5", "--transactions", "20", "--inject", "2"),
+    ],
+)
+def test_light_cli_paths_skip_heavy_imports(args: tuple[str, ...]) -> None:
+    packages = _imported_packages(*args)
+    assert "retail_risk_aug" in packages
+    assert not packages & HEAVY_MODULES
+
+
+def test_pipeline_does_not_import_the_web_stack() -> None:
+    packages = _imported_packages("pipeline", "run-all", "--customers", "5", "--transactions", "50", "--inject", "5")
+    assert {"numpy", "networkx"} <= packages
+    assert not packages & {"fastapi", "uvicorn", "starlette"}
@@ -0,0 +1,92 @@
+import sys
+import threading
+from datetime import UTC, datetime
+
+from retail_risk_aug.graph import build_clusters
+from retail_risk_aug.models import ReasonCode, Transaction
+from retail_risk_aug.scoring import score_transactions
+
+
+def _txn(txn_id: str, account_id: str, device_id: str, ip: str, counterparty: str | None = None) -> Transaction:
+    return Transaction(
+        txn_id=txn_id,
+        ts=datetime(2025, 1, 1, tzinfo=UTC),
+        account_id=account_id,
+        counterparty_account_id=counterparty,
+        merchant_id="m1",
+        amount=10.0,
+        channel="ONLINE",
+        txn_type="ONLINE_PURCHASE",
+        device_id=device_id,
+        ip=ip,
+        geo="US-NY",
+        narrative="n",
+    )
+
+
+def test_clusters_merge_incrementally_through_shared_entities() -> None:
+    clusters = build_clusters(
+        [_txn("t1", "a1", "d1", "ip1"), _txn("t2", "a2", "d1", "ip2"), _txn("t3", "a3", "d3", "ip3")],
+        link_transfers=True,
+    )
+
+    assert clusters.cluster_id("account:a1") == clusters.cluster_id("account:a2")
+    assert clusters.cluster_id("account:a1") != clusters.cluster_id("account:a3")
+    assert clusters.features("a1").accounts == 2
+    assert clusters.cluster_size("device:d1") == 5
+
+    clusters.add_transactions([_txn("t4", "a3", "d4", "ip4", counterparty="a2")])
+
+    assert clusters.cluster_id("account:a3") == clusters.cluster_id("account:a1")
+    assert clusters.account_count("ip:ip3") == 3
+    assert sorted(node for node in clusters.members("account:a1") if node.startswith("account:")) == [
+        "account:a1",
+        "account:a2",
+        "account:a3",
+    ]
+    assert clusters.features("missing") is None
+
+    entities_only = build_clusters([_txn("t1", "a1", "d1", "ip1"), _txn("t4", "a3", "d4", "ip4", counterparty="a1")])
+    assert entities_only.cluster_id("account:a3") != entities_only.cluster_id("account:a1")
+
+
+def test_scoring_reads_cluster_size_feature() -> None:
+    txns = [_txn(f"t{index}", f"a{index}", "d-shared", f"ip{index}") for index in range(5)]
+    clusters = build_clusters(txns)
+
+    plain = score_transactions(txns)
+    clustered = score_transactions(txns, clusters=clusters)
+
+    assert all(ReasonCode.LINKED_CLUSTER.value not in item.reason_codes for item in plain)
+    assert all(ReasonCode.LINKED_CLUSTER.value in item.reason_codes for item in clustered)
+
+
+def test_cluster_reads_stay_consistent_while_unions_pop_roots() -> None:
+    clusters = build_clusters(_txn(f"p{index}", f"a{index}", f"d{index // 2}", f"ip{index}") for index in range(400))
+    errors: list[BaseException] = []
+    done = threading.Event()
+
+    def read() -> None:
+        while not done.is_set():
+            try:
+                for index in range(400):
+                    clusters.account_count(f"account:a{index}")
+                    clusters.cluster_size(f"ip:ip{index}")
+            except BaseException as exc:
+                errors.append(exc)
+                return
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    reader = threading.Thread(target=read)
+    reader.start()
+    try:
+        for index in range(0, 400, 2):
+            clusters.add_transactions([_txn(f"t{index}", f"a{index}", "d-hub", f"ip{index}")])
+    finally:
+        done.set()
+        reader.join()
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    assert clusters.account_count("account:a0") == 400
@@ -0,0 +1,67 @@
+import json
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import build_default_app_state
+
+
+def test_ndjson_exports_stream_filtered_projected_rows(monkeypatch) -> None:
+    monkeypatch.setenv("EXPORT_BATCH_ROWS", "7")
+    state = build_default_app_state(seed=7)
+    app = create_app(state=state)
+    client = TestClient(app)
+
+    with client.stream("GET", "/export/transactions", params={"fields": "txn_id,amount", "min_amount": 50}) as response:
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.iter_lines() if line]
+    expected = [txn for txn in state.get_transactions_between() if txn.amount >= 50]
+    assert rows == [{"txn_id": txn.txn_id, "amount": txn.amount} for txn in expected]
+    assert app.state.state_manager.metrics().in_flight == 0
+
+    alerts = [json.loads(line) for line in client.get("/export/alerts").text.splitlines()]
+    assert {row["case_id"] for row in alerts} == {alert.case_id for alert in state.alerts}
+    scores = client.get("/export/scores", params={"min_score": 0.75}).text.splitlines()
+    assert len(scores) == len(state.alerts)
+
+    assert client.get("/export/alerts", params={"fields": "case_id,nope"}).status_code == 400
+
+
+def test_entity_filtered_export_matches_timeline_scan() -> None:
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+    anchor = state.dataset.transactions[40]
+    start, end = anchor.ts - timedelta(days=3), anchor.ts + timedelta(days=3)
+    window = {"fields": "txn_id", "from": start.isoformat(), "to": end.isoformat()}
+
+    for params in (
+        {"account_id": anchor.account_id},
+        {"merchant_id": anchor.merchant_id},
+        {"account_id": anchor.account_id, "merchant_id": anchor.merchant_id},
+    ):
+        response = client.get("/export/transactions", params={**params, **window})
+        expected = [
+            txn.txn_id
+            for txn in state.get_transactions_between(start, end)
+            if all(getattr(txn, field) == key for field, key in params.items())
+        ]
+        assert [json.loads(line)["txn_id"] for line in response.text.splitlines()] == expected
+        assert anchor.txn_id in expected
+
+
+def test_arrow_export_returns_typed_record_batches() -> None:
+    pa = pytest.importorskip("pyarrow")
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+
+    response = client.get("/export/scores", params={"format": "arrow"})
+    assert response.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.num_rows == len(state.dataset.transactions)
+    assert table.schema.field("reason_codes").type == pa.list_(pa.string())
+
+    table = pa.ipc.open_stream(client.get("/export/transactions", params={"format": "arrow", "fields": "txn_id,ts"}).content).read_all()
+    assert table.column_names == ["txn_id", "ts"]
+    assert table.schema.field("ts").type == pa.timestamp("us", tz="UTC")
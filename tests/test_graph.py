@@ -1,6 +1,6 @@
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
-from retail_risk_aug.graph import build_graph
+from retail_risk_aug.graph import build_graph, summarize_transactions
 from retail_risk_aug.models import Transaction
 
 
@@ -44,3 +44,85 @@ def test_graph_neighborhood_and_paths() -> None:
     assert candidate_paths
     assert candidate_paths[0][0] == "account:a1"
     assert candidate_paths[0][-1] == "account:a3"
+
+
+def _txn(txn_id: str, minute: int, account_id: str, counterparty: str | None, device_id: str) -> Transaction:
+    return Transaction(
+        txn_id=txn_id,
+        ts=datetime(2025, 1, 1, 0, minute, tzinfo=UTC),
+        account_id=account_id,
+        counterparty_account_id=counterparty,
+        merchant_id="m1",
+        amount=10.0,
+        channel="MOBILE",
+        txn_type="P2P_TRANSFER",
+        device_id=device_id,
+        ip="10.0.0.1",
+        geo="US-NY",
+        narrative="n",
+    )
+
+
+def test_graph_incremental_add_and_eviction() -> None:
+    graph = build_graph([_txn("t1", 0, "a1", "a2", "d1")])
+    version = graph.version
+
+    assert graph.add_transactions([_txn("t2", 5, "a2", "a3", "d2"), _txn("t1", 0, "a1", "a2", "d1")]) == 1
+    assert graph.version > version
+    assert graph.paths("a1", "a3", max_hops=3)
+    assert graph.graph.edges["account:a1", "merchant:m1"]["txn_count"] == 1
+    assert graph.graph.edges["account:a2", "merchant:m1"]["txn_count"] == 1
+
+    assert graph.evict_before(datetime(2025, 1, 1, 0, 1, tzinfo=UTC)) == 1
+    assert graph.retained_transactions == 1
+    assert "device:d1" not in graph.graph
+    assert graph.neighborhood("a1") == []
+    assert graph.graph.edges["device:d2", "ip:10.0.0.1"]["txn_id"] == "t2"
+
+
+def test_graph_retention_window_bounds_retained_transactions() -> None:
+    graph = build_graph([], retention=timedelta(minutes=10))
+    graph.add_transactions(_txn(f"t{minute}", minute, f"a{minute % 3}", None, "d1") for minute in range(30))
+
+    assert graph.retained_transactions == 11
+    assert graph.graph.edges["account:a0", "device:d1"]["txn_count"] == 3
+    assert graph.add_transactions([_txn("late", 1, "a9", None, "d9")]) == 0
+
+
+def test_graph_subgraph_is_induced_and_capped() -> None:
+    graph = build_graph([_txn("t1", 0, "a1", "a2", "d1"), _txn("t2", 1, "a1", "a2", "d1"), _txn("t3", 2, "a2", "a3", "d2")])
+
+    subgraph = graph.subgraph("a1", hops=1)
+    assert [node.id for node in subgraph.nodes] == ["account:a1", "account:a2", "device:d1", "merchant:m1"]
+    assert subgraph.nodes[0].node_type == "account" and subgraph.nodes[0].key == "a1"
+    edges = {(edge.source, edge.target): edge for edge in subgraph.edges}
+    assert set(edges) == {("account:a1", "account:a2"), ("account:a1", "device:d1"), ("account:a1", "merchant:m1"), ("account:a2", "merchant:m1")}
+    assert edges["account:a1", "account:a2"].label == "SENT_TO"
+    assert edges["account:a1", "account:a2"].txn_count == 2 and edges["account:a1", "account:a2"].amount == 20.0
+    assert not subgraph.truncated
+    assert not graph.subgraph("a1", hops=1, max_nodes=4).truncated
+
+    capped = graph.subgraph("a1", hops=3, max_nodes=3, max_edges=1)
+    assert len(capped.nodes) == 3 and len(capped.edges) == 1 and capped.truncated
+    assert [node.id for node in graph.induced_subgraph(["device:d2", "ip:10.0.0.1", "missing"]).nodes] == ["device:d2", "ip:10.0.0.1"]
+    assert graph.subgraph("missing").nodes == []
+
+
+def test_graph_summary_collapses_edges_groups_leaves_and_caps_budget() -> None:
+    txns = [_txn("t1", 0, "a1", "a2", "d1"), _txn("t2", 1, "a1", "a2", "d1")]
+    txns += [_txn(f"pay{index}", 3, "a1", None, "d1").model_copy(update={"merchant_id": f"m{index}"}) for index in range(2, 6)]
+
+    summary = summarize_transactions(txns, alert_txn_ids={"t2"}, max_nodes=50, max_edges=50)
+    edges = {(edge.source, edge.target, edge.label): edge for edge in summary.edges}
+    assert edges["account:a1", "account:a2", "SENT_TO"].weight == 2
+    assert edges["account:a1", "account:a2", "SENT_TO"].alerts == 1
+    groups = {node.id: node for node in summary.nodes if node.id.startswith("group:")}
+    assert groups["group:merchant@account:a1"].members == 4
+    assert edges["account:a1", "group:merchant@account:a1", "PAID_AT"].weight == 4
+    assert summary.transactions == len(txns) and summary.hidden_nodes == 0
+
+    capped = summarize_transactions(txns, alert_txn_ids={"t2"}, max_nodes=3, max_edges=1)
+    assert len(capped.nodes) == 3 and len(capped.edges) == 1
+    assert capped.nodes[0].id == "account:a1"
+    assert capped.edges[0].alerts == 1
+    assert capped.hidden_nodes == len(summary.nodes) - 3
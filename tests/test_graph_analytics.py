@@ -0,0 +1,85 @@
+from datetime import UTC, datetime
+
+import numpy as np
+
+from retail_risk_aug.graph import GraphCSR, build_graph, build_graph_features, compute_graph_features
+from retail_risk_aug.graph.analytics import connected_components, pagerank
+from retail_risk_aug.models import ReasonCode, Transaction
+from retail_risk_aug.scoring import score_transactions
+
+
+def _txn(txn_id: str, account_id: str, counterparty: str | None, amount: float) -> Transaction:
+    return Transaction(
+        txn_id=txn_id,
+        ts=datetime(2025, 1, 1, tzinfo=UTC),
+        account_id=account_id,
+        counterparty_account_id=counterparty,
+        merchant_id="m1",
+        amount=amount,
+        channel="MOBILE",
+        txn_type="P2P_TRANSFER",
+        device_id=f"d-{account_id}",
+        ip=f"ip-{account_id}",
+        geo="US-NY",
+        narrative="n",
+    )
+
+
+def test_graph_features_cover_degree_flow_components_and_pagerank() -> None:
+    txns = [_txn("t1", "a1", "hub", 100.0), _txn("t2", "a2", "hub", 50.0), _txn("t3", "a3", "hub", 25.0)]
+    table = build_graph_features(build_graph(txns))
+
+    hub = table.get("hub")
+    sender = table.get("a1")
+    assert hub is not None and sender is not None
+    assert hub.degree_in == 3
+    assert hub.flow_in == 175.0
+    assert sender.flow_out == 200.0
+    assert sender.degree_out == 3
+    assert hub.component_size == 11
+    assert hub.pagerank > sender.pagerank
+    assert hub.pagerank_percentile == 1.0
+    assert set(table.timings) == {"to_csr", "degree", "flow", "component_size", "pagerank"}
+
+    scored = {item.txn_id: item for item in score_transactions([*txns, _txn("t4", "hub", None, 5.0)], graph_features=table)}
+    assert ReasonCode.GRAPH_HUB.value in scored["t4"].reason_codes
+    assert ReasonCode.GRAPH_HUB.value not in scored["t1"].reason_codes
+
+
+def test_transaction_csr_matches_the_dev_graph_csr() -> None:
+    txns = [_txn("t1", "a1", "hub", 100.0), _txn("t2", "a1", "hub", 50.0), _txn("t3", "a3", None, 25.0)]
+    from_graph, from_transactions = GraphCSR.from_graph(build_graph(txns)), GraphCSR.from_transactions(txns)
+
+    assert from_transactions.node_ids == from_graph.node_ids
+    edges = {
+        csr_name: sorted(zip(csr.rows.tolist(), csr.indices.tolist(), csr.weights.tolist(), csr.amounts.tolist(), strict=True))
+        for csr_name, csr in (("graph", from_graph), ("transactions", from_transactions))
+    }
+    assert edges["transactions"] == edges["graph"]
+    assert GraphCSR.from_transactions([]).node_count == 0
+
+    table = build_graph_features(txns)
+    reference = build_graph_features(build_graph(txns))
+    assert table.account_ids == reference.account_ids
+    for name, column in table.columns.items():
+        assert np.allclose(column, reference.columns[name])
+
+
+def test_vectorized_kernels_on_edge_arrays() -> None:
+    node_ids = [f"account:{index}" for index in range(6)]
+    csr = GraphCSR.from_edges(
+        node_ids,
+        sources=np.array([0, 1, 2, 4]),
+        targets=np.array([1, 2, 0, 5]),
+        weights=np.ones(4),
+        amounts=np.ones(4),
+    )
+
+    labels = connected_components(csr)
+    ranks = pagerank(csr)
+
+    assert labels[0] == labels[1] == labels[2]
+    assert labels[4] == labels[5] != labels[0]
+    assert labels[3] == 3
+    assert abs(ranks.sum() - 1.0) < 1e-9
+    assert compute_graph_features(csr).get("3").component_size == 1
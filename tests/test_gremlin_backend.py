@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+import pytest
+
+from retail_risk_aug.graph import GraphBackend, build_graph
+from retail_risk_aug.models import Transaction
+
+pytest.importorskip("websockets")
+
+from websockets.sync.server import ServerConnection, serve  # noqa: E402
+
+from retail_risk_aug.graph.gremlin import (  # noqa: E402
+    COUNT_SCRIPT,
+    NEIGHBORHOOD_SCRIPT,
+    PATHS_SCRIPT,
+    SUBGRAPH_EDGES_SCRIPT,
+    UPSERT_EDGES_SCRIPT,
+    UPSERT_VERTICES_SCRIPT,
+    GremlinError,
+    GremlinGraphBackend,
+)
+
+
+class StandInGremlinServer:
+    def __init__(self) -> None:
+        self.vertices: dict[int, tuple[str, str]] = {}
+        self.vertex_ids: dict[tuple[str, str], int] = {}
+        self.edges: set[tuple[int, int, str]] = set()
+        self.requests: list[str] = []
+        self.connections = 0
+
+    def handle(self, connection: ServerConnection) -> None:
+        self.connections += 1
+        for frame in connection:
+            raw = bytes(frame) if isinstance(frame, (bytes, bytearray)) else frame.encode("utf-8")
+            message = json.loads(raw[1 + raw[0] :])
+            script = message["args"]["gremlin"]
+            self.requests.append(script)
+            try:
+                data = self.evaluate(script, message["args"]["bindings"])
+            except KeyError as exc:
+                connection.send(json.dumps({"requestId": message["requestId"], "status": {"code": 597, "message": str(exc)}}))
+                continue
+            for start in range(0, max(len(data), 1), 2):
+                code = 206 if start + 2 < len(data) else 200
+                connection.send(
+                    json.dumps(
+                        {
+                            "requestId": message["requestId"],
+                            "status": {"code": code, "message": ""},
+                            "result": {"data": data[start : start + 2], "meta": {}},
+                        }
+                    )
+                )
+
+    def evaluate(self, script: str, bindings: dict[str, Any]) -> list[Any]:
+        if script == UPSERT_VERTICES_SCRIPT:
+            ids: dict[str, int] = {}
+            for vertex in bindings["vertices"]:
+                key = (vertex["label"], vertex["key"])
+                if key not in self.vertex_ids:
+                    self.vertex_ids[key] = len(self.vertices) + 1
+                    self.vertices[self.vertex_ids[key]] = key
+                ids[vertex["node"]] = self.vertex_ids[key]
+            return [ids]
+        if script == UPSERT_EDGES_SCRIPT:
+            for edge in bindings["edges"]:
+                self.edges.add((edge["out"], edge["in"], edge["label"]))
+            return [len(bindings["edges"])]
+        if script == NEIGHBORHOOD_SCRIPT:
+            start = self.vertex_ids.get(("account", bindings["account_key"]))
+            if start is None:
+                return []
+            seen = {start}
+            frontier = [start]
+            for _ in range(bindings["hops"]):
+                frontier = [target for node in frontier for target in self._out(node) if target not in seen]
+                seen.update(frontier)
+            return [list(self.vertices[node]) for node in seen]
+        if script == PATHS_SCRIPT:
+            source = self.vertex_ids.get(("account", bindings["source_key"]))
+            target = self.vertex_ids.get(("account", bindings["target_key"]))
+            if source is None or target is None:
+                return []
+            return [
+                {"labels": [], "objects": [list(self.vertices[node]) for node in path]}
+                for path in self._paths(source, target, bindings["max_hops"])
+            ]
+        if script == SUBGRAPH_EDGES_SCRIPT:
+            keys = set(bindings["keys"])
+            rows = [
+                {"out": list(self.vertices[source]), "in": list(self.vertices[target]), "label": label, "txn_id": ""}
+                for source, target, label in sorted(self.edges)
+                if self.vertices[source][1] in keys and self.vertices[target][1] in keys
+            ]
+            return rows[: bindings["max_edges"]]
+        if script == COUNT_SCRIPT:
+            return [len(self.vertices)]
+        raise KeyError(script)
+
+    def _out(self, node: int) -> list[int]:
+        return [target for source, target, _ in self.edges if source == node]
+
+    def _paths(self, node: int, target: int, hops: int, path: tuple[int, ...] = ()) -> Iterator[tuple[int, ...]]:
+        path = (*path, node)
+        if node == target and len(path) > 1:
+            yield path
+            return
+        if hops == 0:
+            return
+        for nxt in self._out(node):
+            if nxt not in path:
+                yield from self._paths(nxt, target, hops - 1, path)
+
+
+@pytest.fixture
+def gremlin_server() -> Iterator[tuple[StandInGremlinServer, str]]:
+    stand_in = StandInGremlinServer()
+    with serve(stand_in.handle, "127.0.0.1", 0) as server:
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = server.socket.getsockname()[1]
+        yield stand_in, f"ws://127.0.0.1:{port}/gremlin"
+        server.shutdown()
+    thread.join(timeout=5)
+
+
+def _txn(txn_id: str, account_id: str, counterparty: str | None) -> Transaction:
+    return Transaction(
+        txn_id=txn_id,
+        ts=datetime(2025, 1, 1, tzinfo=UTC),
+        account_id=account_id,
+        counterparty_account_id=counterparty,
+        merchant_id="m1",
+        amount=10.0,
+        channel="MOBILE",
+        txn_type="P2P_TRANSFER",
+        device_id=f"d-{account_id}",
+        ip="10.0.0.1",
+        geo="US-NY",
+        narrative="n",
+    )
+
+
+def test_gremlin_backend_matches_local_engine(gremlin_server: tuple[StandInGremlinServer, str]) -> None:
+    stand_in, endpoint = gremlin_server
+    txns = [_txn("t1", "a1", "a2"), _txn("t2", "a2", "a3"), _txn("t3", "a3", None)]
+    local = build_graph(txns)
+    remote = GremlinGraphBackend(endpoint=endpoint, pool_size=2, batch_size=3)
+
+    try:
+        assert isinstance(remote, GraphBackend)
+        assert remote.add_transactions(txns) == 3
+        assert remote.neighborhood("a1", hops=2) == local.neighborhood("a1", hops=2)
+        assert remote.paths("a1", "a3", max_hops=3) == local.paths("a1", "a3", max_hops=3)
+        assert remote.node_count() == local.node_count()
+        remote_subgraph, local_subgraph = remote.subgraph("a1", hops=2), local.subgraph("a1", hops=2)
+        assert remote_subgraph.nodes == local_subgraph.nodes
+        assert {(edge.source, edge.target, edge.label) for edge in remote_subgraph.edges} == {
+            (edge.source, edge.target, edge.label) for edge in local_subgraph.edges
+        }
+        assert remote.neighborhood("missing") == []
+
+        upserts_before = stand_in.requests.count(UPSERT_VERTICES_SCRIPT)
+        remote.add_transactions([_txn("t4", "a1", "a3")])
+        assert stand_in.requests.count(UPSERT_VERTICES_SCRIPT) == upserts_before
+        assert remote.cached_vertices == local.node_count()
+        assert stand_in.connections == 1
+    finally:
+        remote.close()
+
+
+def test_gremlin_backend_raises_on_server_error(gremlin_server: tuple[StandInGremlinServer, str]) -> None:
+    _, endpoint = gremlin_server
+    remote = GremlinGraphBackend(endpoint=endpoint)
+
+    try:
+        with pytest.raises(GremlinError):
+            remote.submit("g.V().unknown()", {})
+        assert remote.node_count() == 0
+    finally:
+        remote.close()
@@ -0,0 +1,124 @@
+import sys
+import threading
+from datetime import UTC, datetime
+
+import pytest
+
+from retail_risk_aug.indexes import DashboardAggregates, TimelineIndex, TransactionIndexes
+from retail_risk_aug.models import PatternTag, Transaction
+
+
+def _txn(txn_id: str, minute: int, account_id: str, merchant_id: str) -> Transaction:
+    return Transaction(
+        txn_id=txn_id,
+        ts=datetime(2025, 1, 1, 0, minute, tzinfo=UTC),
+        account_id=account_id,
+        merchant_id=merchant_id,
+        amount=10.0,
+        channel="POS",
+        txn_type="POS_PURCHASE",
+        device_id="d1",
+        ip="10.0.0.1",
+        geo="US-NY",
+        narrative="n",
+    )
+
+
+def test_entity_indexes_return_latest_positions_first() -> None:
+    txns = [_txn("t0", 1, "a1", "m1"), _txn("t1", 5, "a1", "m2"), _txn("t2", 3, "a2", "m1")]
+    indexes = TransactionIndexes.from_transactions(txns)
+
+    assert indexes.latest("account_id", "a1", limit=10) == [1, 0]
+    assert indexes.latest("merchant_id", "m1", limit=1) == [2]
+    assert indexes.latest("device_id", "d1", limit=2) == [1, 2]
+    assert indexes.latest("counterparty_account_id", "a1", limit=5) == []
+
+    indexes.add(3, _txn("t3", 2, "a1", "m1"))
+    indexes.add(4, _txn("t4", 9, "a1", "m3"))
+
+    assert indexes.latest("account_id", "a1", limit=10) == [4, 1, 3, 0]
+    assert indexes.by_field["account_id"].count("a1") == 4
+
+
+def test_timeline_range_queries_and_buckets() -> None:
+    txns = [_txn(f"t{minute}", minute, "a1", "m1") for minute in (0, 0, 1, 59)]
+    timeline = TimelineIndex.from_transactions(txns, alert_txn_ids={"t1"})
+    timeline.add(4, _txn("late", 30, "a2", "m1"))
+
+    start = datetime(2025, 1, 1, 0, 1, tzinfo=UTC)
+    end = datetime(2025, 1, 1, 0, 59, tzinfo=UTC)
+    assert timeline.range(start, end) == [2, 4]
+    assert timeline.range(limit=2) == [0, 1]
+    assert timeline.count_between(end=start) == 2
+
+    minutes = timeline.buckets("minute")
+    assert [bucket.count for bucket in minutes] == [2, 1, 1, 1]
+    assert [bucket.alerts for bucket in minutes] == [0, 1, 0, 0]
+    assert minutes[0].amount == 20.0
+    assert [bucket.start.minute for bucket in timeline.buckets("minute", start, end)] == [1, 30]
+
+    hours = timeline.buckets("hour")
+    assert len(hours) == 1
+    assert hours[0].count == 5
+
+
+def test_dashboard_aggregates_snapshot_prefixes_and_views() -> None:
+    txns = [_txn(f"t{minute}", minute, "a1", "m1") for minute in range(6)]
+    txns[1] = txns[1].model_copy(update={"pattern_tag": PatternTag.RING_TRANSFER, "channel": "MOBILE", "amount": 90.0})
+    txns[4] = txns[4].model_copy(update={"pattern_tag": PatternTag.RING_TRANSFER})
+    aggregates = DashboardAggregates.from_transactions(txns[:5], alert_txn_ids={"t1", "t4"})
+    aggregates.add(5, txns[5])
+
+    full = aggregates.snapshot(statuses={"open": 2})
+    assert (full.transactions, full.alerts, full.baseline, full.amount) == (6, 2, 4, 140.0)
+    assert full.by_pattern == {"BASELINE": 4, "RING_TRANSFER": 2}
+    assert full.by_channel == {"POS": 5, "MOBILE": 1}
+    assert full.by_status == {"open": 2}
+
+    prefix = aggregates.snapshot(upto=3)
+    assert (prefix.transactions, prefix.alerts, prefix.baseline, prefix.amount) == (3, 1, 2, 110.0)
+    assert prefix.by_pattern == {"BASELINE": 2, "RING_TRANSFER": 1}
+
+    assert aggregates.latest("ALERTS") == [1, 4]
+    assert aggregates.latest("pattern:RING_TRANSFER", upto=4) == [1]
+    assert aggregates.latest("BASELINE", upto=6, limit=2) == [3, 5]
+    assert aggregates.count("channel:MOBILE") == 1
+    with pytest.raises(ValueError):
+        aggregates.add(2, txns[2])
+    with pytest.raises(ValueError):
+        aggregates.latest("merchant:m1")
+
+
+def test_out_of_order_inserts_keep_concurrent_readers_consistent() -> None:
+    timeline = TimelineIndex()
+    indexes = TransactionIndexes()
+    errors: list[BaseException] = []
+    done = threading.Event()
+
+    def read() -> None:
+        try:
+            while not done.is_set():
+                seen = timeline.range()
+                assert len(seen) == len(set(seen))
+                list(timeline.iter_range(datetime(2025, 1, 1, 0, 10, tzinfo=UTC)))
+                latest = indexes.latest("account_id", "a1", limit=50)
+                assert len(latest) == len(set(latest))
+        except BaseException as exc:  # pragma: no cover
+            errors.append(exc)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    reader = threading.Thread(target=read)
+    reader.start()
+    for position in range(3000):
+        txn = _txn(f"t{position}", (position * 37) % 60, "a1", "m1")
+        timeline.add(position, txn)
+        indexes.add(position, txn)
+    done.set()
+    reader.join()
+    sys.setswitchinterval(interval)
+
+    assert not errors
+    minutes = [(position * 37) % 60 for position in timeline.range()]
+    assert minutes == sorted(minutes)
+    assert timeline.count_between(datetime(2025, 1, 1, 0, 30, tzinfo=UTC)) == 1500
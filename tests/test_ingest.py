@@ -0,0 +1,105 @@
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import build_default_app_state
+from retail_risk_aug.config import Settings
+from retail_risk_aug.models import PatternTag, Transaction
+from retail_risk_aug.scoring.service import LINKED_CLUSTER_MIN_ACCOUNTS
+from retail_risk_aug.vector import build_index
+
+
+def _txn(index: int, account_id: str, amount: float = 9000.0) -> Transaction:
+    return Transaction(
+        txn_id=f"LIVE-{index:04d}",
+        ts=datetime(2030, 1, 1, tzinfo=UTC) + timedelta(seconds=index),
+        account_id=account_id,
+        counterparty_account_id="A-live-sink",
+        merchant_id="M-live",
+        amount=amount,
+        channel="MOBILE",
+        txn_type="P2P_TRANSFER",
+        device_id="D-live",
+        ip="10.9.9.9",
+        geo="US-NY",
+        narrative="live",
+        is_injected=True,
+        pattern_tag=PatternTag.RING_TRANSFER,
+    )
+
+
+def test_vector_index_append_matches_full_build() -> None:
+    txns = list(build_default_app_state(seed=7).dataset.transactions[:300])
+    full = build_index(txns)
+    grown = build_index(txns[:10])
+    for start in range(10, 300, 45):
+        grown.add(txns[start : start + 45])
+
+    assert grown.txn_ids == full.txn_ids
+    assert np.allclose(grown.vectors, full.vectors)
+    assert grown.search_similar(txns[0].txn_id, k=5) == full.search_similar(txns[0].txn_id, k=5)
+
+
+def test_post_transactions_scores_links_and_alerts_incrementally() -> None:
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+    before = len(state.dataset.transactions)
+    etag = client.get("/account/A-live-0/transactions").headers["etag"]
+
+    batch = [_txn(index, f"A-live-{index}").model_dump(mode="json") for index in range(3)]
+    response = client.post("/transactions", json=batch)
+    assert response.status_code == 201
+    body = response.json()
+    assert body["accepted"] == 3
+    assert len(body["alerts"]) == 3
+    assert set(body["stage_seconds"]) >= {"score", "vector_index", "graph", "indexes", "alerts"}
+
+    assert len(state.dataset.transactions) == before + 3
+    snapshot = state.dashboard_snapshot()
+    assert snapshot.transactions == before + 3 and snapshot.by_status["open"] == len(state.alerts.by_status("open"))
+    assert state.dashboard_positions("pattern:RING_TRANSFER", limit=3) == [before, before + 1, before + 2]
+    assert [txn["txn_id"] for txn in client.get("/account/A-live-0/transactions").json()] == ["LIVE-0000"]
+    assert client.get("/account/A-live-0/transactions", headers={"If-None-Match": etag}).status_code == 200
+    assert "account:A-live-sink" in client.get("/graph/account/A-live-1/neighborhood").json()["neighborhood"]
+    assert {item["txn_id"] for item in client.get("/similar/transaction/LIVE-0000").json()} >= {"LIVE-0001", "LIVE-0002"}
+    alert = client.get(f"/alert/{body['alerts'][0]}").json()["alert"]
+    assert alert["txn_id"].startswith("LIVE-") and alert["score"] >= 0.75
+    assert state.clusters.account_count("account:A-live-0") == 3
+
+    replay = client.post("/transactions", json=batch[0]).json()
+    assert replay["accepted"] == 0 and replay["duplicates"] == ["LIVE-0000"]
+    assert client.post("/transactions", json=[{"txn_id": "bad"}]).status_code == 422
+    assert client.get("/admin/health").json()["ingest"]["transactions"] == 3
+
+
+def test_served_and_ingest_scoring_read_entity_clusters() -> None:
+    state = build_default_app_state(seed=7)
+    assert state.scorer is not None and state.scorer.clusters is state.clusters
+    linked = {
+        txn.account_id
+        for txn in state.dataset.transactions
+        if txn.pattern_tag in {PatternTag.SHARED_DEVICE, PatternTag.SHARED_IP}
+    }
+    assert LINKED_CLUSTER_MIN_ACCOUNTS <= state.clusters.account_count("device:D-SHARED-0001") < len(state.dataset.customers)
+    for txn in state.dataset.transactions:
+        flagged = "LINKED_CLUSTER" in state.scored_transactions[txn.txn_id].reason_codes
+        assert flagged == (txn.account_id in linked)
+
+    body = state.ingest([_txn(index, f"A-ring-{index}", amount=50.0) for index in range(6)])
+    ring = [state.scored_transactions[f"LIVE-{index:04d}"] for index in range(6)]
+    assert body.accepted == 6
+    assert all("LINKED_CLUSTER" in item.reason_codes for item in ring)
+    assert state.clusters.account_count("account:A-ring-0") == 6
+
+
+def test_configured_graph_retention_bounds_the_served_graph_across_ingest() -> None:
+    state = build_default_app_state(seed=7, settings=Settings(graph_retention_hours=1))
+    assert state.graph.retention == timedelta(hours=1)
+    assert 0 < state.graph.retained_transactions < len(state.dataset.transactions)
+
+    state.ingest([_txn(index, f"A-live-{index % 4}") for index in range(20)])
+    assert state.graph.retained_transactions == 20
+    assert state.graph.neighborhood(state.dataset.transactions[0].account_id) == []
+    assert state.graph.neighborhood("A-live-0")
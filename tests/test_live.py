@@ -0,0 +1,48 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import build_default_app_state
+from retail_risk_aug.live import LiveFeed
+
+
+def test_feed_bounds_each_subscriber_and_replays_history() -> None:
+    feed = LiveFeed(history=3)
+    slow = feed.subscribe(max_queue=2)
+    for index in range(5):
+        feed.publish("tick", {"index": index})
+
+    events, dropped = slow.drain()
+    assert [event.data["index"] for event in events] == [3, 4]
+    assert dropped == 3
+    assert slow.drain() == ([], 0)
+
+    resumed = feed.subscribe(after=3)
+    assert [event.seq for event in resumed.drain()[0]] == [4, 5]
+    late = feed.subscribe(after=0)
+    events, dropped = late.drain()
+    assert [event.seq for event in events] == [3, 4, 5] and dropped == 2
+
+    slow.close()
+    assert feed.subscribers == 2
+
+
+def test_sse_stream_delivers_ingested_transactions_and_alerts() -> None:
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+    txn = state.dataset.transactions[0].model_dump(mode="json")
+    client.post("/transactions", json={**txn, "txn_id": "LIVE-1", "amount": 9500.0, "pattern_tag": "RING_TRANSFER"})
+    client.post(f"/alert/{next(iter(state.alerts)).case_id}/transition", json={"status": "investigating"})
+
+    response = client.get("/live/events", params={"max_events": 4}, headers={"Last-Event-ID": "0"})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame.startswith("id:")]
+    events = [
+        (frame.split("\n")[1].removeprefix("event: "), json.loads(frame.split("\n")[2].removeprefix("data: ")))
+        for frame in frames
+    ]
+    assert [kind for kind, _ in events] == ["transactions", "alerts", "aggregates", "alert_status"]
+    assert events[0][1]["items"][0]["txn_id"] == "LIVE-1"
+    assert events[2][1]["transactions"] == len(state.dataset.transactions)
+    assert state.live.subscribers == 0
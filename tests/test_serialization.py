@@ -0,0 +1,42 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import build_default_app_state
+from retail_risk_aug.serialization import FragmentCache, dumps
+
+
+def test_fragment_cache_matches_model_dump_and_tracks_replacements() -> None:
+    state = build_default_app_state(seed=7)
+    cache = FragmentCache(max_entries=2)
+    alert = next(iter(state.alerts))
+    txns = list(state.dataset.transactions[:3])
+
+    assert json.loads(cache.alert(alert)) == alert.model_dump(mode="json")
+    assert cache.alert(alert) is cache.alert(alert)
+    assert json.loads(cache.transactions(txns)) == [txn.model_dump(mode="json") for txn in txns]
+    assert len(cache) == 2
+
+    updated = alert.model_copy(update={"status": "investigating"})
+    assert json.loads(cache.alert(updated))["status"] == "investigating"
+    assert json.loads(dumps({"a": [1, None]})) == {"a": [1, None]}
+
+
+def test_alert_endpoints_serve_cached_fragments_and_invalidate_on_transition() -> None:
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+
+    alerts = client.get("/alerts", params={"status": "open", "limit": 5})
+    assert alerts.headers["content-type"] == "application/json"
+    assert alerts.json() == [alert.model_dump(mode="json") for alert in state.page_alerts(limit=5).items]
+    case_id = alerts.json()[0]["case_id"]
+    detail = client.get(f"/alert/{case_id}").json()
+    assert detail["transaction"]["txn_id"] == detail["alert"]["txn_id"]
+    assert state.fragments.stats()["hits"] >= 1
+
+    moved = client.post(f"/alert/{case_id}/transition", json={"status": "investigating"})
+    assert moved.json()["status"] == "investigating"
+    assert client.get(f"/alert/{case_id}").json()["alert"]["status"] == "investigating"
+    investigating = client.get("/alerts", params={"status": "investigating"}).json()
+    assert [item["case_id"] for item in investigating] == [case_id]
@@ -0,0 +1,89 @@
+from datetime import timedelta
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import build_default_app_state
+from retail_risk_aug.shared_state import ColumnarTransactions, attach_state, publish_state
+
+
+def test_attached_state_matches_built_state(tmp_path) -> None:
+    state = build_default_app_state(seed=7)
+    attached = attach_state(publish_state(state, tmp_path))
+    transactions = state.dataset.transactions
+
+    assert isinstance(attached.vector_index.vectors, np.memmap)
+    assert len(attached.dataset.transactions) == len(transactions)
+    assert attached.dataset.transactions[-1] == transactions[-1]
+    assert attached.get_transaction(transactions[10].txn_id) == transactions[10]
+    assert attached.get_transaction("missing") is None
+    assert attached.scored_transactions[transactions[3].txn_id] == state.scored_transactions[transactions[3].txn_id]
+    assert attached.get_similar_transactions(transactions[0].txn_id, k=5) == state.get_similar_transactions(transactions[0].txn_id, k=5)
+    assert attached.get_timeseries("hour") == state.get_timeseries("hour")
+    assert [alert.case_id for alert in attached.list_alerts()] == [alert.case_id for alert in state.list_alerts()]
+
+    transfers = [txn for txn in transactions if txn.counterparty_account_id][:10]
+    assert attached.graph.node_count() == state.graph.node_count()
+    for txn in transfers:
+        assert attached.graph.neighborhood(txn.account_id, hops=2) == state.graph.neighborhood(txn.account_id, hops=2)
+        assert attached.graph.paths(txn.account_id, txn.counterparty_account_id, max_hops=3) == state.graph.paths(
+            txn.account_id, txn.counterparty_account_id, max_hops=3
+        )
+        assert attached.get_transactions_by_account(txn.account_id) == state.get_transactions_by_account(txn.account_id)
+        attached_subgraph, local_subgraph = attached.graph.subgraph(txn.account_id), state.graph.subgraph(txn.account_id)
+        assert attached_subgraph.nodes == local_subgraph.nodes
+        assert attached_subgraph.truncated == local_subgraph.truncated
+        assert sorted((edge.source, edge.target, edge.label) for edge in attached_subgraph.edges) == sorted(
+            (edge.source, edge.target, edge.label) for edge in local_subgraph.edges
+        )
+
+
+def test_create_app_attaches_published_state(tmp_path, monkeypatch) -> None:
+    state = build_default_app_state(seed=7)
+    publish_state(state, tmp_path)
+    monkeypatch.setenv("SHARED_STATE_DIR", str(tmp_path))
+    client = TestClient(create_app())
+
+    alerts = client.get("/alerts", params={"limit": 5}).json()
+    assert [alert["case_id"] for alert in alerts] == [alert.case_id for alert in state.page_alerts(limit=5).items]
+    detail = client.get(f"/alert/{alerts[0]['case_id']}").json()
+    assert detail["transaction"]["txn_id"] == alerts[0]["txn_id"]
+    transition = client.post(f"/alert/{alerts[0]['case_id']}/transition", json={"status": "investigating"})
+    assert transition.status_code == 409
+    assert client.post("/admin/reload", json={"seed": 11}).status_code == 409
+    assert client.get("/admin/health").json()["state"]["builds"] == 0
+    assert client.get(f"/alert/{alerts[0]['case_id']}").json()["alert"]["status"] == alerts[0]["status"]
+
+
+def test_attached_indexes_read_published_positions_without_rows(tmp_path, monkeypatch) -> None:
+    state = build_default_app_state(seed=7)
+    publish_state(state, tmp_path)
+
+    def _row(self: ColumnarTransactions, index: int) -> None:
+        raise AssertionError("attach_state must not materialize transactions")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(ColumnarTransactions, "_row", _row)
+        attached = attach_state(tmp_path)
+    assert isinstance(attached.timeline.order, np.memmap)
+
+    anchor = state.dataset.transactions[40]
+    start, end = anchor.ts - timedelta(days=2), anchor.ts + timedelta(days=2)
+    assert attached.timeline.range(start, end) == state.timeline.range(start, end)
+    assert attached.get_timeseries("minute", start, end) == state.get_timeseries("minute", start, end)
+    for field in ("account_id", "merchant_id", "device_id"):
+        key = getattr(anchor, field)
+        assert attached.transaction_indexes.latest(field, key, 5) == state.transaction_indexes.latest(field, key, 5)
+        assert attached.transaction_indexes.between(field, key, start, end) == state.transaction_indexes.between(field, key, start, end)
+    assert attached.dashboard_snapshot() == state.dashboard_snapshot()
+    assert attached.dashboard_snapshot(upto=300) == state.dashboard_snapshot(upto=300)
+    for view in ("ALL", "ALERTS", "BASELINE", f"channel:{anchor.channel}", "pattern:BASELINE"):
+        assert attached.dashboard_positions(view, upto=500, limit=10) == state.dashboard_positions(view, upto=500, limit=10)
+    assert attached.clusters.cluster_count == state.clusters.cluster_count
+    features = attached.clusters.features(anchor.account_id)
+    assert features == state.clusters.features(anchor.account_id)
+    assert attached.clusters.members(features.cluster_id, limit=20) == state.clusters.members(features.cluster_id, limit=20)
+    with pytest.raises(RuntimeError):
+        attached.transition_alert(state.list_alerts()[0].case_id, "investigating")
@@ -0,0 +1,84 @@
+import time
+from collections.abc import Callable
+
+import pytest
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import AppStateBuilder
+from retail_risk_aug.config import Settings
+from retail_risk_aug.generator import generate_dataset, save_snapshot
+from retail_risk_aug.state_manager import ReloadInProgressError, StateManager
+
+
+def _wait_until(condition: Callable[[], bool], timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_reload_swaps_state_while_leases_finish_on_old_state() -> None:
+    manager = StateManager(builder=AppStateBuilder(seed=7).start())
+    old_state = manager.current(timeout=30)
+
+    with manager.acquire() as leased:
+        manager.reload(seed=11)
+        with pytest.raises(ReloadInProgressError):
+            manager.reload(seed=12)
+        _wait_until(lambda: manager.version == 2)
+        metrics = manager.metrics()
+        assert leased is old_state
+        assert manager.current() is not old_state
+        assert metrics.version == 2
+        assert metrics.swaps == 1
+        assert metrics.draining_versions == [1]
+        assert metrics.in_flight == 1
+
+    metrics = manager.metrics()
+    assert metrics.draining_versions == []
+    assert metrics.in_flight == 0
+    assert metrics.builds == 2
+    assert metrics.last_build_seconds is not None
+
+
+def test_failed_reload_keeps_serving_current_state() -> None:
+    manager = StateManager(builder=AppStateBuilder(seed=7).start())
+    state = manager.current(timeout=30)
+
+    manager.reload(loader=lambda: (_ for _ in ()).throw(OSError("store unavailable")))
+    _wait_until(lambda: not manager.building)
+
+    metrics = manager.metrics()
+    assert manager.current() is state
+    assert metrics.failed_builds == 1
+    assert "store unavailable" in (metrics.last_error or "")
+
+
+def test_reload_without_builder_uses_configured_seed() -> None:
+    manager = StateManager(settings=Settings(rng_seed=5))
+
+    builder = manager.reload()
+    _wait_until(lambda: manager.version == 1)
+
+    assert builder.seed == 5
+
+
+def test_admin_reload_endpoint_loads_snapshot(tmp_path, monkeypatch) -> None:
+    dataset = generate_dataset(customers=20, transactions=200, inject=20, seed=3)
+    save_snapshot(dataset, tmp_path / "day1.json")
+    monkeypatch.setenv("STATE_SNAPSHOT_DIR", str(tmp_path))
+    app = create_app(builder=AppStateBuilder(seed=7, settings=Settings()).start())
+    client = TestClient(app)
+    app.state.state_manager.current(timeout=30)
+
+    assert client.post("/admin/reload", json={"snapshot": "../outside.json"}).status_code == 400
+    assert client.post("/admin/reload", json={"snapshot": "missing.json"}).status_code == 404
+    response = client.post("/admin/reload", json={"snapshot": "day1.json"})
+    assert response.status_code == 202
+    _wait_until(lambda: app.state.state_manager.version == 2)
+
+    body = client.get("/admin/health").json()
+    assert body["transactions"] == len(dataset.transactions)
+    assert body["state"]["version"] == 2
+    assert body["state"]["swaps"] == 1
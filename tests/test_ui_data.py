@@ -0,0 +1,122 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from retail_risk_aug.api.app import create_app
+from retail_risk_aug.app_state import AppState, build_default_app_state
+from retail_risk_aug.ui.data import ApiConsoleData, ApiUnavailableError, LocalConsoleData, TTLCache
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_api_console_data_matches_in_process_mode() -> None:
+    state = build_default_app_state(seed=7)
+    local = LocalConsoleData(state)
+    remote = ApiConsoleData("http://testserver", client=TestClient(create_app(state=state)))
+
+    alerts = remote.open_alerts(limit=5)
+    assert alerts == local.open_alerts(limit=5)
+    assert remote.alert(alerts[0].case_id) == alerts[0]
+    assert remote.alert("missing") is None
+
+    txn_ids = [alert.txn_id for alert in alerts] + ["missing"]
+    remote_context, local_context = remote.lookup(txn_ids), local.lookup(txn_ids)
+    assert remote_context == local_context
+    assert remote_context.case_id(alerts[0].txn_id) == alerts[0].case_id
+
+    account_id = remote_context.transaction(alerts[0].txn_id).account_id
+    assert remote.account_transactions(account_id, limit=5) == local.account_transactions(account_id, limit=5)
+    assert remote.similar(alerts[0].txn_id, k=3) == local.similar(alerts[0].txn_id, k=3)
+    assert remote.account_subgraph(account_id) == local.account_subgraph(account_id)
+    assert remote.graph_summary(upto=200, window=50) == local.graph_summary(upto=200, window=50)
+    assert remote.dashboard_snapshot(upto=40) == local.dashboard_snapshot(upto=40)
+    assert remote.dashboard_transactions("ALERTS", upto=500, limit=3) == local.dashboard_transactions("ALERTS", upto=500, limit=3)
+
+
+def test_api_console_alert_lookup_skips_the_similarity_search(monkeypatch) -> None:
+    state = build_default_app_state(seed=7)
+    remote = ApiConsoleData("http://testserver", client=TestClient(create_app(state=state)))
+    case_id = state.list_alerts()[0].case_id
+    monkeypatch.setattr(AppState, "get_similar_transactions", lambda *args, **kwargs: pytest.fail("similarity search ran"))
+
+    assert remote.alert(case_id) == state.get_alert(case_id)
+
+
+def test_api_console_data_shares_ttl_cache_and_revalidates_with_etags() -> None:
+    state = build_default_app_state(seed=7)
+    clock = _Clock()
+    cache = TTLCache(ttl_seconds=2.0, max_entries=100, clock=clock)
+    client = TestClient(create_app(state=state))
+    sessions = [ApiConsoleData("http://testserver", cache=cache, client=client) for _ in range(2)]
+    requests: list[str] = []
+    client.event_hooks["request"].append(lambda request: requests.append(request.url.path))
+
+    first = sessions[0].dashboard_snapshot()
+    assert sessions[1].dashboard_snapshot() is first
+    txn_ids = [txn.txn_id for txn in state.dataset.transactions[:3]]
+    sessions[0].lookup(txn_ids[:2])
+    sessions[1].lookup(txn_ids)
+    assert requests == ["/dashboard/snapshot", "/transactions/lookup", "/transactions/lookup"]
+
+    clock.now = 5.0
+    assert sessions[1].dashboard_snapshot() is first
+    assert cache.revalidated == 1
+
+    state.transition_alert(state.list_alerts()[0].case_id, "investigating")
+    clock.now = 10.0
+    refreshed = sessions[0].dashboard_snapshot()
+    assert refreshed.by_status["investigating"] == first.by_status["investigating"] + 1
+    assert len(requests) == 5
+
+
+def test_api_console_serves_stale_entries_while_the_api_sheds_or_reloads(monkeypatch) -> None:
+    state = build_default_app_state(seed=7)
+    clock = _Clock()
+    remote = ApiConsoleData(
+        "http://testserver",
+        cache=TTLCache(ttl_seconds=2.0, max_entries=100, clock=clock),
+        client=TestClient(create_app(state=state)),
+    )
+    snapshot = remote.dashboard_snapshot()
+    txn_ids = [txn.txn_id for txn in state.dataset.transactions[:2]]
+    context = remote.lookup(txn_ids)
+
+    clock.now = 5.0
+    monkeypatch.setattr(remote.client, "get", lambda *args, **kwargs: httpx.Response(503))
+    monkeypatch.setattr(remote.client, "post", lambda *args, **kwargs: httpx.Response(429))
+    assert remote.dashboard_snapshot() is snapshot
+    assert remote.lookup(txn_ids) == context
+    assert remote.cache.stale == 3
+
+    with pytest.raises(ApiUnavailableError, match="not ready or reloading"):
+        remote.open_alerts()
+    with pytest.raises(ApiUnavailableError, match="shedding load"):
+        remote.lookup([state.dataset.transactions[5].txn_id])
+
+
+def test_live_listener_follows_transaction_count_from_sse() -> None:
+    state = build_default_app_state(seed=7)
+    client = TestClient(create_app(state=state))
+    listener = ApiConsoleData("http://testserver", client=client).live
+    txn = state.dataset.transactions[0].model_dump(mode="json")
+    for index in range(2):
+        client.post("/transactions", json={**txn, "txn_id": f"LIVE-{index}"})
+    requests: list[str] = []
+    client.event_hooks["request"].append(lambda request: requests.append(request.url.path))
+
+    listener.last_event_id = 0
+    listener.consume(max_events=state.live.seq)
+    assert requests == ["/live/events", "/dashboard/snapshot"]
+    assert listener.transactions == len(state.dataset.transactions)
+    assert listener.last_event_id == state.live.seq
+
+    listener.apply(None, "lagged", {"dropped": 3})
+    assert listener.transactions is None and listener.last_event_id == state.live.seq
+    listener.apply(None, "reset", {"reason": "state reloaded"})
+    assert listener.last_event_id is None
@@ -1,4 +1,6 @@
-from datetime import UTC, datetime
+import sys
+import threading
+from datetime import UTC, datetime, timedelta
 
 from retail_risk_aug.models import Transaction
 from retail_risk_aug.vector import build_index
@@ -55,3 +57,47 @@ def test_vector_similarity_returns_expected_neighbor() -> None:
 
     assert results
     assert results[0].txn_id == "t2"
+
+
+def test_vector_index_readers_never_see_ids_before_vectors() -> None:
+    base = Transaction(
+        txn_id="seed",
+        ts=datetime(2025, 1, 1, tzinfo=UTC),
+        account_id="a1",
+        counterparty_account_id="a2",
+        merchant_id="m1",
+        amount=100.0,
+        channel="ONLINE",
+        txn_type="ONLINE_PURCHASE",
+        device_id="d1",
+        ip="10.0.0.1",
+        geo="US-NY",
+        narrative="n",
+    )
+    index = build_index([base])
+    errors: list[BaseException] = []
+    done = threading.Event()
+
+    def read() -> None:
+        try:
+            while not done.is_set():
+                latest = index.txn_ids[-1]
+                index.search_similar(latest, k=3, min_similarity=0.0)
+        except BaseException as exc:  # pragma: no cover
+            errors.append(exc)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    reader = threading.Thread(target=read)
+    reader.start()
+    for batch in range(300):
+        index.add(
+            base.model_copy(update={"txn_id": f"t{batch}-{item}", "ts": base.ts + timedelta(minutes=batch), "amount": 10.0 + item})
+            for item in range(5)
+        )
+    done.set()
+    reader.join()
+    sys.setswitchinterval(interval)
+
+    assert not errors
+    assert len(index.txn_ids) == index.vectors.shape[0] == 1501